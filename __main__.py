@@ -9,6 +9,8 @@ in a folder with the following files:
     breakout.py  (the primary controller class)
     model.py     (the model classes)
     game2d.py    (the view classes)
+    gcore.py     (the parts of game2d that do not need Kivy)
+    bundle.py    (builds the asset bundle, if ASSET_BUNDLE is set)
 
 In addition, you should have the following subfolders
 
@@ -22,4 +24,7 @@ from breakout import *
 
 # Application code
 if __name__ == '__main__':
-    Breakout(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    set_validation(VALIDATION)
+    if ASSET_BUNDLE is not None:
+        use_bundle(ASSET_BUNDLE)
+    Breakout(width=GAME_WIDTH,height=GAME_HEIGHT,profile=PROFILE).run()
@@ -0,0 +1,552 @@
+# batch.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Batch simulation module for Breakout
+
+This module contains the class BatchPlay, which plays many independent games of
+Breakout at once.  Where Play keeps one Paddle, Ball and list of Bricks, BatchPlay keeps
+the state of every game in NumPy arrays (ball positions and velocities, paddle positions
+and a brick-alive bitmap per game).  Every step moves all of the balls, bounces them off
+the walls, bricks and paddles, and applies the kicker with a handful of array operations
+instead of a Python loop per game.
+
+The rules are the same as in Play, with the same collision test.  If SWEPT_COLLISIONS
+is True, each ball is moved from impact to impact (at most MAX_BOUNCES of them each
+step), bouncing at the exact time it touches a brick, the paddle or a wall, as in
+Play._sweepBall.  Otherwise, a brick or the paddle is hit when it contains one of the
+four corners of the ball's bounding box at the end of the step, and only the first brick
+hit (in row-major order) is removed each step.  Either way, the paddle quarters reverse
+the horizontal direction of the ball, and every KICK_INTERVAL paddle hits the ball is
+kicked by KICK_FACTOR.
+
+Like HeadlessPlay, this class never draws anything or plays any sounds."""
+from constants import *
+import numpy as np
+
+
+class BatchPlay(object):
+    """An instance controls N games of breakout stepped in lockstep.
+    
+    Game i of the batch is described by entry i of each of the attributes below.
+    Games do not interact; a game with no ball in play (because it was never served
+    or because the ball was lost) simply stands still while the others move.
+    
+    INSTANCE ATTRIBUTES:
+        _n          [int > 0]: the number of games in the batch
+        _random     [numpy RandomState]: the random generator for serve velocities
+        _ballX      [float array of size n]: the x coordinate of each ball
+        _ballY      [float array of size n]: the y coordinate of each ball
+        _ballVX     [float array of size n]: the x velocity of each ball
+        _ballVY     [float array of size n]: the y velocity of each ball
+        _hasBall    [bool array of size n]: True where a ball is in play
+        _paddleX    [float array of size n]: the x coordinate of each paddle
+        _alive      [bool array of shape (n, BRICK_ROWS, BRICKS_IN_ROW)]: True
+                    where the brick at (row, column) of a game is still standing
+        _bricks     [int array of size n]: the number of bricks left in each game
+        _tries      [int array of size n]: the number of tries left in each game
+        _kickCounter [int array of size n]: the paddle hits since the last kick
+        _brickX     [float array of size BRICKS_IN_ROW]: the x coordinate of the
+                    center of the bricks in each column
+        _brickY     [float array of size BRICK_ROWS]: the y coordinate of the
+                    center of the bricks in each row
+        _dx         [float > 0]: horizontal distance between brick centers
+        _dy         [float > 0]: vertical distance between brick centers"""
+    
+    # GETTERS AND SETTERS
+    def getSize(self):
+        """Returns: the number of games in this batch."""
+        return self._n
+    
+    def getTries(self):
+        """Returns: an int array with the number of tries left in each game."""
+        return self._tries.copy()
+    
+    def hasBall(self):
+        """Returns: a bool array that is True for each game with a ball in play."""
+        return self._hasBall.copy()
+    
+    def noBricks(self):
+        """Returns: a bool array that is True for each game with no bricks left."""
+        return self._bricks == 0
+    
+    def getBricksLeft(self):
+        """Returns: an int array with the number of bricks left in each game."""
+        return self._bricks.copy()
+    
+    def getPaddleX(self):
+        """Returns: a float array with the x coordinate of each paddle."""
+        return self._paddleX.copy()
+    
+    def getBallState(self):
+        """Returns: a float array of shape (n, 4) with the position and velocity
+        (x, y, vx, vy) of each ball.  The row of a game with no ball in play is
+        the state of its last ball."""
+        return np.column_stack((self._ballX, self._ballY, self._ballVX, self._ballVY))
+    
+    def getBoards(self):
+        """Returns: a bool array of shape (n, BRICK_ROWS, BRICKS_IN_ROW) that is True
+        where the brick at (row, column) of a game still stands."""
+        return self._alive.copy()
+    
+    # INITIALIZER
+    def __init__(self, n, seed=None):
+        """Initializer for the class BatchPlay
+        
+        Every game starts like a new Play: all bricks standing, the paddle centered,
+        NUMBER_TURNS tries left and no ball in play.
+        
+        Parameter n: the number of games to play at once
+        Precondition: n is an int > 0
+        
+        Parameter seed: the seed for the serve velocities (None for a random seed)
+        Precondition: seed is None or an int >= 0"""
+        self._n = n
+        self._random = np.random.RandomState(seed)
+        
+        #xStart and yStart are the center coordinates of the top left brick
+        xStart = BRICK_SEP_H/2.0 + BRICK_WIDTH/2
+        yStart = GAME_HEIGHT - BRICK_Y_OFFSET - BRICK_HEIGHT/2.0
+        self._dx = BRICK_WIDTH + BRICK_SEP_H
+        self._dy = BRICK_HEIGHT + BRICK_SEP_V
+        self._brickX = xStart + np.arange(BRICKS_IN_ROW)*self._dx
+        self._brickY = yStart - np.arange(BRICK_ROWS)*self._dy
+        
+        self._alive = np.ones((n, BRICK_ROWS, BRICKS_IN_ROW), dtype=bool)
+        self._bricks = np.empty(n, dtype=np.int64)
+        self._bricks.fill(BRICK_ROWS*BRICKS_IN_ROW)
+        self._tries = np.empty(n, dtype=np.int64)
+        self._tries.fill(NUMBER_TURNS)
+        
+        self._paddleX = np.empty(n)
+        self._paddleX.fill(GAME_WIDTH/2.0)
+        
+        self._ballX = np.zeros(n)
+        self._ballY = np.zeros(n)
+        self._ballVX = np.zeros(n)
+        self._ballVY = np.zeros(n)
+        self._hasBall = np.zeros(n, dtype=bool)
+        self._kickCounter = np.zeros(n, dtype=np.int64)
+    
+    # METHOD TO START OVER
+    def resetGames(self, mask=None):
+        """Starts a new game in every game selected by mask.
+        
+        Each of these games is put back the way __init__ makes it: all bricks
+        standing, the paddle centered, NUMBER_TURNS tries left and no ball in play.
+        The other games are not changed.
+        
+        Parameter mask: the games to start over (None for every game)
+        Precondition: mask is None or a bool array of size n"""
+        if mask is None:
+            mask = np.ones(self._n, dtype=bool)
+        self._alive[mask] = True
+        self._bricks[mask] = BRICK_ROWS*BRICKS_IN_ROW
+        self._tries[mask] = NUMBER_TURNS
+        self._paddleX[mask] = GAME_WIDTH/2.0
+        self._hasBall[mask] = False
+        self._kickCounter[mask] = 0
+    
+    # UPDATE METHODS TO MOVE PADDLES, SERVE AND MOVE THE BALLS
+    def updatePaddles(self, direction):
+        """Moves each paddle PADDLE_SPEED in the given direction.
+        
+        As in Play.updatePaddle, a paddle does not move past the edge of the window.
+        
+        Parameter direction: the direction to move each paddle
+        Precondition: direction is an int array of size n (or a single int) with
+        values PADDLE_STILL, PADDLE_RIGHT or PADDLE_LEFT"""
+        buffer = PADDLE_SPEED + PADDLE_WIDTH/2.0
+        direction = np.asarray(direction)
+        right = (direction == PADDLE_RIGHT) & (self._paddleX <= GAME_WIDTH - buffer)
+        left  = (direction == PADDLE_LEFT) & (self._paddleX >= buffer)
+        self._paddleX += np.where(right, PADDLE_SPEED,
+                                  np.where(left, -PADDLE_SPEED, 0))
+    
+    def serveBalls(self, mask=None):
+        """Serves a new ball in every game selected by mask that has no ball in play.
+        
+        Each ball starts in the center of the window with the same random velocity
+        as a served Ball.  The kicker of each served game is reset.
+        
+        Parameter mask: the games to serve in (None for every game)
+        Precondition: mask is None or a bool array of size n"""
+        serve = ~self._hasBall
+        if mask is not None:
+            serve &= mask
+        count = int(serve.sum())
+        if count == 0:
+            return
+        
+        vx = self._random.uniform(1.0, 5.0, count)
+        vx *= self._random.choice([-1, 1], count)
+        self._ballX[serve] = GAME_WIDTH/2.0
+        self._ballY[serve] = GAME_HEIGHT/2.0
+        self._ballVX[serve] = vx
+        self._ballVY[serve] = -5.0
+        self._hasBall[serve] = True
+        self._kickCounter[serve] = 0
+    
+    def updateBalls(self, time):
+        """Moves every ball in play and processes its collisions.
+        
+        A ball that falls out of the bottom of the window is removed from play and
+        costs its game a try.  The collision test is the one of Play.updateBall
+        (see SWEPT_COLLISIONS).
+        
+        To keep each step cheap, the collision tests only look at the games whose
+        ball is close enough to the bricks, the paddle or a wall to touch it.
+        
+        Parameter time: Amount of time for which the balls have moved.
+        Precondition: time is a float or an int and time >= 0."""
+        if SWEPT_COLLISIONS:
+            self._sweepBalls(time)
+            return
+        
+        active = self._hasBall
+        self._ballX += np.where(active, time*self._ballVX, 0.0)
+        self._ballY += np.where(active, time*self._ballVY, 0.0)
+        
+        r = BALL_DIAMETER/2.0
+        yBricks = GAME_HEIGHT - BRICK_Y_OFFSET - BRICK_ROWS*self._dy
+        near = np.flatnonzero(active & (self._ballY + r > yBricks))
+        if len(near) > 0:
+            self._brickCollisions(near)
+        
+        near = np.flatnonzero(active & (self._ballY - r < PADDLE_OFFSET + PADDLE_HEIGHT)
+                              & (self._ballVY < 0))
+        if len(near) > 0:
+            self._paddleCollisions(near)
+        
+        near = np.flatnonzero(active & ((self._ballY + r >= GAME_HEIGHT) |
+                                        (self._ballY + r <= 0) |
+                                        (self._ballX - r <= 0) |
+                                        (self._ballX + r >= GAME_WIDTH)))
+        if len(near) > 0:
+            self._wallCollisions(near)
+    
+    # HELPER METHODS FOR PHYSICS AND COLLISION DETECTION
+    def _brickCollisions(self, games):
+        """Removes the first brick hit by each ball and bounces that ball vertically.
+        
+        Parameter games: the games to check, all with a ball in play
+        Precondition: games is an int array of distinct game indices"""
+        r = BALL_DIAMETER/2.0
+        rows = BRICK_ROWS
+        cols = BRICKS_IN_ROW
+        yTop = GAME_HEIGHT - BRICK_Y_OFFSET
+        x = self._ballX[games]
+        y = self._ballY[games]
+        
+        #the first brick hit is the smallest (row-major) index hit by any corner
+        none = rows*cols
+        first = np.empty(len(games), dtype=np.int64)
+        first.fill(none)
+        for sx, sy in ((-r,-r), (r,-r), (-r,r), (r,r)):
+            cx = x + sx
+            cy = y + sy
+            c = np.floor(cx/self._dx).astype(np.int64)
+            w = np.floor((yTop-cy)/self._dy).astype(np.int64)
+            inside = (c >= 0) & (c < cols) & (w >= 0) & (w < rows)
+            np.clip(c, 0, cols-1, c)
+            np.clip(w, 0, rows-1, w)
+            hit = (inside & self._alive[games, w, c]
+                   & (np.abs(cx-self._brickX[c]) < BRICK_WIDTH/2.0)
+                   & (np.abs(cy-self._brickY[w]) < BRICK_HEIGHT/2.0))
+            first = np.where(hit, np.minimum(first, w*cols+c), first)
+        
+        hit = first < none
+        if not hit.any():
+            return
+        games = games[hit]
+        cells = first[hit]
+        self._alive[games, cells // cols, cells % cols] = False
+        self._bricks[games] -= 1
+        self._ballVY[games] = -self._ballVY[games]
+    
+    def _paddleCollisions(self, games):
+        """Bounces each ball that hits its paddle and updates the kickers.
+        
+        A ball that hits the outer quarter of a paddle while moving towards the
+        center of the paddle also reverses its horizontal direction.
+        
+        Parameter games: the games to check, all with a ball in play
+        Precondition: games is an int array of distinct game indices"""
+        r = BALL_DIAMETER/2.0
+        py = PADDLE_OFFSET + PADDLE_HEIGHT/2.0
+        x = self._ballX[games]
+        y = self._ballY[games]
+        px = self._paddleX[games]
+        hit = np.zeros(len(games), dtype=bool)
+        for sx, sy in ((-r,-r), (r,-r), (-r,r), (r,r)):
+            hit |= ((np.abs(x+sx-px) < PADDLE_WIDTH/2.0)
+                    & (np.abs(y+sy-py) < PADDLE_HEIGHT/2.0))
+        hit &= self._ballVY[games] < 0
+        if hit.any():
+            self._paddleBounces(games[hit])
+    
+    def _paddleBounces(self, games):
+        """Bounces each ball off the top of its paddle and updates the kickers.
+        
+        A ball on the outer quarter of a paddle that is moving towards the center
+        of the paddle also reverses its horizontal direction.
+        
+        Parameter games: the games whose ball hits its paddle
+        Precondition: games is an int array of distinct game indices"""
+        x = self._ballX[games]
+        px = self._paddleX[games]
+        movingRight = self._ballVX[games] > 0
+        reverse = (((x <= px - PADDLE_WIDTH/2.0 + PADDLE_WIDTH/4.0) & movingRight) |
+                   ((x >= px + PADDLE_WIDTH/2.0 - PADDLE_WIDTH/4.0) & ~movingRight))
+        self._ballVX[games[reverse]] *= -1
+        self._ballVY[games] *= -1
+        
+        #the kicker
+        self._kickCounter[games] += 1
+        kick = games[self._kickCounter[games] >= KICK_INTERVAL]
+        self._ballVX[kick] *= KICK_FACTOR
+        self._kickCounter[kick] = 0
+    
+    def _wallCollisions(self, games):
+        """Bounces each ball off the left, right and top walls, and takes each ball
+        that reached the bottom of the window out of play (losing a try).
+        
+        Parameter games: the games to check, all with a ball in play
+        Precondition: games is an int array of distinct game indices"""
+        r = BALL_DIAMETER/2.0
+        x = self._ballX[games]
+        top = self._ballY[games] + r
+        self._ballVY[games[top >= GAME_HEIGHT]] *= -1
+        
+        lost = top <= 0
+        self._hasBall[games[lost]] = False
+        self._tries[games[lost]] -= 1
+        
+        stay = ~lost
+        self._ballVX[games[stay & (x - r <= 0)]] *= -1
+        self._ballVX[games[stay & (x + r >= GAME_WIDTH)]] *= -1
+    
+    def _sweepBalls(self, time):
+        """Moves every ball in play for the given amount of time, bouncing each
+        ball at the exact moment of each impact with a brick, the paddle or a wall.
+        
+        This is Play._sweepBall for all of the games at once.  Each round finds the
+        first impact of every ball that is still moving (see _firstImpacts), moves
+        the ball up to it and bounces it.  After MAX_BOUNCES rounds, a ball only
+        moves up to its next impact (if any).  A ball that ends up below the bottom
+        of the window is taken out of play (losing a try).
+        
+        Parameter time: Amount of time for which the balls have moved.
+        Precondition: time is a float or an int and time >= 0."""
+        r = BALL_DIAMETER/2.0
+        active = self._hasBall
+        x1 = self._ballX + time*self._ballVX
+        y1 = self._ballY + time*self._ballVY
+        yBricks = GAME_HEIGHT - BRICK_Y_OFFSET - BRICK_ROWS*self._dy
+        near = active & ((np.minimum(self._ballX, x1) - r <= 0) |
+                         (np.maximum(self._ballX, x1) + r >= GAME_WIDTH) |
+                         (np.maximum(self._ballY, y1) + r >= yBricks) |
+                         (np.minimum(self._ballY, y1) - r <= PADDLE_OFFSET + PADDLE_HEIGHT))
+        
+        #the balls that cannot touch anything move the whole way at once
+        far = active & ~near
+        self._ballX[far] = x1[far]
+        self._ballY[far] = y1[far]
+        
+        games = np.flatnonzero(near)
+        left = np.empty(len(games))
+        left.fill(time)
+        for i in range(MAX_BOUNCES):
+            if len(games) == 0:
+                break
+            t, vertical, cell, paddle = self._firstImpacts(games, left)
+            hit = t <= left
+            
+            #the balls that hit nothing finish their move
+            done = games[~hit]
+            self._ballX[done] += left[~hit]*self._ballVX[done]
+            self._ballY[done] += left[~hit]*self._ballVY[done]
+            
+            games = games[hit]
+            t = t[hit]
+            vertical = vertical[hit]
+            cell = cell[hit]
+            paddle = paddle[hit]
+            left = left[hit]
+            self._ballX[games] += t*self._ballVX[games]
+            self._ballY[games] += t*self._ballVY[games]
+            left -= t
+            
+            bounce = paddle & vertical
+            self._paddleBounces(games[bounce])
+            self._ballVY[games[vertical & ~bounce]] *= -1
+            self._ballVX[games[~vertical]] *= -1
+            
+            brick = cell >= 0
+            broken = games[brick]
+            cell = cell[brick]
+            self._alive[broken, cell // BRICKS_IN_ROW, cell % BRICKS_IN_ROW] = False
+            self._bricks[broken] -= 1
+        else:
+            #out of bounces: stop at the next impact rather than go through it
+            t = self._firstImpacts(games, left)[0]
+            left = np.minimum(t, left)
+        self._ballX[games] += left*self._ballVX[games]
+        self._ballY[games] += left*self._ballVY[games]
+        
+        lost = np.flatnonzero(active & (self._ballY + r <= 0))
+        self._hasBall[lost] = False
+        self._tries[lost] -= 1
+    
+    def _firstImpacts(self, games, time):
+        """Returns: the first impact of the ball of each game within the given
+        amount of time, as the tuple of arrays (t, vertical, cell, paddle).
+        
+        This is Play._firstImpact for many games at once.  Entry i of each array is
+        the impact of the ball of game games[i]: t is the time of the impact (inf if
+        the ball hits nothing in time[i]), vertical is True if the ball should bounce
+        vertically (False if horizontally), cell is the row-major index of the brick
+        hit (-1 for none) and paddle is True if the ball hits the paddle.  If several
+        impacts happen at the same time, bricks come first (in row-major order), then
+        the paddle, then the walls.
+        
+        Parameter games: the games to check, all with a ball in play
+        Precondition: games is an int array of distinct game indices
+        
+        Parameter time: the amount of time for which the ball of each game will move
+        Precondition: time is a float array of the same size as games, all >= 0"""
+        r = BALL_DIAMETER/2.0
+        rows = BRICK_ROWS
+        cols = BRICKS_IN_ROW
+        x = self._ballX[games]
+        y = self._ballY[games]
+        vx = self._ballVX[games]
+        vy = self._ballVY[games]
+        n = len(games)
+        first = np.empty(n)
+        first.fill(np.inf)
+        vertical = np.zeros(n, dtype=bool)
+        cell = np.empty(n, dtype=np.int64)
+        cell.fill(-1)
+        paddle = np.zeros(n, dtype=bool)
+        
+        #the bricks in the cells near the path of each ball, in row-major order
+        yTop = GAME_HEIGHT - BRICK_Y_OFFSET
+        x1 = x + vx*time
+        y1 = y + vy*time
+        c0 = np.maximum(np.floor((np.minimum(x, x1)-r)/self._dx), 0).astype(np.int64)
+        c1 = np.minimum(np.floor((np.maximum(x, x1)+r)/self._dx), cols-1).astype(np.int64)
+        w0 = np.maximum(np.floor((yTop-(np.maximum(y, y1)+r))/self._dy), 0).astype(np.int64)
+        w1 = np.minimum(np.floor((yTop-(np.minimum(y, y1)-r))/self._dy), rows-1).astype(np.int64)
+        some = np.flatnonzero((c0 <= c1) & (w0 <= w1))
+        if len(some) > 0:
+            for dw in range(int((w1-w0)[some].max())+1):
+                for dc in range(int((c1-c0)[some].max())+1):
+                    c = c0[some] + dc
+                    w = w0[some] + dw
+                    ok = (c <= c1[some]) & (w <= w1[some])
+                    i = some[ok]
+                    c = c[ok]
+                    w = w[ok]
+                    ok = self._alive[games[i], w, c]
+                    i = i[ok]
+                    c = c[ok]
+                    w = w[ok]
+                    bx = self._brickX[c]
+                    by = self._brickY[w]
+                    t, v = self._sweepBoxes(x[i], y[i], vx[i], vy[i], time[i],
+                                            bx-BRICK_WIDTH/2.0, by-BRICK_HEIGHT/2.0,
+                                            bx+BRICK_WIDTH/2.0, by+BRICK_HEIGHT/2.0)
+                    ok = t < first[i]
+                    i = i[ok]
+                    first[i] = t[ok]
+                    vertical[i] = v[ok]
+                    cell[i] = w[ok]*cols + c[ok]
+        
+        #the paddle (only from above)
+        i = np.flatnonzero(vy < 0)
+        px = self._paddleX[games[i]]
+        py = PADDLE_OFFSET + PADDLE_HEIGHT/2.0
+        t, v = self._sweepBoxes(x[i], y[i], vx[i], vy[i], time[i],
+                                px-PADDLE_WIDTH/2.0, py-PADDLE_HEIGHT/2.0,
+                                px+PADDLE_WIDTH/2.0, py+PADDLE_HEIGHT/2.0)
+        ok = t < first[i]
+        i = i[ok]
+        first[i] = t[ok]
+        vertical[i] = v[ok]
+        cell[i] = -1
+        paddle[i] = True
+        
+        #the left, right and top walls
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sides = np.where(vx < 0, (r-x)/vx,
+                             np.where(vx > 0, (GAME_WIDTH-r-x)/vx, np.inf))
+            ceiling = np.where(vy > 0, (GAME_HEIGHT-r-y)/vy, np.inf)
+        for t, v in ((sides, False), (ceiling, True)):
+            t = np.maximum(t, 0.0)
+            ok = (t <= time) & (t < first)
+            first[ok] = t[ok]
+            vertical[ok] = v
+            cell[ok] = -1
+            paddle[ok] = False
+        return (first, vertical, cell, paddle)
+    
+    def _sweepBoxes(self, x, y, vx, vy, time, left, bottom, right, top):
+        """Returns: the first time at which each moving ball touches its box, as the
+        pair of arrays (t, vertical).
+        
+        This is Play._sweepBox for many balls at once, each with its own box: t is
+        inf for a ball that does not touch its box in time, and vertical is True for
+        a ball that hits the top or bottom of its box (False for a side).
+        
+        Parameter x, y, vx, vy: the position and velocity of each ball
+        Precondition: x, y, vx and vy are float arrays of the same size
+        
+        Parameter time: the amount of time for which each ball will move
+        Precondition: time is a float array of the same size as x, all >= 0
+        
+        Parameter left, bottom, right, top: the edges of the box of each ball
+        Precondition: left, bottom, right and top are floats or float arrays of the
+        same size as x, with left <= right and bottom <= top"""
+        r = BALL_DIAMETER/2.0
+        n = len(x)
+        miss = np.zeros(n, dtype=bool)
+        
+        #the times at which the center crosses the sides of the grown box
+        tEnter = np.empty(n)
+        tEnter.fill(-np.inf)
+        tExit = np.empty(n)
+        tExit.fill(np.inf)
+        vertical = np.zeros(n, dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for p, v, lo, hi, axis in ((x,vx,left,right,False),
+                                       (y,vy,bottom,top,True)):
+                still = v == 0
+                miss |= still & ~((lo-r < p) & (p < hi+r))
+                t0 = (lo-r-p)/v
+                t1 = (hi+r-p)/v
+                t0, t1 = np.minimum(t0, t1), np.maximum(t0, t1)
+                t0[still] = -np.inf
+                t1[still] = np.inf
+                later = t0 > tEnter
+                tEnter[later] = t0[later]
+                vertical[later] = axis
+                tExit = np.minimum(tExit, t1)
+            miss |= (tEnter > tExit) | (tExit < 0) | (tEnter > time)
+            
+            #rounded corners need a circle test against the corner itself
+            t = np.maximum(tEnter, 0.0)
+            qx = x + vx*t
+            qy = y + vy*t
+            corner = ((qx < left) | (qx > right)) & ((qy < bottom) | (qy > top))
+            dx = x - np.where(qx < left, left, right)
+            dy = y - np.where(qy < bottom, bottom, top)
+            a = vx*vx + vy*vy
+            b = 2*(dx*vx + dy*vy)
+            c = dx*dx + dy*dy - r*r
+            disc = b*b - 4*a*c
+            t = (-b - np.sqrt(disc))/(2*a)
+            miss |= np.where(corner, (c < 0) | (disc < 0) | (t < 0) | (t > time),
+                             tEnter < 0)
+            vertical = np.where(corner, np.abs(dy + vy*t) >= np.abs(dx + vx*t),
+                                vertical)
+        return (np.where(miss, np.inf, np.where(corner, t, tEnter)), vertical)
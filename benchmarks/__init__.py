@@ -0,0 +1,30 @@
+# __init__.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Benchmarks for Breakout
+
+This package times the hot paths of the game: the physics in Play (updateBall,
+_collisionHelper, Brick.collides) and the geometry and drawing cache of game2d
+(GObject.contains, GRectangle._reset and the setters in each validation mode).  It
+also measures the memory of each brick.  To run every benchmark, go to the folder with
+breakout.py and type
+
+    python -m benchmarks --output results.json
+
+The physics benchmarks are run once for each board size.  Each board size is run in its
+own Python process, with the number of bricks in a row and of brick rows as the two
+command line arguments, which is how constants.py changes BRICKS_IN_ROW and BRICK_ROWS.
+The results are written as JSON, so that the results of two commits can be compared
+with
+
+    python -m benchmarks --compare old.json new.json
+
+The modules of this package are
+
+    timing    (measures a single benchmark)
+    physics   (the physics benchmarks for the current board size)
+    graphics  (the game2d benchmarks)"""
+import os
+
+# Kivy must not read the command line arguments of the benchmarks
+os.environ.setdefault('KIVY_NO_ARGS', '1')
@@ -0,0 +1,144 @@
+# __main__.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""__main__ module for the Breakout benchmarks
+
+This module runs every benchmark and saves the results.  Run it from the folder with
+breakout.py:
+
+    python -m benchmarks [--sizes 5x5,10x10] [--output results.json]
+
+The physics benchmarks are run in a new Python process for each board size (given as
+COLUMNSxROWS), as the board size is read from the command line when constants.py is
+imported.  The results are printed as a table and, with --output, saved as JSON along
+with the commit and the version of Python.
+
+To compare two saved results, use
+
+    python -m benchmarks --compare old.json new.json
+
+which prints the ratio new/old of the time (or memory) of every benchmark in both
+files."""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import graphics
+
+
+#: the board sizes (bricks in a row, brick rows) to run by default
+SIZES = ((5, 5), (10, 10), (20, 20), (40, 20))
+
+
+def runPhysics(columns, rows):
+    """Returns: the results of the physics benchmarks for the given board size.
+    
+    The benchmarks are run in a new Python process.
+    
+    Parameter columns: the number of bricks in a row
+    Precondition: columns is an int > 0
+    
+    Parameter rows: the number of brick rows
+    Precondition: rows is an int > 0"""
+    output = subprocess.check_output([sys.executable, '-m', 'benchmarks.physics',
+                                      str(columns), str(rows)])
+    # Kivy may log to stdout before the results
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def commit():
+    """Returns: the current git commit, or None if it is not known."""
+    try:
+        with open(os.devnull, 'w') as null:
+            return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                           stderr=null).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def label(result):
+    """Returns: the name and parameters of a result as a string.
+    
+    Parameter result: a benchmark result
+    Precondition: result is a dictionary made by timing.measure"""
+    params = ' '.join('%s=%s' % item for item in sorted(result['params'].items()))
+    return '%s %s' % (result['name'], params)
+
+
+def value(result):
+    """Returns: the pair (number, unit) that a result is compared by.
+    
+    This is the time of the benchmark, or its memory for a memory benchmark.
+    
+    Parameter result: a benchmark result
+    Precondition: result is a dictionary made by timing.measure or timing.footprint"""
+    if 'bytes_per_object' in result:
+        return (result['bytes_per_object'], 'B/obj')
+    return (result['ns_per_op'], 'ns/op')
+
+
+def show(results):
+    """Prints the results as a table.
+    
+    Parameter results: the benchmark results
+    Precondition: results is a list of dictionaries made by timing.measure or
+    timing.footprint"""
+    for result in results:
+        if 'bytes_per_object' in result:
+            objects = result['objects_per_object']
+        else:
+            objects = result['objects_per_op']
+        number, unit = value(result)
+        print '%-60s %12.1f %-5s %8.2f obj' % (label(result), number, unit, objects)
+
+
+def compare(old, new):
+    """Prints the ratio new/old of the time (or memory) of every benchmark in both
+    files.
+    
+    Parameter old: the path of the older results
+    Precondition: old is the path of a JSON file saved by this module
+    
+    Parameter new: the path of the newer results
+    Precondition: new is the path of a JSON file saved by this module"""
+    with open(old) as file:
+        before = dict((label(r), r) for r in json.load(file)['results'])
+    with open(new) as file:
+        after = json.load(file)['results']
+    for result in after:
+        key = label(result)
+        if key in before and value(before[key])[0] > 0:
+            old, unit = value(before[key])
+            new = value(result)[0]
+            print '%-60s %12.1f -> %12.1f %s (%.2fx)' % (key, old, new, unit, new/old)
+
+
+def main():
+    """Runs the benchmarks (or the comparison) given on the command line."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--sizes', default=','.join('%dx%d' % s for s in SIZES),
+                        help='board sizes as COLUMNSxROWS, separated by commas')
+    parser.add_argument('--output', help='file to save the results to as JSON')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='compare two saved results instead')
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+        return
+    
+    results = graphics.run()
+    for size in args.sizes.split(','):
+        columns, rows = map(int, size.split('x'))
+        results += runPhysics(columns, rows)
+    show(results)
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'commit': commit(), 'python': sys.version.split()[0],
+                       'results': results}, file, indent=1, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
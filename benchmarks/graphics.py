@@ -0,0 +1,63 @@
+# graphics.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Graphics benchmarks for Breakout
+
+This module times the geometry and the drawing cache of the objects in game2d.  These
+do not depend on the board size, so they are only run once.  None of them needs a
+window.
+
+The benchmarks are
+
+    contains  GObject.contains (GRectangle) and GEllipse.contains, for an object that
+              is not rotated and for one that is
+    reset     GRectangle._reset, with and without a border
+    setter    the setters of a GRectangle for a number (x), a pair of numbers (scale)
+              and a color (fillcolor), in each validation mode"""
+from game2d import *
+from timing import measure
+
+
+def contains():
+    """Returns: the list of results of the contains benchmarks."""
+    results = []
+    for shape, cls in (('rectangle', GRectangle), ('ellipse', GEllipse)):
+        for angle in (0, 30):
+            obj = cls(x=100, y=100, width=60, height=20, angle=angle)
+            results.append(measure('contains', lambda: obj.contains(110, 102),
+                                   shape=shape, angle=angle))
+    return results
+
+
+def reset():
+    """Returns: the list of results of the reset benchmarks."""
+    results = []
+    for linewidth in (0, 2):
+        obj = GRectangle(x=100, y=100, width=60, height=20, linewidth=linewidth)
+        results.append(measure('reset', obj._reset, linewidth=linewidth))
+    return results
+
+
+def setter():
+    """Returns: the list of results of the setter benchmarks.
+    
+    The validation mode is put back as it was when the benchmarks are done."""
+    results = []
+    mode = get_validation()
+    try:
+        for validation in VALIDATION_MODES:
+            set_validation(validation)
+            obj = GRectangle(x=100, y=100, width=60, height=20)
+            for attribute, value in (('x', 120.0), ('scale', (1.5, 2.0)),
+                                     ('fillcolor', (1.0, 0.5, 0.0, 1.0))):
+                results.append(measure('setter',
+                                       lambda: setattr(obj, attribute, value),
+                                       attribute=attribute, validation=validation))
+    finally:
+        set_validation(mode)
+    return results
+
+
+def run():
+    """Returns: the list of results of every benchmark in this module."""
+    return contains()+reset()+setter()
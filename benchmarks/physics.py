@@ -0,0 +1,231 @@
+# physics.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Physics benchmarks for Breakout
+
+This module times the physics of a HeadlessPlay for the current board size (the
+constants BRICKS_IN_ROW and BRICK_ROWS).  Run it as
+
+    python -m benchmarks.physics 20 20
+
+to time a board with 20 bricks in each of 20 rows.  It prints the results as a JSON
+list.  Usually it is run by the module benchmarks (once for each board size).
+
+The benchmarks are
+
+    updateBall      one physics step of a ball that the paddle follows, for each
+                    ball speed, number of kicks and collision method
+    frame           one frame of the game (updatePaddle and the physics steps of
+                    one frame at 60 frames per second)
+    collisionHelper the discrete collision test, with the ball among the bricks
+                    and with the ball far from every brick
+    collides        Brick.collides for a ball that hits the brick and for a ball
+                    that misses it
+    environment     one step of a BreakoutEnv and of a VectorBreakoutEnv (for all
+                    of its games at once), with the paddle following the ball
+    memory          the bytes taken by each brick, for a Brick and (for reference)
+                    for the GRectangle that each brick used to be"""
+import itertools
+import json
+import numpy as np
+import play
+from constants import *
+from game2d import GRectangle
+from headless import *
+from environment import *
+from timing import measure, footprint
+
+
+#: the ball speeds (as multiples of the serve speed) to time
+SPEEDS = (1, 2, 4)
+#: the number of kicks to time (each kick multiplies the horizontal speed)
+KICKS  = (0, 3)
+#: the number of games of the VectorBreakoutEnv to time
+VECTOR_ENVS = 1024
+#: the size of the reference GRectangle in the memory benchmark (a brick of the
+#: default board of 10 columns)
+REFERENCE_WIDTH  = 43
+REFERENCE_HEIGHT = 8
+
+
+class _Autopilot(object):
+    """An instance plays a game by keeping the paddle under the ball.
+    
+    A game that is lost or won is replaced by a new one, so that the benchmark always
+    times a game in progress.
+    
+    INSTANCE ATTRIBUTES:
+        game   [HeadlessPlay]: the game being played
+        _speed [int or float > 0]: the factor for the speed of every serve
+        _kicks [int >= 0]: the number of kicks for every serve"""
+    
+    def __init__(self, speed=1, kicks=0):
+        """Initializer for class _Autopilot.  Starts a new game.
+        
+        Parameter speed: the factor for the speed of every serve
+        Precondition: speed is an int or float > 0
+        
+        Parameter kicks: the number of kicks for every serve
+        Precondition: kicks is an int >= 0"""
+        self._speed = speed
+        self._kicks = kicks
+        self._newGame()
+    
+    def step(self, time):
+        """Moves the paddle under the ball and updates the ball.
+        
+        Parameter time: the time given to updateBall
+        Precondition: time is a float > 0"""
+        if not self.game.hasBall():
+            if self.game.getTries() == 0:
+                self._newGame()
+            else:
+                self._serve()
+        game = self.game
+        paddle = game._paddle
+        buffer = PADDLE_WIDTH/2.0
+        paddle.x = min(max(game.getBallState()[0], buffer), GAME_WIDTH-buffer)
+        game.updateBall(time)
+        if game.noBricks():
+            self._newGame()
+    
+    def _newGame(self):
+        """Starts a new game and serves the ball."""
+        self.game = HeadlessPlay(0)
+        self._serve()
+    
+    def _serve(self):
+        """Serves the ball with the speed and kicks of this autopilot."""
+        self.game.serveBall()
+        balls = self.game._balls
+        balls.getVX()[0] *= self._speed*KICK_FACTOR**self._kicks
+        balls.getVY()[0] *= self._speed
+
+
+def updateBall():
+    """Returns: the list of results of the updateBall benchmarks."""
+    results = []
+    step = GAME_SPEED/PHYSICS_RATE
+    swept = play.SWEPT_COLLISIONS
+    try:
+        for method in (True, False):
+            play.SWEPT_COLLISIONS = method
+            for speed in SPEEDS:
+                for kicks in KICKS:
+                    pilot = _Autopilot(speed, kicks)
+                    results.append(measure('updateBall', lambda: pilot.step(step),
+                                           speed=speed, kicks=kicks, swept=method))
+    finally:
+        play.SWEPT_COLLISIONS = swept
+    return results
+
+
+def frame():
+    """Returns: the list of results of the frame benchmark."""
+    pilot = _Autopilot()
+    input = HeadlessInput()
+    steps = PHYSICS_RATE/60
+    step = GAME_SPEED/PHYSICS_RATE
+    
+    def op():
+        pilot.game.updatePaddle(input)
+        for i in range(steps):
+            pilot.step(step)
+    return [measure('frame', op, steps=steps)]
+
+
+def collisionHelper():
+    """Returns: the list of results of the collisionHelper benchmarks.
+    
+    The ball never touches a brick, so no brick is removed.  Among the bricks, it
+    sits in the gap below the brick in the middle of the board."""
+    results = []
+    game = HeadlessPlay(0)
+    game.serveBall()
+    ball = game._cursor
+    middle = game._bricks[(BRICK_ROWS/2)*BRICKS_IN_ROW + BRICKS_IN_ROW/2]
+    for place, y in (('bricks', middle.bottom-BRICK_SEP_V/2.0),
+                     ('open', GAME_HEIGHT/2.0)):
+        ball.x = middle.x
+        ball.y = y
+        results.append(measure('collisionHelper', game._collisionHelper,
+                               place=place))
+    return results
+
+
+def collides():
+    """Returns: the list of results of the collides benchmarks."""
+    results = []
+    ball = HeadlessBall()
+    brick = Brick(0, 0, BRICK_COLORS[0])
+    for place, x in (('hit', BRICK_WIDTH/2.0), ('miss', 2*BRICK_WIDTH)):
+        ball.x = x
+        ball.y = 0
+        results.append(measure('collides', lambda: brick.collides(ball), place=place))
+    return results
+
+
+def environment():
+    """Returns: the list of results of the environment benchmarks."""
+    single = BreakoutEnv(0)
+    state = [single.reset()]
+    
+    def step():
+        obs = state[0]
+        obs, reward, done, info = single.step(_follow(obs[0], obs[4]))
+        state[0] = single.reset() if done else obs
+    results = [measure('environment', step, envs=1)]
+    
+    vector = VectorBreakoutEnv(VECTOR_ENVS, 0)
+    state.append(vector.reset())
+    
+    def steps():
+        obs = state[1]
+        state[1] = vector.step(_follow(obs[:, 0], obs[:, 4]))[0]
+    results.append(measure('environment', steps, envs=VECTOR_ENVS))
+    return results
+
+
+def _follow(ball, paddle):
+    """Returns: the action (or array of actions) that moves the paddle to the ball.
+    
+    Parameter ball: the x coordinate of the ball
+    Precondition: ball is a float or a float array
+    
+    Parameter paddle: the x coordinate of the paddle
+    Precondition: paddle is a float or a float array of the same size as ball"""
+    return np.where(ball > paddle+PADDLE_SPEED, PADDLE_RIGHT,
+                    np.where(ball < paddle-PADDLE_SPEED, PADDLE_LEFT, PADDLE_STILL))
+
+
+def memory():
+    """Returns: the list of results of the memory benchmarks.
+    
+    Every brick is made at its own position, as in a real board.  The reference
+    GRectangle has the size of a brick in the default board, as BRICK_WIDTH is not
+    positive on the widest boards (and a GRectangle must have a positive size)."""
+    results = []
+    for model, make in (('brick', lambda x: Brick(x, 0, BRICK_COLORS[0])),
+                        ('rectangle', lambda x: GRectangle(x=x, y=0,
+                                                           width=REFERENCE_WIDTH,
+                                                           height=REFERENCE_HEIGHT,
+                                                           fillcolor=BRICK_COLORS[0]))):
+        positions = itertools.count(1)
+        results.append(footprint('memory', lambda: make(float(next(positions))),
+                                 model=model))
+    return results
+
+
+def run():
+    """Returns: the list of results of every benchmark in this module.
+    
+    Every result has the board size (the parameters 'columns' and 'rows')."""
+    results = updateBall()+frame()+collisionHelper()+collides()+environment()+memory()
+    for result in results:
+        result['params']['columns'] = BRICKS_IN_ROW
+        result['params']['rows'] = BRICK_ROWS
+    return results
+
+
+if __name__ == '__main__':
+    print json.dumps(run())
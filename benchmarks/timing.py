@@ -0,0 +1,214 @@
+# timing.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Timing module for the Breakout benchmarks
+
+This module contains the function measure, which times a single operation.  An
+operation is a function with no arguments.  It is called in a loop enough times to run
+for at least MIN_TIME seconds, and the loop is repeated REPEAT times.  The result is
+the fastest of the repeats, less the cost of the loop and the call itself (measured on
+an empty operation).
+
+Each result also reports the allocations of the operation.  The number of objects is
+the net number of garbage-collected objects (lists, dicts, instances, ...) that each
+call leaves behind; it is 0 for an operation that frees everything it makes.  The
+number of bytes is the net memory that each call leaves behind, and is only measured
+if the module tracemalloc is available (it is not in Python 2).
+
+The function footprint measures memory instead of time: the number of bytes taken by
+each object that a function makes.  With tracemalloc, this is the memory allocated for
+the objects.  Without it, it is an estimate from sys.getsizeof, which does not see the
+memory that an extension type (such as a Kivy instruction) keeps to itself."""
+import gc
+import sys
+import timeit
+import types
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+#: the shortest time (in seconds) for each repeat of a benchmark
+MIN_TIME = 0.1
+#: the number of times each benchmark is repeated
+REPEAT = 5
+
+
+def measure(name, op, **params):
+    """Returns: the result of timing the operation op, as a dictionary.
+    
+    The dictionary has the keys 'name', 'params', 'number' (the number of calls in
+    each repeat), 'ns_per_op', 'objects_per_op' and 'bytes_per_op' (None if it
+    could not be measured).
+    
+    Parameter name: the name of the benchmark
+    Precondition: name is a string
+    
+    Parameter op: the operation to time
+    Precondition: op is a function with no arguments
+    
+    Parameter params: the parameters of the benchmark, to store in the result
+    Precondition: every value in params can be converted to JSON"""
+    number = _calibrate(op)
+    best = min(_time(op, number) for i in range(REPEAT))
+    empty = min(_time(_empty, number) for i in range(REPEAT))
+    objects, size = _allocations(op, number)
+    return {'name': name, 'params': params, 'number': number,
+            'ns_per_op': max(best-empty, 0.0)*1e9/number,
+            'objects_per_op': objects, 'bytes_per_op': size}
+
+
+def footprint(name, make, number=1000, **params):
+    """Returns: the memory taken by each object that make returns, as a dictionary.
+    
+    The dictionary has the keys 'name', 'params', 'number' (the number of objects
+    made), 'bytes_per_object' and 'objects_per_object' (the number of
+    garbage-collected objects that each one takes, itself included).  The objects
+    are kept alive until all of them are measured.  Anything that the objects share
+    with an object made before (such as their class, or a color constant) is not
+    counted.
+    
+    Parameter name: the name of the benchmark
+    Precondition: name is a string
+    
+    Parameter make: the function that makes one object
+    Precondition: make is a function with no arguments that returns a new object
+    
+    Parameter number: the number of objects to make
+    Precondition: number is an int > 0
+    
+    Parameter params: the parameters of the benchmark, to store in the result
+    Precondition: every value in params can be converted to JSON"""
+    # the sample must stay alive, so that no new object can reuse one of its ids
+    sample = [make()]
+    shared = set()
+    _sizeof(sample, shared)
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        if tracemalloc is not None:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+        count = gc.get_count()[0]
+        made = [make() for i in xrange(number)]
+        objects = (gc.get_count()[0]-count-1)/float(number)
+        if tracemalloc is not None:
+            size = tracemalloc.get_traced_memory()[0]-before-sys.getsizeof(made)
+            tracemalloc.stop()
+        else:
+            size = _sizeof(made, shared)-sys.getsizeof(made)
+    finally:
+        if enabled:
+            gc.enable()
+    return {'name': name, 'params': params, 'number': number,
+            'bytes_per_object': size/float(number), 'objects_per_object': objects}
+
+
+# HELPER FUNCTIONS
+def _empty():
+    """Does nothing.  This is the operation that measures the cost of the loop."""
+    pass
+
+
+def _loop(op, number):
+    """Calls op number times.
+    
+    Parameter op: the operation to call
+    Precondition: op is a function with no arguments
+    
+    Parameter number: the number of calls
+    Precondition: number is an int > 0"""
+    for i in xrange(number):
+        op()
+
+
+def _time(op, number):
+    """Returns: the time in seconds to call op number times.
+    
+    The garbage collector is turned off while timing, as in the module timeit.
+    
+    Parameter op: the operation to time
+    Precondition: op is a function with no arguments
+    
+    Parameter number: the number of calls
+    Precondition: number is an int > 0"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = timeit.default_timer()
+        _loop(op, number)
+        return timeit.default_timer()-start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _calibrate(op):
+    """Returns: the number of calls of op that take at least MIN_TIME seconds.
+    
+    The number is always a power of 10.
+    
+    Parameter op: the operation to time
+    Precondition: op is a function with no arguments"""
+    number = 1
+    while _time(op, number) < MIN_TIME:
+        number *= 10
+    return number
+
+
+def _sizeof(roots, seen):
+    """Returns: the total size in bytes of the objects reachable from roots.
+    
+    The objects whose ids are in seen are not counted (or followed), and the ids of
+    the objects counted are added to seen.  Classes, modules and functions are never
+    counted, as they are shared by every object.
+    
+    Parameter roots: the objects to start from
+    Precondition: roots is a list
+    
+    Parameter seen: the ids of the objects not to count
+    Precondition: seen is a set of ints"""
+    total = 0
+    stack = [roots]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType,
+                                               types.FunctionType)):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
+def _allocations(op, number):
+    """Returns: the tuple (objects, bytes) of net allocations per call of op.
+    
+    The bytes are None if tracemalloc is not available.
+    
+    Parameter op: the operation to call
+    Precondition: op is a function with no arguments
+    
+    Parameter number: the number of calls
+    Precondition: number is an int > 0"""
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        if tracemalloc is not None:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+        count = gc.get_count()[0]
+        _loop(op, number)
+        objects = (gc.get_count()[0]-count)/float(number)
+        size = None
+        if tracemalloc is not None:
+            size = (tracemalloc.get_traced_memory()[0]-before)/float(number)
+            tracemalloc.stop()
+        return (objects, size)
+    finally:
+        if enabled:
+            gc.enable()
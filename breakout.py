@@ -11,6 +11,7 @@ post a question on Piazza."""
 from constants import *
 from game2d import *
 from play import *
+from replay import *
 
 
 # PRIMARY RULE: Breakout can only access attributes in play.py via getters/setters
@@ -95,7 +96,10 @@ class Breakout(GameApp):
                                     the sake of continuity.
         Attribute _alphaIncreasing  [boolean] that keeps track of whether
                                     the alpha value is currently increasing
-                                    or decreasing in the starting animation."""
+                                    or decreasing in the starting animation.
+        Attribute _physicsClock:    [float >= 0] real time (in seconds) that
+                                    has passed but has not been simulated
+                                    yet by a physics step."""
                 
     # DO NOT MAKE A NEW INITIALIZER!
     
@@ -120,6 +124,13 @@ class Breakout(GameApp):
                             linecolor = colormodel.BLACK)
         self._mssg2 = None
         
+        #The first game loads its sounds and shows these texts right away, so
+        #they are loaded while this message is shown.
+        SoundLibrary.shared().voices = SOUND_VOICES
+        if self.preloader is not None:
+            for text in PRELOAD_TEXTS:
+                self.preloader.add_text(*text)
+        
     def update(self,dt):
         """Animates a single frame in the game.
         
@@ -201,10 +212,10 @@ class Breakout(GameApp):
             self._countdown()
                 
         if self._state == STATE_ACTIVE:
-            self._active()
+            self._active(dt)
         
         if self._state == STATE_COMPLETE:
-            self._active() #keeps the paddle and the ball (if still there)
+            self._active(dt) #keeps the paddle and the ball (if still there)
             #moving around the screen for fun
         
         #See if any keys are pressed each call of update.    
@@ -287,7 +298,10 @@ class Breakout(GameApp):
         """Starts a new game by assigning a new Play object to
         self._game and switches the game state to countdown."""
         self._mssg = None
-        self._game = Play()
+        if REPLAY_DIR is None:
+            self._game = Play()
+        else:
+            self._game = RecordingPlay(openReplay())
         self._gameClock = 0
         self._lastReset = 0
         
@@ -339,17 +353,39 @@ class Breakout(GameApp):
         In doing so the secondary message is erased and the
         game has its ball served."""
         self._game.serveBall()
+        self._physicsClock = 0
         self._mssg2 = None
         self._state = STATE_ACTIVE
         
-    def _active(self):
+    def _active(self, dt):
         """Method that executes during the update method if the game
-        is active.  It updates the ball and paddle."""
+        is active.  It updates the ball and paddle.
+        
+        The ball is updated in fixed physics steps, PHYSICS_RATE of them
+        per second of real time, so that the speed of the game does not
+        depend on the frame rate.  There are at most MAX_SUBSTEPS steps
+        per frame; time beyond that is dropped.
+        
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float) >= 0"""
         self._game.updatePaddle(self.input)
-        if self._game.hasBall():
-            #updates the ball by the amount of time that has passed in the
-            #game for one call to update
-            self._game.updateBall(GAME_TIME)
+        if self.profiler is not None:
+            self.profiler.enter('physics')
+        step = 1.0/PHYSICS_RATE
+        self._physicsClock += dt
+        steps = 0
+        while (self._physicsClock >= step and steps < MAX_SUBSTEPS
+               and self._game.hasBall()):
+            #updates the ball by the amount of time that passes in the
+            #game for one physics step
+            self._game.updateBall(GAME_SPEED*step)
+            self._physicsClock -= step
+            steps += 1
+        
+        if self._physicsClock >= step or not self._game.hasBall():
+            self._physicsClock = 0
+        if self.profiler is not None:
+            self.profiler.leave('physics')
                 
     def _switchToPaused(self):
         """Method that executes at first when the state is paused.
@@ -390,8 +426,11 @@ class Breakout(GameApp):
     def _gameOver(self):
         """Called when the game is over.  It switches the state into
         STATE_COMPLETE and creates the proper message depending on
-        whether the user won or lost."""
+        whether the user won or lost.  If the game is being recorded, the
+        recording ends here."""
         self._state = STATE_COMPLETE
+        if REPLAY_DIR is not None:
+            self._game.stopRecording()
         if self._game.noBricks():
             self._mssg = GLabel(text = "Congratulations, you won!",
                             x = GAME_WIDTH/2, y = GAME_HEIGHT/2,
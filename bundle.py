@@ -0,0 +1,39 @@
+# bundle.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Asset bundle builder for Breakout
+
+This module packs the folders Fonts, Images and Sounds into a single bundle file (see
+the class GBundle in gcore.py for the format).  A game that uses the bundle maps that
+one file into memory at startup, instead of opening every asset file on its own.  To
+build the bundle, go to the folder with breakout.py and type
+
+    python bundle.py [--output assets.bundle]
+
+Then set ASSET_BUNDLE in constants.py to the name of the bundle.  The bundle must be
+built again whenever a file in one of the folders changes."""
+import argparse
+import os
+import time
+from gcore import *
+
+
+#: the file name of the bundle, in the folder of this module
+BUNDLE_FILE = 'assets.bundle'
+
+
+def main():
+    """Builds the bundle with the options given on the command line."""
+    parser = argparse.ArgumentParser(prog='python bundle.py')
+    parser.add_argument('--output', default=BUNDLE_FILE,
+                        help='the file name of the bundle')
+    args = parser.parse_args()
+    
+    start = time.time()
+    count = write_bundle(args.output)
+    print '%d files, %d bytes in %s (%.2f s)' % (count, os.path.getsize(args.output),
+                                                args.output, time.time()-start)
+
+
+if __name__ == '__main__':
+    main()
@@ -101,6 +101,9 @@ BRICK_COLORS = [colormodel.RED, colormodel.ORANGE,colormodel.YELLOW,
                 colormodel.GREEN, colormodel.CYAN]
 #: the amount the paddle moves each time
 PADDLE_SPEED = 5
+#: how far the paddle moves for each second an arrow key is held (PADDLE_SPEED
+#: for each update at 60 frames per second)
+PADDLE_RATE = PADDLE_SPEED*60
 #: direction when the paddle is not moving
 PADDLE_STILL = 0
 #: direction when the paddle is moving right
@@ -110,6 +113,13 @@ PADDLE_LEFT = 2
 
 #: dimensions of sound Icon
 SOUND_DIM = 25
+#: the number of voices of each sound effect (how many times it can play at once)
+SOUND_VOICES = 4
+#: the texts (text, font, size) that the first game shows right away, which are
+#: rendered while the start message is shown (see GPreloader in game2d.py)
+PRELOAD_TEXTS = [("Lives Remaining: 3", "ComicSans.ttf", 13),
+                 ("3", "ComicSans.ttf", 24), ("2", "ComicSans.ttf", 24),
+                 ("1", "ComicSans.ttf", 24)]
 
 #: number of paddle hits between 'kicks'
 KICK_INTERVAL = 7
@@ -120,4 +130,37 @@ KICK_FACTOR = 1.5
 A_INC = .008
 
 #: how much time passes in the game for one call to update.
-GAME_TIME = .8
\ No newline at end of file
+GAME_TIME = .8
+#: how much time passes in the game for one second of real time (GAME_TIME
+#: for each update at 60 frames per second)
+GAME_SPEED = GAME_TIME*60
+#: the number of physics steps (calls to updateBall) per second of real time,
+#: independent of the frame rate
+PHYSICS_RATE = 240
+#: the most physics steps in a single frame; if a frame is slower than this,
+#: the game slows down rather than falling further and further behind
+MAX_SUBSTEPS = 16
+
+#: whether updateBall uses continuous (swept) collision detection, which finds
+#: the exact time of every impact within a step, instead of only testing the
+#: position of the ball at the end of the step
+SWEPT_COLLISIONS = True
+#: the most bounces the ball can make in a single call to updateBall
+MAX_BOUNCES = 8
+
+#: the folder in which Breakout saves a replay of every game (see replay.py), or
+#: None to not record games
+REPLAY_DIR = None
+
+#: whether the game records the time of each frame (see GProfiler in game2d.py);
+#: the key F3 then shows the timings on screen
+PROFILE = False
+
+#: how carefully game2d checks the attributes of its objects: 'strict' checks
+#: every value, 'fast' only checks types and 'off' checks nothing (see
+#: set_validation in game2d.py)
+VALIDATION = 'strict'
+
+#: the asset bundle that packs Fonts, Images and Sounds (made by bundle.py, such
+#: as 'assets.bundle' in the folder of the game), or None to load the loose files
+ASSET_BUNDLE = None
\ No newline at end of file
@@ -0,0 +1,201 @@
+# environment.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Reinforcement learning environment module for Breakout
+
+This module contains environments for training agents that control the paddle.  They
+follow the interface of the environments of OpenAI Gym, without needing Gym itself:
+
+    obs = env.reset()
+    obs, reward, done, info = env.step(action)
+
+An action is the direction to move the paddle for one frame: PADDLE_STILL, PADDLE_RIGHT
+or PADDLE_LEFT (0, 1 and 2, so there are ACTION_COUNT actions).  Each step is one frame
+of the game at 60 frames per second: the paddle moves once and the ball takes
+STEPS_PER_FRAME physics steps, as in the real game.  The ball is served automatically,
+both at the start and after each lost ball.
+
+An observation is a float32 array of OBSERVATION_SIZE numbers: the position and
+velocity of the ball (x, y, vx, vy, all 0 if there is no ball in play), the x coordinate
+of the paddle and then the board, 1 for each brick still standing and 0 for each brick
+destroyed (in row-major order).  The reward of a step is the number of bricks broken in
+that step.  A game is done when it has no tries or no bricks left.
+
+BreakoutEnv plays a single HeadlessPlay.  VectorBreakoutEnv plays many games at once
+with a BatchPlay, and is the one to use for training: it takes the same actions and
+returns the same observations, with one row per game.  Both play by the rules of the
+real game, with the collision test chosen by SWEPT_COLLISIONS, so an agent trained on a
+VectorBreakoutEnv is evaluated (see the module runner) on the same physics."""
+import random
+import numpy as np
+from constants import *
+from headless import *
+from batch import *
+
+
+#: the number of actions (the paddle directions)
+ACTION_COUNT = 3
+#: the number of values in an observation
+OBSERVATION_SIZE = 5+BRICK_ROWS*BRICKS_IN_ROW
+#: the number of calls to updateBall in each step (one frame at 60 frames per second)
+STEPS_PER_FRAME = PHYSICS_RATE/60
+
+
+class BreakoutEnv(object):
+    """An instance is an environment that plays a single headless game.
+    
+    Every reset starts a new HeadlessPlay, with a seed taken from the random generator
+    of this environment (unless a seed is given to reset).
+    
+    INSTANCE ATTRIBUTES:
+        _game   [HeadlessPlay, or None before the first reset]: the game being played
+        _input  [HeadlessInput]: the keys that updatePaddle reads
+        _random [random.Random]: the random generator for the seed of each game"""
+    
+    # GETTERS
+    def getGame(self):
+        """Returns: the game being played (None before the first reset)."""
+        return self._game
+    
+    # INITIALIZER
+    def __init__(self, seed=None):
+        """Initializer for class BreakoutEnv.  Call reset to start the first game.
+        
+        Parameter seed: the seed for the games of this environment (None for a
+        random seed)
+        Precondition: seed is None or an int >= 0"""
+        self._game = None
+        self._input = HeadlessInput()
+        self._random = random.Random(seed)
+    
+    # METHODS
+    def reset(self, seed=None):
+        """Returns: the first observation of a new game, after the first serve.
+        
+        Parameter seed: the seed for the new game (None to take one from the random
+        generator of this environment)
+        Precondition: seed is None or an int >= 0"""
+        if seed is None:
+            seed = self._random.randrange(2**32)
+        self._game = HeadlessPlay(seed)
+        self._game.serveBall()
+        return self._observe()
+    
+    def step(self, action):
+        """Returns: the tuple (observation, reward, done, info) after playing one
+        frame with the given action.
+        
+        The info is a dictionary with the number of tries ('tries') and bricks
+        ('bricks') left.  Once the game is done, reset must be called before the
+        next step.
+        
+        Parameter action: the direction to move the paddle
+        Precondition: action is PADDLE_STILL, PADDLE_RIGHT or PADDLE_LEFT"""
+        game = self._game
+        input = self._input
+        input.release_all()
+        if action == PADDLE_RIGHT:
+            input.press('right')
+        elif action == PADDLE_LEFT:
+            input.press('left')
+        game.updatePaddle(input)
+        
+        before = game.getBricksLeft()
+        step = GAME_SPEED/PHYSICS_RATE
+        for i in range(STEPS_PER_FRAME):
+            if not game.hasBall():
+                break
+            game.updateBall(step)
+        bricks = game.getBricksLeft()
+        
+        done = game.getTries() == 0 or bricks == 0
+        if not done and not game.hasBall():
+            game.serveBall()
+        info = {'tries': game.getTries(), 'bricks': bricks}
+        return (self._observe(), float(before-bricks), done, info)
+    
+    # HELPER METHODS
+    def _observe(self):
+        """Returns: the observation of the game being played."""
+        obs = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        ball = self._game.getBallState()
+        if ball is not None:
+            obs[:4] = ball
+        obs[4] = self._game.getPaddleX()
+        obs[5:] = self._game.getBoard().ravel()
+        return obs
+
+
+class VectorBreakoutEnv(object):
+    """An instance is an environment that plays n games at once.
+    
+    The methods take and return one row (or entry) per game.  A game that is done is
+    started over at once, so the observation that step returns for that game is the
+    first observation of its new game (as in the vector environments of Gym).
+    
+    INSTANCE ATTRIBUTES:
+        _play [BatchPlay]: the games being played"""
+    
+    # GETTERS
+    def getSize(self):
+        """Returns: the number of games in this environment."""
+        return self._play.getSize()
+    
+    # INITIALIZER
+    def __init__(self, n, seed=None):
+        """Initializer for class VectorBreakoutEnv.  Call reset to start the games.
+        
+        Parameter n: the number of games to play at once
+        Precondition: n is an int > 0
+        
+        Parameter seed: the seed for the serves of the games (None for a random seed)
+        Precondition: seed is None or an int >= 0"""
+        self._play = BatchPlay(n, seed)
+    
+    # METHODS
+    def reset(self):
+        """Returns: the first observations of n new games, as an array of shape
+        (n, OBSERVATION_SIZE), after the first serve."""
+        self._play.resetGames()
+        self._play.serveBalls()
+        return self._observe()
+    
+    def step(self, actions):
+        """Returns: the tuple (observations, rewards, dones, info) after playing one
+        frame of every game with the given actions.
+        
+        The observations are an array of shape (n, OBSERVATION_SIZE), the rewards a
+        float32 array of size n and the dones a bool array of size n.  The info is a
+        dictionary with the number of tries ('tries') and bricks ('bricks') left in
+        each game before any game was started over.
+        
+        Parameter actions: the direction to move each paddle
+        Precondition: actions is an int array of size n with values PADDLE_STILL,
+        PADDLE_RIGHT or PADDLE_LEFT"""
+        play = self._play
+        play.updatePaddles(actions)
+        
+        before = play.getBricksLeft()
+        step = GAME_SPEED/PHYSICS_RATE
+        for i in range(STEPS_PER_FRAME):
+            play.updateBalls(step)
+        bricks = play.getBricksLeft()
+        tries = play.getTries()
+        
+        dones = (tries == 0) | (bricks == 0)
+        if dones.any():
+            play.resetGames(dones)
+        play.serveBalls()
+        rewards = (before-bricks).astype(np.float32)
+        return (self._observe(), rewards, dones, {'tries': tries, 'bricks': bricks})
+    
+    # HELPER METHODS
+    def _observe(self):
+        """Returns: the observations of the games being played."""
+        play = self._play
+        obs = np.empty((play.getSize(), OBSERVATION_SIZE), dtype=np.float32)
+        obs[:, :4] = play.getBallState()
+        obs[:, :4] *= play.hasBall()[:, np.newaxis]
+        obs[:, 4] = play.getPaddleX()
+        obs[:, 5:] = play.getBoards().reshape(play.getSize(), -1)
+        return obs
@@ -5,122 +5,77 @@
 
 This module provides all of the classes that are to use (or subclass) to create your game. 
 DO NOT MODIFY THE CODE IN THIS FILE.  See the online documentation in Assignment 7 for 
-more guidance.  It includes information not displayed in this module."""
+more guidance.  It includes information not displayed in this module.
 
-# Basic Kivy Modules
-import kivy
-import kivy.app
-
-# Lower-level kivy modules to support animation
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.core.audio import SoundLoader
-from kivy.config import Config
-from kivy.clock  import Clock
-from kivy.metrics import dp
-
-# Widgets necessary for some technical workarounds
-from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.label import Label
-from kivy.uix.image import Image
+Kivy is not imported with this module.  It is imported (by `_load_kivy`) the first time 
+an object that draws, plays a sound, shows a view or runs the application is made.  So 
+code that only uses the geometry (or classes that are never drawn) does not wait for 
+Kivy to start.  The parts of this module that never need Kivy are in the module gcore."""
 
 # Additional miscellaneous modules
-import os, sys, os.path
+import os, sys, os.path, math
+import collections
+import io
+import Queue
+from multiprocessing.pool import ThreadPool
+from timeit import default_timer as _timer
 import numpy as np
 import colormodel
 
-# User-defined resources
-FONT_PATH  = str(os.path.join(os.path.dirname(__file__), 'Fonts'))
-SOUND_PATH = str(os.path.join(os.path.dirname(__file__), 'Sounds'))
-IMAGE_PATH = str(os.path.join(os.path.dirname(__file__), 'Images'))
+# The Kivy-free core: resource paths, argument checks and geometry
+import gcore
+from gcore import *
+from gcore import (_same_side, _in_triangle, _NUMS, _is_num_tuple, _is_point_tuple,
+                   _is_color, _is_image_file, _is_font_file, _is_sound_file, _gl_color,
+                   _listing, _resource_file, _checking)
 
-import kivy.resources
-kivy.resources.resource_add_path(FONT_PATH)
-kivy.resources.resource_add_path(SOUND_PATH)
-kivy.resources.resource_add_path(IMAGE_PATH)
+#: the module kivy, or None until `_load_kivy` imports it
+kivy = None
 
 
-################# TYPING HELPER FUNCTIONS #################
+################# KIVY LOADING #################
 pass
-# #mark TYPING HELPER FUNCTIONS
-
-def  _same_side(p1, p2, a, b):
-    """Returns: True if p1, p2 are on the same side of segment ba.
-    
-    Parameter p1: A point
-    Precondition: p1 is a 2-element sequence of numbers (int or float)
-    
-    Parameter p2: A point
-    Precondition: p2 is a 2-element sequence of numbers (int or float)
-    
-    Parameter a: One end of a line segment
-    Precondition: a is a 2-element sequence of numbers (int or float)
-    
-    Parameter b: Another end of a line segment
-    Precondition: b is a 2-element sequence of numbers (int or float)
-    """
-    ba = np.append(np.subtract(b,a),[0])
-    cp1 = np.cross(ba,np.subtract(p1,a))
-    cp2 = np.cross(ba,np.subtract(p2,a))
-    return np.dot(cp1,cp2) >= 0
-
-
-def _in_triangle(p, t):
-    """Returns: True if p is in triangle t
-    
-    Parameter p: A point
-    Precondition: p is a 2-element sequence of numbers (int or float)
-
-    Parameter t: A triangle (defined by 3 vertices)
-    Precondition: t is a 6-element sequence of numbers (int or float)
-    """
-    return (_same_side(p, t[0:2], t[2:4], t[4:6]) and
-            _same_side(p, t[2:4], t[0:2], t[4:6]) and
-            _same_side(p, t[4:6], t[0:2], t[2:4]))
-
+# #mark KIVY LOADING
+
+def _load_kivy():
+    """Imports Kivy, if it is not imported yet.
+    
+    The Kivy names that the classes in this module use (such as `Rectangle` or `Clock`)
+    are globals of this module, which are only defined once this function is called.  
+    Every class that needs Kivy calls this function in its constructor, before it makes
+    any Kivy object.  Only the first call does any work."""
+    global kivy, Color, Ellipse, Line, Mesh, Rectangle, PushMatrix, PopMatrix
+    global Rotate, Scale, Translate, InstructionGroup, SoundLoader, ImageLoader
+    global CoreLabel, DEFAULT_FONT, Config, Clock, dp, sp, FloatLayout, Image, CoreImage
+    if kivy is not None:
+        return
+    
+    # Basic Kivy Modules
+    import kivy.app
+    
+    # Lower-level kivy modules to support animation
+    from kivy.graphics import Color, Ellipse, Line, Mesh, Rectangle, PushMatrix, PopMatrix
+    from kivy.graphics import Rotate, Scale, Translate, InstructionGroup
+    from kivy.core.audio import SoundLoader
+    from kivy.core.image import ImageLoader, Image as CoreImage
+    from kivy.core.text import Label as CoreLabel, DEFAULT_FONT
+    from kivy.config import Config
+    from kivy.clock  import Clock
+    from kivy.metrics import dp, sp
+    
+    # Widgets necessary for some technical workarounds
+    from kivy.uix.floatlayout import FloatLayout
+    from kivy.uix.image import Image
+    
+    import kivy.resources
+    kivy.resources.resource_add_path(FONT_PATH)
+    kivy.resources.resource_add_path(SOUND_PATH)
+    kivy.resources.resource_add_path(IMAGE_PATH)
 
-def _is_num(x):
-    """Returns: True if x is an int or float; False otherwise.
-    
-    Parameter x: The value to test
-    Precondition: NONE"""
-    return type(x) in [int,float]
-
-
-def _is_num_tuple(t,size):
-    """Returns: True if t is a sequence of numbers; False otherwise.
-    
-    If the sequence is not of the given size, it also returns False.
-    
-    Parameter t: The value to test
-    Precondition: NONE
-    
-    Parameter size: The size of the sequence
-    Precondition: size is an int >= 0
-    """
-    try:
-        return len(t) == size and reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
-
-    except:
-        return False
 
-
-def _is_point_tuple(t,msize):
-    """Returns: True if t is a point sequence (i.e. even sequence of numbers)
-    
-    The point tuple must be size greater than msize, or the function returns False.
-    
-    Parameter t: The value to test
-    Precondition: NONE
-    
-    Parameter msize: The minimum size of the sequence
-    Precondition: msize is an int >= 0
-    """
-    try:
-        return len(t) % 2 == 0 and len(t) > msize and \
-            reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
-    except:
-        return False
+################# TYPING HELPER FUNCTIONS #################
+pass
+# #mark TYPING HELPER FUNCTIONS
 
 
 def _is_gobject_list(g):
@@ -135,390 +90,45 @@ def _is_gobject_list(g):
         return False
 
 
-def _is_color(c):
-    """Returns: True if c represents a color
+def _fast_is_gobject_list(g):
+    """Returns: True if g is a list or tuple
     
-    As with Turtles, colors may be colormodel objects or strings.  They may also
-    be sequences of 3 or 4 elements.  In the case of the latter, the elements
-    of the sequence must all be in the range 0..1.
+    This is the check of `_is_gobject_list` in the mode 'fast'.  It does not check
+    the elements of the sequence.
     
-    Parameter c: The value to test
+    Parameter g: The value to test
     Precondition: NONE
     """
-    if type(c) in [colormodel.RGB, colormodel.HSV]:
-        return True
-    
-    if type(c) in [tuple, list] and 3 <= len(c) <= 4:
-        return reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float] and 0 <= z <= 1, c))
-    
-    return type(c) == str and c in colormodel._TK_COLOR_MAP
-
-
-def _is_image_file(name):
-    """Returns: True if name is the name of an image file
-    
-    Parameter name: A file name
-    Precondition: NONE"""
-    if type(name) != str:
-        return False
-    
-    return os.path.exists(IMAGE_PATH+'/'+name)
-
-
-def _is_font_file(name):
-    """Returns: True if name is the name of an font file
-    
-    Parameter name: A file name
-    Precondition: NONE"""
-    if type(name) != str:
-        return False
-    
-    return os.path.exists(FONT_PATH+'/'+name)
-
-
-def _is_sound_file(name):
-    """Returns: True if name is the name of an font file.
-    
-    Parameter name: A file name
-    Precondition: NONE"""
-    if type(name) != str:
-        return False
-    
-    return os.path.exists(SOUND_PATH+'/'+name)
-
+    return type(g) in (list, tuple)
 
-################# GEOMETRY PRIMITIVES #################
-pass
-# #mark GEOMETRY PRIMITIVES
 
-class GPoint(object):
-    """Instances are points in 2D space.
-    
-    This class is used primarily for recording and handling mouse locations.  However,
-    it may also be used for geometry calculations in conjunction with `GMatrix`."""
-    
-    # PROPERTIES 
-    @property
-    def x(self):
-        """The x coordinate of the point.
-        
-        **Invariant**: Must be an int or float."""
-        return self._x
-    
-    @x.setter
-    def x(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        self._x = float(value)
-    
-    @property
-    def y(self):
-        """The y coordinate of the point.
-        
-        **Invariant**: Must be an int or float."""
-        return self._y
-    
-    @y.setter
-    def y(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        self._y = float(value)
-    
-    # METHODS
-    def __init__(self, x=0, y=0):
-        """**Constructor**: creates a new GPoint value (x,y).
-        
-            :param x: initial x value
-            **Precondition**: value is an int or float.
-        
-            :param y: initial y value
-            **Precondition**: value is an int or float.
-        
-        All values are 0.0 by default.        
-        """
-        self.x = x
-        self.y = y
-    
-    def __eq__(self, other):
-        """**Returns**: True if self and other are equivalent GPoint. 
-        
-        This method uses np to test whether the coordinates are 
-        "close enough".  It does not require exact equality for floats.
-        
-            :param other: value to compare against
-        """        
-        return (type(other) == GPoint and np.allclose(self.list(),other.list()))
-    
-    def __ne__(self, other):
-        """**Returns**: True if self and other are not equivalent GPoint. 
-        
-            :param other: value to compare against
-        """
-        return not self == other
-    
-    def __str__(self):
-        """**Returns**: Readable String representation of this GPoint. """
-        return "("+str(self.x)+","+str(self.y)+")"
-    
-    def __repr__(self):
-        """**Returns**: Unambiguous String representation of this GPoint. """
-        return "%s%s" % (self.__class__,self.__str__())
-    
-    def list(self):
-        """**Returns**: A python list with the contents of this GPoint."""
-        return [self.x,self.y]
-    
-    def __add__(self, other):
-        """**Returns**: the sum of self and other.
-        
-        The value returned has the same type as self (so it is either
-        a GPoint or is a subclass of GPoint).  The contents of this object
-        are not altered.
-        
-            :param other: tuple value to add
-            **Precondition**: value has the same type as self.
-        """
-        assert (type(other) == type(self)), "value %(value)s is not a of type %(type)s" \
-            % {'value': `other`, 'type':`type(self)`}
-        result = copy.copy(self)
-        result.x += other.x
-        result.y += other.y
-        return result
-    
-    def __sub__(self, other):
-        """**Returns**: the vector from tail to self.
-        
-        The value returned is a GPoint representing a vector with this point at its head.
-        
-            :param other: the tail value for the new Vector
-            **Precondition**: value is a Point object.
-        """
-        assert (type(other) == type(self)), "value %(value)s is not a of type %(type)s" \
-            % {'value': `other`, 'type':`type(self)`}
-        result = copy.copy(self)
-        result.x -= other.x
-        result.y -= other.y
-        return result
-    
-    def __mul__(self, scalar):
-        """**Returns**: the scalar multiple of self and other.
-        
-        The value returned is a new GPoint.  The contents of this GPoint
-        are not altered.
-        
-            :param scalar: scalar to multiply by
-            **Precondition**: value is an int or float.
-        """
-        assert _is_num(scalar), "value %s is not a number" % `scalar`
-        result = copy.copy(self)
-        result.x *= scalar
-        result.y *= scalar
-        result.z *= scalar
-        return result
-    
-    def __rmul__(self, scalar):
-        """**Returns**: the scalar multiple of self and other.
-        
-        The value returned is a new GPoint.  The contents of this GPoint
-        are not altered.
-        
-            :param scalar: scalar to multiply by
-            **Precondition**: value is an int or float.
-        """
-        return self.__mul__(scalar)
-    
-    def interpolate(self, other, alpha):
-        """**Returns**: the interpolation of self and other via alpha.
-        
-        The value returned has the same type as self (so it is either
-        a GPoint or is a subclass of GPoint).  The contents of this object
-        are not altered. The resulting value is 
-        
-            alpha*self+(1-alpha)*other 
-        
-        according to GPoint addition and scalar multiplication.
-        
-            :param other: tuple value to interpolate with
-            **Precondition**: value has the same type as self.
-        
-            :param alpha: scalar to interpolate by
-            **Precondition**: value is an int or float.
-        """
-        assert (type(other) == type(self)), "value %(value)s is not a of type %(type)s" \
-            % {'value': `other`, 'type':`type(self)`}
-        assert (type(alpha) in [int,float]), "value %s is not a number" % `alpha`
-        return alpha*self+(1-alpha)*other
-    
-    def distanceTo(self, other):
-        """**Returns**: the Euclidean distance from this point to other
-        
-            :param other: value to compare against
-            **Precondition**: value is a Tuple3D object.
-        """
-        return np.sqrt((self.x-other.x)*(self.x-other.x)+
-                          (self.y-other.y)*(self.y-other.y))
+#: the check of _is_gobject_list in each validation mode (never called in the mode
+#: 'off', see `set_validation`)
+_GOBJECT_CHECKS = {'strict': _is_gobject_list, 'fast': _fast_is_gobject_list, 
+                   'off': _fast_is_gobject_list}
 
 
-class GMatrix(object):
-    """Instances are homongenous matrices for graphics transforms.
-    
-    This class is backed by np for fast computation.  There are no publicly accessible 
-    attributes, as it is not safe to access the internals."""
-    
-    def __init__(self):
-        """**Constructor**: creates a new 4x4 identify matrix"""
-        self._data = np.identity(4, dtype=np.float32)
-    
-    def __str__(self):
-        """**Returns**: A string representation of this matrix"""
-        return str(self._data)
-    
-    def __repr__(self):
-        """**Returns**: An unambiguous string representation of this matrix"""
-        return str(self.__class__)+str(self)
+def set_validation(mode):
+    """Sets how carefully the attributes of the classes in this module are checked.
     
-    def __mul__(self,other):
-        """**Returns**: a new Matrix that is the premultiplication of this and other.
-        
-        This operation pre-multiplies the matrix on the right.  As a result, this
-        allows us to read graphics operations left to right (which is more natural)
-        
-            :param other: the matrix to pre-multiply
-            **Precondition**: a Matrix object
-        """
-        m = GMatrix()
-        np.dot(other._data,self._data,m._data)
-        return m
-    
-    def __imul__(self,other):
-        """Premultiplies this matrix by other in place
-        
-        This operation pre-multiplies the matrix on the right.  As a result, this
-        allows us to read graphics operations left to right (which is more natural)
-        
-            :param other: the matrix to pre-multiply
-            **Precondition**: a Matrix object
-        """
-        tmp = np.dot(other._data,self._data)
-        np.copyto(self._data,tmp)
-    
-    def copy(self):
-        """**Returns**: a copy of this Matrix"""
-        m = GMatrix()
-        np.copyto(m._data,self._data)
-        return m
-    
-    def inverse(self):
-        """**Returns**: the inverse of this matrix"""
-        m = GMatrix()
-        np.copyto(m._data,np.linalg.inv(self._data))
-        return m
-    
-    def invert(self):
-        """Inverts this matrix in place"""
-        np.copyto(self._data,np.linalg.inv(self._data))
-        return self
-    
-    def transpose(self):
-        """**Returns**: the transpose of this matrix"""
-        m = GMatrix()
-        np.copyto(m._data,np.transpose(self._data))
-        return m
-    
-    def translate(self,x=0,y=0,z=0):
-        """Translates this matrix (in-place) by the given amount
-        
-            :param x: x-coordinate of translation (default 0)
-            **Precondition**: an int or float
-            
-            :param y: y-coordinate of translation (default 0)
-            **Precondition**: an int or float
-            
-            :param z: z-coordinate of translation (default 0)
-            **Precondition**: an int or float
-        """
-        r = np.identity(4, dtype=np.float32)
-        r[0,3] = x
-        r[1,3] = y
-        r[2,3] = z
-        tmp = np.dot(self._data,r)
-        np.copyto(self._data,tmp)
-    
-    def rotate(self,ang=0,x=0,y=0,z=0):
-        """Rotates this matrix (in place) about the given axis
-        
-        The rotation angle is given in degrees, not radians.  Rotation is 
-        counterclockwise around the angle of rotation.
-        
-            :param angle: angle of rotation in degrees (default 0)
-            **Precondition**: an int or float
-            
-            :param x: x-coordinate of rotation axis (default 0)
-            **Precondition**: an int or float
-            
-            :param y: y-coordinate of rotation axis (default 0)
-            **Precondition**: an int or float
-            
-            :param z: z-coordinate of rotation axis (default 0)
-            **Precondition**: an int or float
-        """
-        # Formula taken from https://en.wikipedia.org/wiki/Rotation_matrix
-        c = np.cos(np.radians(ang))
-        s = np.sin(np.radians(ang))
-        f = 1-c
-        r = np.identity(4, dtype=np.float32)
-        r[0] = [x*x*f+c,   x*y*f-z*s, x*z*f+y*s, 0]
-        r[1] = [y*x*f+z*s, y*y*f+c,   y*z*f-x*s, 0]
-        r[2] = [z*x*f-y*s, z*y*f+x*s, z*z*f+c,   0]
-        tmp = np.dot(self._data,r)
-        np.copyto(self._data,tmp)
-    
-    def scale(self,x=1,y=1,z=1):
-        """Scales this matrix (in-place) by the given amount
-        
-            :param x: x-coordinate of the scale (default 1)
-            **Precondition**: an int or float
-            
-            :param y: y-coordinate of the scale (default 1)
-            **Precondition**: an int or float
-            
-            :param z: z-coordinate of the scale (default 1)
-            **Precondition**: an int or float
-        """
-        s = np.identity(4, dtype=np.float32)
-        s[0,0] = x
-        s[1,1] = y
-        s[2,2] = z
-        tmp = np.dot(self._data,s)
-        np.copyto(self._data,tmp)
-    
-    def _transform(self,x=0,y=0,z=0):
-        """**Returns**: The given point transformed by this matrix
-        
-        The value returned is a tuple.
-        
-            :param x: x-coordinate to transform (default 0)
-            **Precondition**: an int or float
-            
-            :param y: y-coordinate to transform (default 0)
-            **Precondition**: an int or float
-            
-            :param z: z-coordinate to transform (default 0)
-            **Precondition**: an int or float
-        """
-        b = np.array([x,y,z,1], dtype=np.float32)
-        tmp = np.dot(self._data,b)
-        return map(float,tuple(tmp[:-1]))
+    The modes are 'strict' (every value is checked fully; the default), 'fast' 
+    (only the type of each value is checked) and 'off' (nothing is checked, as every
+    assert on a value is behind a test of the flag _checking).  See the function 
+    `set_validation` in gcore for more information.
     
-    def transform(self,point):
-        """**Returns**: The given point transformed by this matrix
-        
-        The value returned is a GPoint.
-        
-            :param point: the point to transform
-            **Precondition**: a GPoint
-        """
-        b = np.array([point.x,point.y,0,1], dtype=np.float32)
-        tmp = np.dot(self._data,b)
-        return GPoint(float(tmp[0]),float(tmp[1]))
+    Parameter mode: The new validation mode
+    Precondition: mode is one of VALIDATION_MODES"""
+    global _checking, _is_num_tuple, _is_point_tuple, _is_color
+    global _is_image_file, _is_font_file, _is_sound_file, _is_gobject_list
+    gcore.set_validation(mode)
+    _checking = gcore._checking
+    _is_num_tuple = gcore._is_num_tuple
+    _is_point_tuple = gcore._is_point_tuple
+    _is_color = gcore._is_color
+    _is_image_file = gcore._is_image_file
+    _is_font_file = gcore._is_font_file
+    _is_sound_file = gcore._is_sound_file
+    _is_gobject_list = _GOBJECT_CHECKS[mode]
 
 
 ################# RECTANGULAR PRIMITIVES #################
@@ -542,9 +152,11 @@ class GObject(object):
     
     @x.setter
     def x(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         self._trans.x = float(value)
         self._mtrue = False
+        self._atrue = False
     
     @property
     def y(self):
@@ -555,9 +167,11 @@ class GObject(object):
     
     @y.setter
     def y(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         self._trans.y = float(value)
         self._mtrue = False
+        self._atrue = False
     
     @property
     def width(self):
@@ -570,11 +184,12 @@ class GObject(object):
     
     @width.setter
     def width(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        assert value > 0, 'value %s is not positive' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+            assert value > 0, 'value %s is not positive' % `value`
         self._width = float(value)
         if self._defined:
-            self._reset()
+            self._resize()
     
     @property
     def height(self):
@@ -587,11 +202,12 @@ class GObject(object):
     
     @height.setter
     def height(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        assert value > 0, 'value %s is not positive' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+            assert value > 0, 'value %s is not positive' % `value`
         self._height = float(value)
         if self._defined:
-            self._reset()
+            self._resize()
     
     @property
     def scale(self):
@@ -611,15 +227,17 @@ class GObject(object):
     @scale.setter
     def scale(self,value):
         # Do some checking here
-        assert _is_num(value) or _is_num_tuple(value,2), \
-                'value %s is not a valid scaling factor' % `value`
-        if _is_num(value):
+        if _checking:
+            assert type(value) in _NUMS or _is_num_tuple(value,2), \
+                    'value %s is not a valid scaling factor' % `value`
+        if type(value) in _NUMS:
             self._scale.x = float(value)
             self._scale.y = float(value)
         else:
             self._scale.x = float(value[0])
             self._scale.y = float(value[1])
         self._mtrue = False
+        self._atrue = False
     
     @property
     def angle(self):
@@ -632,11 +250,13 @@ class GObject(object):
     
     @angle.setter
     def angle(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = np.allclose([self._rotate.angle],[value])
         self._rotate.angle = float(value)
         if not diff:
             self._mtrue = False
+            self._atrue = False
     
     @property
     def fillcolor(self):
@@ -657,20 +277,15 @@ class GObject(object):
     
     @fillcolor.setter
     def fillcolor(self,value):
-        assert _is_color(value), 'value %s is not a valid color' % `value`
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [colormodel.RGB, colormodel.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = colormodel.RGB.CreateWebColor(c).glColor()
-            else:
-                value = colormodel.RGB.CreateName(c).glColor()
-        
-        self._fillcolor = Color(value[0],value[1],value[2],value[3])
+        if _checking:
+            assert _is_color(value), 'value %s is not a valid color' % `value`
+        value = _gl_color(value)
         if self._defined:
-            self._reset()
+            # The Color instruction is already in the drawing cache
+            self._fillcolor.rgba = value
+            self._recolor()
+        else:
+            self._fillcolor = Color(value[0],value[1],value[2],value[3])
     
     @property
     def linecolor(self):
@@ -688,20 +303,15 @@ class GObject(object):
     
     @linecolor.setter
     def linecolor(self,value):
-        assert _is_color(value), 'value %s is not a valid color' % `value`
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [colormodel.RGB, colormodel.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = colormodel.RGB.CreateWebColor(c).glColor()
-            else:
-                value = colormodel.RGB.CreateName(c).glColor()
-        
-        self._linecolor = Color(value[0],value[1],value[2],value[3])
+        if _checking:
+            assert _is_color(value), 'value %s is not a valid color' % `value`
+        value = _gl_color(value)
         if self._defined:
-            self._reset()
+            # The Color instruction is already in the drawing cache
+            self._linecolor.rgba = value
+            self._recolor()
+        else:
+            self._linecolor = Color(value[0],value[1],value[2],value[3])
     
     @property
     def name(self):
@@ -716,7 +326,8 @@ class GObject(object):
     
     @name.setter
     def name(self,value):
-        assert value is None or type(value) == str, 'value %s is not a valid name' % `value`
+        if _checking:
+            assert value is None or type(value) == str, 'value %s is not a valid name' % `value`
         self._name = value
     
     # DERIVED PROPERTIES
@@ -745,7 +356,8 @@ class GObject(object):
     
     @left.setter
     def left(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.left
         self.x += diff
     
@@ -774,7 +386,8 @@ class GObject(object):
     
     @right.setter
     def right(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.right
         self.x += diff
     
@@ -803,7 +416,8 @@ class GObject(object):
     
     @top.setter
     def top(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.top
         self.y += diff
     
@@ -834,7 +448,8 @@ class GObject(object):
     
     @bottom.setter
     def bottom(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.bottom
         self.y += diff
     
@@ -900,6 +515,8 @@ class GObject(object):
         Any attribute of this class may be used as a keyword. The argument must satisfy 
         the invariants of that attribute. See the list of attributes of this class for 
         more information."""
+        _load_kivy()
+        
         # Set the properties.
         self._defined = False
         
@@ -907,6 +524,9 @@ class GObject(object):
         self._trans  = Translate(0,0,0)
         self._rotate = Rotate(angle=0,axis=(0,0,1))
         self._scale  = Scale(1,1,1)
+        self._matrix = None
+        self._mtrue  = False
+        self._atrue  = False
         
         # Now update these with the keywords; size first
         if 'width'  in keywords:
@@ -973,10 +593,12 @@ class GObject(object):
         **Warning**: Accessing this value on a rotated object may slow down your
         framerate significantly.
         """
+        if GProfiler.current is not None:
+            GProfiler.current.count('contains')
         if self._rotate.angle == 0.0:
             return abs(x-self.x) < self.width/2.0 and abs(y-self.y) < self.height/2.0
         
-        p = self.matrix.inverse()._transform(x,y)
+        p = self._local(x,y)
         return abs(p[0]) < self.width/2.0 and abs(p[1]) < self.height/2.0
     
     def transform(self,point):
@@ -992,11 +614,12 @@ class GObject(object):
         
         The value returned is a GPoint."""
         if isinstance(point,GPoint):
-            return self.inverse.transform(point)
+            p = self._local(point.x,point.y)
         else:
-            assert len(point) == 2 and _is_num_tuple(point,2)
-            p = self.inverse._transform(point[0],point[2])
-            return GPoint(p[0],p[1])
+            if _checking:
+                assert len(point) == 2 and _is_num_tuple(point,2)
+            p = self._local(point[0],point[1])
+        return GPoint(p[0],p[1])
     
     
     def draw(self, view):
@@ -1006,16 +629,62 @@ class GObject(object):
             **Precondition**: an *instance of* `GView`
         
         Ideally, the view should be the one provided by `GameApp`."""
-        view.draw(self._cache)
+        view.draw(self._cache,self)
     
     # HIDDEN METHODS
+    def _local(self,x,y):
+        """**Returns**: The point (x,y) in the local coordinate system of this object
+        
+            :param x: x coordinate of the point
+            **Precondition**: an int or float
+            
+            :param y: y coordinate of the point
+            **Precondition**: an int or float
+        
+        The value returned is a tuple.  This is the same point as the one computed by
+        `inverse`, but it uses a cached 2D affine transform (the upper 2x3 part of the 
+        inverse) so that no matrices or arrays are allocated.  The transform is only 
+        rebuilt when the position, angle or scale changes."""
+        if not self._atrue:
+            radians = math.radians(self._rotate.angle)
+            c = math.cos(radians)
+            s = math.sin(radians)
+            tx = self._trans.x
+            ty = self._trans.y
+            # Undo the translation, then the rotation, then the scale
+            a =  c/self._scale.x
+            b =  s/self._scale.x
+            d = -s/self._scale.y
+            e =  c/self._scale.y
+            self._affine = (a, b, -a*tx-b*ty, d, e, -d*tx-e*ty)
+            self._atrue = True
+        m = self._affine
+        return (m[0]*x+m[1]*y+m[2], m[3]*x+m[4]*y+m[5])
+    
     def _reset(self):
         """Resets the drawing cache"""
+        if GProfiler.current is not None:
+            GProfiler.current.count('reset')
         self._cache = InstructionGroup()
         self._cache.add(PushMatrix())
         self._cache.add(self._trans)
         self._cache.add(self._rotate)
         self._cache.add(self._scale)
+    
+    def _resize(self):
+        """Updates the drawing cache after a change to the width or height.
+        
+        By default this resets the drawing cache.  Subclasses that keep references to
+        their Kivy instructions override this to change them in place instead."""
+        self._reset()
+    
+    def _recolor(self):
+        """Updates the drawing cache after a change to the fill or line color.
+        
+        The colors are Kivy Color instructions that are changed in place, so there is
+        nothing to do by default.  This is a hook for subclasses that use the colors 
+        somewhere else."""
+        pass
 
 
 class GRectangle(GObject):
@@ -1043,11 +712,16 @@ class GRectangle(GObject):
     
     @linewidth.setter
     def linewidth(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        assert value >= 0, 'value %s is negative' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+            assert value >= 0, 'value %s is negative' % `value`
         self._linewidth = value
         if self._defined:
-            self._reset()
+            if value > 0 and self._line is not None:
+                self._line.width = value
+            else:
+                # The border is added or removed
+                self._reset()
     
     
     # BUILT-IN METHODS
@@ -1080,17 +754,27 @@ class GRectangle(GObject):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+        self._fill = Rectangle(pos=(x,y), size=(self.width, self.height))
         self._cache.add(self._fillcolor)
-        self._cache.add(fill)
+        self._cache.add(self._fill)
         
+        self._line = None
         if self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                        close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """Resizes the drawing cache in place"""
+        x = -self.width/2.0
+        y = -self.height/2.0
+        self._fill.pos  = (x,y)
+        self._fill.size = (self.width, self.height)
+        if self._line is not None:
+            self._line.rectangle = (x,y,self.width,self.height)
 
 
 class GEllipse(GRectangle):
@@ -1137,13 +821,15 @@ class GEllipse(GRectangle):
         **Warning**: Accessing this value on a rotated object may slow down your
         framerate significantly.
         """
+        if GProfiler.current is not None:
+            GProfiler.current.count('contains')
         rx = self.width/2.0
         ry = self.height/2.0
         if self._rotate.angle == 0.0:
             dx = (x-self.x)*(x-self.x)/(rx*rx)
             dy = (y-self.y)*(y-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(x,y)
+            p = self._local(x,y)
             dx = p[0]*p[0]/(rx*rx)
             dy = p[1]*p[1]/(ry*ry)
         
@@ -1157,16 +843,27 @@ class GEllipse(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        fill = Ellipse(pos=(x,y), size=(self.width,self.height))
+        self._fill = Ellipse(pos=(x,y), size=(self.width,self.height))
         self._cache.add(self._fillcolor)
-        self._cache.add(fill)
+        self._cache.add(self._fill)
         
+        self._line = None
         if self._linewidth > 0:
-            line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
+            self._line = Line(ellipse=(x,y,self.width,self.height),close=True,
+                              width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """Resizes the drawing cache in place"""
+        x = -self.width/2.0
+        y = -self.height/2.0
+        self._fill.pos  = (x,y)
+        self._fill.size = (self.width, self.height)
+        if self._line is not None:
+            self._line.ellipse = (x,y,self.width,self.height)
 
 
 class GImage(GRectangle):
@@ -1187,8 +884,16 @@ class GImage(GRectangle):
     If the image supports transparency, then this object can be used to represent 
     irregular shapes.  However, the `contains` method still treats this shape as a 
     rectangle.
+    
+    The dictionary `textures` maps the name of an image file to its texture.  An image
+    whose source is in `textures` uses that texture instead of loading the file.  The
+    textures are put there by `GPreloader`, and by any image whose source is decoded
+    from the asset bundle in use (see `use_bundle`).
     """
     
+    #: the textures of the preloaded image files, by file name
+    textures = {}
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -1199,7 +904,8 @@ class GImage(GRectangle):
 
     @source.setter
     def source(self,value):
-        assert value is None or _is_image_file(value), 'value %s is not an image file' % `value`
+        if _checking:
+            assert value is None or _is_image_file(value), 'value %s is not an image file' % `value`
         self._source = value
         if self._defined:
             self._reset()
@@ -1234,18 +940,146 @@ class GImage(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        fill = Rectangle(pos=(x,y), size=(self.width, self.height),source=self.source)
+        texture = GImage.textures.get(self.source)
+        if texture is None and self.source is not None:
+            image = _bundle_image(self.source)
+            if image is not None:
+                texture = image.texture
+                GImage.textures[self.source] = texture
+        if texture is None:
+            self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),source=self.source)
+        else:
+            self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=texture)
         self._cache.add(self._fillcolor)
-        self._cache.add(fill)
+        self._cache.add(self._fill)
         
+        self._line = None
         if self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
 
+class GTextureCache(object):
+    """Instances are a least-recently-used cache of textures with a byte budget.
+    
+    Each texture is stored under a key (any hashable value).  The size of a texture
+    is taken to be 4 bytes per pixel.  When the textures in the cache take more than
+    `budget` bytes, the least recently used ones are dropped until they fit.  A texture
+    dropped from the cache stays valid for any object that still uses it.
+    
+    The class `GLabel` keeps the rendered text of every label in a shared cache, so
+    that the same text (in the same font) is only rendered once."""
+    
+    # MUTABLE PROPERTIES
+    @property
+    def budget(self):
+        """The most bytes of textures to keep.
+        
+        Setting this value drops textures until the cache fits.
+        
+        **Invariant**: Must be an int >= 0"""
+        return self._budget
+    
+    @budget.setter
+    def budget(self,value):
+        if _checking:
+            assert type(value) == int and value >= 0, 'value %s is not a valid budget' % `value`
+        self._budget = value
+        self._trim()
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """The number of bytes of the textures in the cache.
+        
+        *This attribute may not be altered directly.*"""
+        return self._size
+    
+    @property
+    def hits(self):
+        """The number of calls to `get` that found their texture.
+        
+        *This attribute may not be altered directly.*"""
+        return self._hits
+    
+    @property
+    def misses(self):
+        """The number of calls to `get` that did not find their texture.
+        
+        *This attribute may not be altered directly.*"""
+        return self._misses
+    
+    # BUILT-IN METHODS
+    def __init__(self,budget):
+        """**Constructor**: Creates a new, empty texture cache.
+        
+            :param budget: the most bytes of textures to keep
+            **Precondition**: an int >= 0"""
+        self._entries = collections.OrderedDict()
+        self._size   = 0
+        self._hits   = 0
+        self._misses = 0
+        self.budget  = budget
+    
+    def __len__(self):
+        """**Returns**: The number of textures in the cache."""
+        return len(self._entries)
+    
+    # PUBLIC METHODS
+    def get(self,key):
+        """**Returns**: The texture stored under key, or None if there is none.
+        
+        The texture becomes the most recently used one.
+        
+            :param key: the key of the texture
+            **Precondition**: a hashable value"""
+        texture = self._entries.pop(key,None)
+        if texture is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries[key] = texture
+        return texture
+    
+    def put(self,key,texture):
+        """Stores the texture under key, as the most recently used texture.
+        
+        A texture larger than the whole budget is not stored.
+        
+            :param key: the key of the texture
+            **Precondition**: a hashable value
+        
+            :param texture: the texture to store
+            **Precondition**: a Kivy texture"""
+        old = self._entries.pop(key,None)
+        if old is not None:
+            self._size -= self._bytes(old)
+        if self._bytes(texture) <= self._budget:
+            self._entries[key] = texture
+            self._size += self._bytes(texture)
+            self._trim()
+    
+    def clear(self):
+        """Drops every texture in the cache."""
+        self._entries.clear()
+        self._size = 0
+    
+    # HIDDEN METHODS
+    def _bytes(self,texture):
+        """**Returns**: The number of bytes of the given texture (4 per pixel)"""
+        return 4*texture.size[0]*texture.size[1]
+    
+    def _trim(self):
+        """Drops the least recently used textures until the cache fits its budget"""
+        while self._size > self._budget:
+            key, texture = self._entries.popitem(last=False)
+            self._size -= self._bytes(texture)
+
+
 class GLabel(GRectangle):
     """Instances represent an (uneditable) text label
     
@@ -1267,7 +1101,28 @@ class GLabel(GRectangle):
     to the font by filename, including the .ttf. If you give no name, it will use the 
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
-    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
+    
+    The text is rendered in white, and tinted with `linecolor` when it is drawn.  The
+    rendered text is kept in the shared texture cache `GLabel.cache`, keyed by the
+    text, font name, font size, boldness and (for text with several lines) horizontal
+    alignment.  So changing the color of a label never renders its text again, and a
+    text that was shown before (by any label) is only rendered again if it was dropped
+    from the cache.  A label whose text keeps changing (such as a timer or a readout)
+    should be made with `cached=False`, so that its texts do not push the stable texts
+    of the other labels out of the cache."""
+    
+    #: the textures of the rendered text of all labels
+    cache = GTextureCache(8*1024*1024)
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def cached(self):
+        """Whether the rendered text of this label is kept in (and taken from) the
+        shared texture cache `GLabel.cache`.
+        
+        *This attribute may only be set by the constructor (keyword `cached`).*"""
+        return self._cached
     
     # MUTABLE PROPERTIES
     @property
@@ -1279,23 +1134,26 @@ class GLabel(GRectangle):
     
     @font_size.setter
     def font_size(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         self._fsize = value
-        self._label.font_size = value
-        self._label.texture_update()
+        if self._defined:
+            self._retext()
     
     @property
     def font_name(self):
         """File name for the .ttf file to use as a font
         
         **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._fname
     
     @font_name.setter
     def font_name(self,value):
-        assert _is_font_file(value), 'value %s is not a font name' % `value`
-        self._label.font_name = value
-        self._label.texture_update()
+        if _checking:
+            assert _is_font_file(value), 'value %s is not a font name' % `value`
+        self._fname = value
+        if self._defined:
+            self._retext()
     
     @property
     def bold(self):
@@ -1306,13 +1164,15 @@ class GLabel(GRectangle):
         `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
         
         **Invariant**: Must be a boolean"""
-        return self._label.bold
+        return self._bold
 
     @bold.setter
     def bold(self,value):
-        assert type(value) == bool, `value`+' is not a bool'
-        self._label.bold = value
-        self._label.texture_update()
+        if _checking:
+            assert type(value) == bool, `value`+' is not a bool'
+        self._bold = value
+        if self._defined:
+            self._retext()
 
     @property
     def text(self):
@@ -1323,13 +1183,15 @@ class GLabel(GRectangle):
         this label will grow to ensure that the text will fit in the rectangle.
         
         **Invariant**: Must be a string"""
-        return self._label.text
+        return self._text
     
     @text.setter
     def text(self,value):
-        assert type(value) == str, 'value %s is not a string' % `value`
-        self._label.text = value
-        self._label.texture_update()
+        if _checking:
+            assert type(value) == str, 'value %s is not a string' % `value`
+        self._text = value
+        if self._defined:
+            self._retext()
     
     @property
     def halign(self):
@@ -1345,10 +1207,12 @@ class GLabel(GRectangle):
     
     @halign.setter
     def halign(self,value):
-        assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % `value`
+        if _checking:
+            assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % `value`
         self._halign = value
-        self._label.halign = value
         if self._defined:
+            # Only text with several lines needs a new texture, but the text always moves
+            self._retext()
             self._reset()
     
     @property
@@ -1365,9 +1229,9 @@ class GLabel(GRectangle):
     
     @valign.setter
     def valign(self,value):
-        assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % `value`
+        if _checking:
+            assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % `value`
         self._valign = value
-        self._label.valign = value
         if self._defined:
             self._reset()
     
@@ -1382,9 +1246,11 @@ class GLabel(GRectangle):
     
     @x.setter
     def x(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         self._trans.x = float(value)
         self._mtrue = False
+        self._atrue = False
         self._hanchor = 'center'
         self._ha = value
     
@@ -1397,9 +1263,11 @@ class GLabel(GRectangle):
     
     @y.setter
     def y(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         self._trans.y = float(value)
         self._mtrue = False
+        self._atrue = False
         self._vanchor = 'center'
         self._hv = value
     
@@ -1428,7 +1296,8 @@ class GLabel(GRectangle):
     
     @left.setter
     def left(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.left
         self.x += diff
         self._hanchor = 'left'
@@ -1459,7 +1328,8 @@ class GLabel(GRectangle):
     
     @right.setter
     def right(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.right
         self.x += diff
         self._hanchor = 'right'
@@ -1490,7 +1360,8 @@ class GLabel(GRectangle):
     
     @top.setter
     def top(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.top
         self.y += diff
         self._vanchor = 'top'
@@ -1523,7 +1394,8 @@ class GLabel(GRectangle):
     
     @bottom.setter
     def bottom(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
         diff = value-self.bottom
         self.y += diff
         self._vanchor = 'bottom'
@@ -1544,22 +1416,36 @@ class GLabel(GRectangle):
             GLabel(text='Hello')
         
         This class supports the same keywords as `GRectangle`, as well as additional 
-        attributes for the text properties (e.g. font size and name)."""
+        attributes for the text properties (e.g. font size and name).  The keyword
+        `cached` (True by default) is False for a label whose text should not be kept
+        in the shared texture cache."""
+        _load_kivy()
         self._defined = False
+        self._cached = keywords['cached'] if 'cached' in keywords else True
+        if _checking:
+            assert type(self._cached) == bool, 'value %s is not a bool' % `self._cached`
         self._hanchor = 'center'
         self._vanchor = 'center'
-        
-        self._label = Label(**keywords)
-        self._label.size_hint = (None,None)
+        self._key      = None
+        self._texture  = None
+        self._textrect = None
+        self._tsize    = (0,0)
+        
+        self._fname = DEFAULT_FONT
+        if 'font_name' in keywords:
+            self.font_name = keywords['font_name']
+        self.text      = keywords['text'] if 'text' in keywords else ''
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else sp(15)
+        self.bold      = keywords['bold'] if 'bold' in keywords else False
         
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.halign = keywords['halign'] if 'halign' in keywords else 'center'
         self.valign = keywords['valign'] if 'valign' in keywords else 'middle'
         
         GObject.__init__(self,**keywords)
+        self._retext()
         self._reset()
         self._defined = True
-        self._label.bind(texture_size=self._callback)
     
     def __str__(self):
         """**Returns**: A string representation of this object."""
@@ -1571,22 +1457,46 @@ class GLabel(GRectangle):
                 % (s,`self.text`,`self.x`,`self.y`,`self.angle`)
     
     # HIDDEN METHODS
-    def _callback(self,instance=None,value=None):
-        """Workaround to deal with parameter requirements for callbacks"""
-        if self._defined:
+    def _retext(self):
+        """Renders the text (or takes it from the cache) if it has changed.
+        
+        If the new texture has the same size as the old one, it replaces the old one in
+        the drawing cache.  Otherwise, the drawing cache is reset."""
+        # Alignment only changes the texture of a text with several lines
+        halign = self._halign if '\n' in self._text else 'center'
+        key = (self._text,self._fname,self._fsize,self._bold,halign)
+        if key == self._key:
+            return
+        self._key = key
+        
+        texture = GLabel.cache.get(key) if self._cached else None
+        if texture is None and self._text != '':
+            label = CoreLabel(text=self._text,font_name=_resource_file(FONT_PATH,self._fname),
+                              font_size=self._fsize,bold=self._bold,
+                              halign=halign,color=(1,1,1,1))
+            label.refresh()
+            texture = label.texture
+            if texture is not None and self._cached:
+                GLabel.cache.put(key,texture)
+        self._texture = texture
+        
+        if not self._defined:
+            return
+        size = (0,0) if texture is None else tuple(texture.size)
+        if self._textrect is not None and texture is not None and size == self._tsize:
+            self._textrect.texture = texture
+        else:
             self._reset()
     
     def _reset(self):
         """Resets the drawing cache"""
-        # Set up the label at the center.
-        self._label.size = self._label.texture_size
-        self._label.center = (0,0)
-        self._label.color = self.linecolor
+        tw, th = (0,0) if self._texture is None else tuple(self._texture.size)
+        self._tsize = (tw,th)
         
         # Resize the outside if necessary
         self._defined = False
-        self.width  = max(self.width, self._label.width)
-        self.height = max(self.height,self._label.height)
+        self.width  = max(self.width, tw)
+        self.height = max(self.height,th)
         self._defined = True
         
         # Reset the absolute anchor
@@ -1602,32 +1512,45 @@ class GLabel(GRectangle):
             self._trans.y = self._hv+self.height/2.0
         
         # Reset the label anchor.
+        tx = -tw/2.0
         if self.halign == 'left':
-            self._label.x = -self.width/2.0
+            tx = -self.width/2.0
         elif self.halign == 'right':
-            self._label.right = self.width/2.0
+            tx = self.width/2.0-tw
         
         # Reset the label anchor.
+        ty = -th/2.0
         if self.valign == 'top':
-            self._label.top = self.height/2.0
+            ty = self.height/2.0-th
         elif self.valign == 'bottom':
-            self._label.bottom = -self.height/2.0
+            ty = -self.height/2.0
         
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
         
-        fill = Rectangle(pos=(x,y), size=(self.width,self.height))
+        self._fill = Rectangle(pos=(x,y), size=(self.width,self.height))
         self._cache.add(self._fillcolor)
-        self._cache.add(fill)
-        self._cache.add(self._label.canvas)
+        self._cache.add(self._fill)
+        
+        # The text is white, so the line color tints it
+        self._cache.add(self._linecolor)
+        self._textrect = None
+        if self._texture is not None:
+            self._textrect = Rectangle(pos=(tx,ty),size=(tw,th),texture=self._texture)
+            self._cache.add(self._textrect)
         
+        self._line = None
         if self._linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """Resets the drawing cache, as the text must be anchored again"""
+        self._reset()
 
 
 ################# PATH PRIMITIVES #################
@@ -1665,7 +1588,8 @@ class GPath(GObject):
     
     @points.setter
     def points(self,value):
-        assert _is_point_tuple(value,2),'value %s is not a valid list of points' %  `value`
+        if _checking:
+            assert _is_point_tuple(value,2),'value %s is not a valid list of points' %  `value`
         self._points = tuple(value)
         if self._defined:
             self._reset()
@@ -1681,11 +1605,15 @@ class GPath(GObject):
     
     @linewidth.setter
     def linewidth(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        assert value >= 0, 'value %s is negative' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+            assert value >= 0, 'value %s is negative' % `value`
         self._linewidth = value
         if self._defined:
-            self._reset()
+            if value > 0 and self._line is not None:
+                self._line.width = value
+            else:
+                self._reset()
     
     
     # IMMUTABLE PROPERTIES
@@ -1782,8 +1710,8 @@ class GPath(GObject):
         """Resets the drawing cache"""
         GObject._reset(self)
         self._cache.add(self._linecolor)
-        line = Line(points=self.points,cap='round',joint='round',width=self.linewidth)
-        self._cache.add(line)
+        self._line = Line(points=self.points,cap='round',joint='round',width=self.linewidth)
+        self._cache.add(self._line)
         self._cache.add(PopMatrix())
 
 
@@ -1814,7 +1742,8 @@ class GTriangle(GPath):
     
     @points.setter
     def points(self,value):
-        assert _is_num_tuple(value,6),'value %s is not a valid list of points' %  `value`
+        if _checking:
+            assert _is_num_tuple(value,6),'value %s is not a valid list of points' %  `value`
         self._points = tuple(value)
         if self._defined:
             self._reset()
@@ -1870,10 +1799,11 @@ class GTriangle(GPath):
         self._cache.add(self._fillcolor)
         self._cache.add(mesh)
         
+        self._line = None
         if self.linewidth > 0:
-            line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
+            self._line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -1913,7 +1843,8 @@ class GPolygon(GPath):
     
     @points.setter
     def points(self,value):
-        assert _is_point_tuple(value,4),'value %s is not a valid list of points' % `value`
+        if _checking:
+            assert _is_point_tuple(value,4),'value %s is not a valid list of points' % `value`
         self._points = tuple(value)
         if self._defined:
             self._reset()
@@ -1927,7 +1858,8 @@ class GPolygon(GPath):
 
     @source.setter
     def source(self,value):
-        assert value is None or _is_image_file(value), 'value %s is not an image file' % `value`
+        if _checking:
+            assert value is None or _is_image_file(value), 'value %s is not an image file' % `value`
         self._source = value
         if self._defined:
             self._reset()
@@ -1950,7 +1882,8 @@ class GPolygon(GPath):
     
     @source_width.setter
     def source_width(self,value):
-        assert value is None or _is_num(value), 'value %s is not a valid width' % `value`
+        if _checking:
+            assert value is None or type(value) in _NUMS, 'value %s is not a valid width' % `value`
         self._source_width = None
         if self._defined:
             self._reset()
@@ -1973,7 +1906,8 @@ class GPolygon(GPath):
     
     @source_height.setter
     def source_height(self,value):
-        assert value is None or _is_num(value), 'value %s is not a valid width' % `value`
+        if _checking:
+            assert value is None or type(value) in _NUMS, 'value %s is not a valid width' % `value`
         self._source_height = None
         if self._defined:
             self._reset()
@@ -2030,7 +1964,7 @@ class GPolygon(GPath):
         """Creates the mesh for this polygon"""
         size = len(self.points)/2
         try:
-            texture = Image(source=self.source).texture
+            texture = Image(source=_resource_file(IMAGE_PATH,self.source)).texture
             texture.wrap = 'repeat'
             tw = float(texture.width)  if self.source_width is None else self.source_width
             th = float(texture.height) if self.source_height is None else self.source_height
@@ -2063,14 +1997,326 @@ class GPolygon(GPath):
         self._cache.add(self._fillcolor)
         self._cache.add(self._mesh)
         
+        self._line = None
         if self.linewidth > 0:
-            line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
+            self._line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
 
+################# BATCH PRIMITIVES #################
+pass 
+# #mark BATCH PRIMITIVES
+
+class GBatch(GObject):
+    """Instances represent a large collection of solid, axis-aligned rectangles.
+    
+    Drawing a `GRectangle` takes seven Kivy instructions, so drawing hundreds of them 
+    every frame is slow.  A `GBatch` packs all of its rectangles of the same color into
+    a single Kivy `Mesh`, so it only takes two instructions per color, no matter how
+    many rectangles there are.
+    
+    Rectangles are added with the method `add`, which returns a handle.  Use this 
+    handle to remove the rectangle with the method `remove`.  Removing a rectangle does 
+    not rebuild the batch; its slot in the mesh is simply emptied, and reused by the
+    next rectangle of the same color.  The mesh is sent to the graphics card at most 
+    once per frame, when the batch is drawn.  A Kivy `Mesh` cannot update only part of
+    its vertices, so any change sends every vertex of that color again.  The indices
+    are only sent again when a color gets a new slot, so a removal never sends them.
+    
+    As with `GScene`, the rectangles are drawn as if (x,y) is the origin.  The
+    attributes `width` and `height` of a batch are not used."""
+    
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """**Constructor**: Creates a new, empty batch of rectangles.
+        
+            :param keywords: dictionary of keyword arguments 
+            **Precondition**: See below.
+        
+        This class supports the same keywords as `GObject`, though only `x`, `y`,
+        `angle` and `scale` have any effect."""
+        self._defined = False
+        self._meshes = {}
+        self._handles = {}
+        self._count = 0
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+    
+    def __len__(self):
+        """**Returns**: The number of rectangles in this batch."""
+        return len(self._handles)
+    
+    
+    # PUBLIC METHODS
+    def add(self,x,y,width,height,color):
+        """**Returns**: a handle for a new rectangle added to this batch
+        
+            :param x: the horizontal coordinate of the rectangle center
+            **Precondition**: an int or float
+            
+            :param y: the vertical coordinate of the rectangle center
+            **Precondition**: an int or float
+            
+            :param width: the width of the rectangle
+            **Precondition**: an int or float > 0
+            
+            :param height: the height of the rectangle
+            **Precondition**: an int or float > 0
+            
+            :param color: the color of the rectangle
+            **Precondition**: a valid color (see the attribute `fillcolor`)
+        """
+        if _checking:
+            assert type(x) in _NUMS, 'value %s is not a number' % `x`
+            assert type(y) in _NUMS, 'value %s is not a number' % `y`
+            assert type(width) in _NUMS and width > 0, 'value %s is not a valid width' % `width`
+            assert type(height) in _NUMS and height > 0, 'value %s is not a valid height' % `height`
+            assert _is_color(color), 'value %s is not a valid color' % `color`
+        key = tuple(_gl_color(color))
+        if not key in self._meshes:
+            self._meshes[key] = {'color': Color(*key), 'vertices': [], 'indices': [],
+                                 'free': [], 'dirty': True, 'grown': True}
+            self._meshes[key]['mesh'] = Mesh(vertices=[],indices=[],mode='triangles')
+            self._reset()
+        
+        batch = self._meshes[key]
+        if batch['free']:
+            slot = batch['free'].pop()
+        else:
+            slot = len(batch['vertices'])/16
+            batch['vertices'].extend([0.0]*16)
+            batch['indices'].extend([4*slot,4*slot+1,4*slot+2,
+                                     4*slot+2,4*slot+3,4*slot])
+            batch['grown'] = True
+        
+        # Vertices are (x,y,u,v), counter-clockwise from the bottom left
+        l = x-width/2.0
+        r = x+width/2.0
+        b = y-height/2.0
+        t = y+height/2.0
+        batch['vertices'][16*slot:16*slot+16] = [l,b,0,0, r,b,1,0, r,t,1,1, l,t,0,1]
+        batch['dirty'] = True
+        
+        self._count += 1
+        handle = self._count
+        self._handles[handle] = (key,slot)
+        return handle
+    
+    def remove(self,handle):
+        """Removes the rectangle with the given handle from this batch.
+        
+            :param handle: the handle of the rectangle to remove
+            **Precondition**: a handle returned by `add` that has not been removed
+        """
+        assert handle in self._handles, 'value %s is not a rectangle in this batch' % `handle`
+        key, slot = self._handles.pop(handle)
+        batch = self._meshes[key]
+        batch['vertices'][16*slot:16*slot+16] = [0.0]*16
+        batch['free'].append(slot)
+        batch['dirty'] = True
+    
+    def contains(self,x,y):
+        """**Returns**: True if one of the rectangles contains the point (x,y).
+        
+            :param x: x coordinate of point to check
+            **Precondition**: an int or float
+            
+            :param y: y coordinate of point to check
+            **Precondition**: an int or float
+        
+        This method ignores any rotation or scaling of the batch."""
+        x = x-self.x
+        y = y-self.y
+        for key, slot in self._handles.itervalues():
+            v = self._meshes[key]['vertices']
+            if v[16*slot] < x < v[16*slot+4] and v[16*slot+1] < y < v[16*slot+9]:
+                return True
+        return False
+    
+    def draw(self, view):
+        """Draw this batch in the provide view.
+        
+            :param view: view to draw to
+            **Precondition**: an *instance of* `GView`
+        
+        Any rectangles added or removed since the last draw are sent to the mesh now.
+        Only the colors that changed are sent, and their indices only if they grew."""
+        for batch in self._meshes.itervalues():
+            if batch['dirty']:
+                batch['mesh'].vertices = batch['vertices']
+                batch['dirty'] = False
+            if batch['grown']:
+                batch['mesh'].indices = batch['indices']
+                batch['grown'] = False
+        view.draw(self._cache,self)
+    
+    
+    # HIDDEN METHODS
+    def _reset(self):
+        """Resets the drawing cache"""
+        GObject._reset(self)
+        for batch in self._meshes.itervalues():
+            self._cache.add(batch['color'])
+            self._cache.add(batch['mesh'])
+        self._cache.add(PopMatrix())
+
+
+class GCircleBatch(GObject):
+    """Instances represent a large collection of solid circles of the same size.
+    
+    A `GCircleBatch` draws all of its circles as a single Kivy `Mesh`, with the color 
+    `fillcolor`.  Each circle is a regular polygon with `sides` sides.  Unlike `GBatch`,
+    the circles are not added one at a time.  Instead, the method `place` moves every 
+    circle at once, from arrays of centers.  This makes it cheap to draw hundreds of 
+    moving objects (such as balls), as the vertices of all of the circles are computed
+    with a few numpy operations.
+    
+    As with `GScene`, the circles are drawn as if (x,y) is the origin.  The attributes 
+    `width` and `height` of a batch are not used."""
+    
+    # MUTABLE PROPERTIES
+    @property
+    def radius(self):
+        """The radius of every circle in this batch.
+        
+        **Invariant**: Must be an int or float > 0."""
+        return self._radius
+    
+    @radius.setter
+    def radius(self,value):
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+            assert value > 0, 'value %s is not positive' % `value`
+        self._radius = float(value)
+        self._make_outline()
+    
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def sides(self):
+        """The number of sides of the polygon drawn for each circle.
+        
+        **Invariant**: Must be an int >= 3."""
+        return len(self._outline)
+    
+    
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """**Constructor**: Creates a new, empty batch of circles.
+        
+            :param keywords: dictionary of keyword arguments 
+            **Precondition**: See below.
+        
+        This class supports the same keywords as `GObject`, as well as the keywords
+        `radius` (1 by default) and `sides` (16 by default)."""
+        _load_kivy()
+        sides = keywords['sides'] if 'sides' in keywords else 16
+        if _checking:
+            assert type(sides) == int and sides >= 3, 'sides %s is not an int >= 3' % `sides`
+        self._defined = False
+        self._outline = np.zeros((sides,2))
+        self.radius = keywords['radius'] if 'radius' in keywords else 1
+        self._centers = np.zeros((0,2))
+        self._dirty = True
+        self._mesh = Mesh(vertices=[],indices=[],mode='triangles')
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+    
+    def __len__(self):
+        """**Returns**: The number of circles in this batch."""
+        return len(self._centers)
+    
+    
+    # PUBLIC METHODS
+    def place(self,xs,ys):
+        """Sets the centers of the circles of this batch.
+        
+        The number of circles in this batch becomes the length of `xs`.
+        
+            :param xs: the horizontal coordinates of the centers
+            **Precondition**: a sequence or numpy array of numbers
+            
+            :param ys: the vertical coordinates of the centers
+            **Precondition**: a sequence or numpy array of numbers, the same length as xs
+        """
+        assert len(xs) == len(ys), 'value %s has a different length from %s' % (`ys`,`xs`)
+        if len(xs) != len(self._centers):
+            self._centers = np.empty((len(xs),2))
+        self._centers[:,0] = xs
+        self._centers[:,1] = ys
+        self._dirty = True
+    
+    def contains(self,x,y):
+        """**Returns**: True if one of the circles contains the point (x,y).
+        
+            :param x: x coordinate of point to check
+            **Precondition**: an int or float
+            
+            :param y: y coordinate of point to check
+            **Precondition**: an int or float
+        
+        This method ignores any rotation or scaling of the batch."""
+        dx = self._centers[:,0]-(x-self.x)
+        dy = self._centers[:,1]-(y-self.y)
+        return bool(np.any(dx*dx+dy*dy <= self._radius*self._radius))
+    
+    def draw(self, view):
+        """Draw this batch in the provide view.
+        
+            :param view: view to draw to
+            **Precondition**: an *instance of* `GView`
+        
+        If the circles have moved since the last draw, the mesh is updated now."""
+        if self._dirty:
+            self._update_mesh()
+        view.draw(self._cache,self)
+    
+    
+    # HIDDEN METHODS
+    def _make_outline(self):
+        """Computes the corners of a circle centered at the origin"""
+        angles = np.linspace(0,2*np.pi,len(self._outline),endpoint=False)
+        self._outline[:,0] = self._radius*np.cos(angles)
+        self._outline[:,1] = self._radius*np.sin(angles)
+        self._dirty = True
+    
+    def _update_mesh(self):
+        """Sends the vertices of every circle to the mesh.
+        
+        Each circle is a fan of triangles around its center.  Vertices are (x,y,u,v),
+        the center first and then the corners counter-clockwise."""
+        n = len(self._centers)
+        sides = len(self._outline)
+        vertices = np.zeros((n,sides+1,4))
+        vertices[:,0,:2] = self._centers
+        vertices[:,1:,:2] = self._centers[:,np.newaxis,:]+self._outline[np.newaxis,:,:]
+        if len(self._mesh.indices) != 3*sides*n:
+            corner = np.arange(sides)
+            fan = np.empty((sides,3),dtype=int)
+            fan[:,0] = 0
+            fan[:,1] = corner+1
+            fan[:,2] = (corner+1) % sides+1
+            offsets = (sides+1)*np.arange(n)
+            indices = fan[np.newaxis,:,:]+offsets[:,np.newaxis,np.newaxis]
+            self._mesh.vertices = vertices.ravel().tolist()
+            self._mesh.indices = indices.ravel().tolist()
+        else:
+            self._mesh.vertices = vertices.ravel().tolist()
+        self._dirty = False
+    
+    def _reset(self):
+        """Resets the drawing cache"""
+        GObject._reset(self)
+        self._cache.add(self._fillcolor)
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
+
+
 ################# SCENE GRAPH #################
 pass 
 # #mark SCENE GRAPH
@@ -2105,7 +2351,8 @@ class GScene(GObject):
     
     @children.setter
     def children(self,value):
-        assert _is_gobject_list(value), 'value %s is not a list of GObjects' % `value`
+        if _checking:
+            assert _is_gobject_list(value), 'value %s is not a list of GObjects' % `value`
         self._children = list(value)
         if self._defined:
             self._reset()
@@ -2185,9 +2432,11 @@ class Sound(object):
     platforms. In order for Kivy to find a WAV or OGG file, you should put it in the
     **Sounds** directory.  Sounds in that folder can be referenced directly by name.
     
-    When a sound is played, it cannot be played again until it finishes, or is stopped.  
-    This means that if you want multiple, simultaneous sound effects from the same WAV 
-    file.you will need to create multiple Sound objects.
+    A sound has one or more voices.  Each voice is a separate copy of the sound, loaded
+    when the sound is made.  A voice cannot be played again until it finishes, or is 
+    stopped, so `play` uses a voice that is not playing.  If every voice is playing, it 
+    stops the one that started first and plays that one again (it steals the voice).  
+    So a sound with n voices can play n times at once, and a new play is never dropped.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
@@ -2200,13 +2449,15 @@ class Sound(object):
         1 means full volume, 0 means mute.  The default value is 1.
         
         **Invariant**: Must float in the range 0..1."""
-        return self._sound.volume
+        return self._voices[0].volume
     
     @volume.setter
     def volume(self,value):
-        assert type(value) in [int, float] and value >= 0 and value <= 1, \
-            'value %s is not a valid volume' % `value`
-        self._sound.volume = value
+        if _checking:
+            assert type(value) in [int, float] and value >= 0 and value <= 1, \
+                'value %s is not a valid volume' % `value`
+        for voice in self._voices:
+            voice.volume = value
     
     # IMMUTABLE PROPERTIES
     @property
@@ -2218,23 +2469,53 @@ class Sound(object):
         **Invariant**: Must be a nonempty string.""" 
         return self._source
     
-    def __init__(self,source):
+    @property
+    def voices(self):
+        """The number of voices of this sound.
+        
+        **Immutable**: This value cannot be changed after the sound is loaded.
+        
+        **Invariant**: Must be an int > 0."""
+        return len(self._voices)
+    
+    def __init__(self,source,voices=1):
         """**Constructor**: Loads a new sound from a file.
         
             :param source: The string providing the name of a sound file
             **Precondition**: source is the name of a valid sound file
+        
+            :param voices: The number of voices (copies of the sound to load)
+            **Precondition**: voices is an int > 0
         """
-        assert _is_sound_file(source), 'source %s is not a sound file' % `filename`
+        if _checking:
+            assert _is_sound_file(source), 'source %s is not a sound file' % `source`
+            assert type(voices) == int and voices > 0, 'value %s is not a valid number of voices' % `voices`
+        _load_kivy()
         self._source = source
-        self._sound  = SoundLoader.load(source)
-        if self._sound is None:
-            raise IOError('Module game2d cannot read the file %s' % `source`)
+        self._voices = []
+        for i in range(voices):
+            sound = SoundLoader.load(_resource_file(SOUND_PATH,source))
+            if sound is None:
+                raise IOError('Module game2d cannot read the file %s' % `source`)
+            self._voices.append(sound)
+        self._started = [0]*voices
+        self._plays   = 0
     
     def play(self):
-        """Plays this sound.
-        
-        The sound will play until completion, or interrupted by another sound"""
-        self._sound.play()
+        """Plays this sound on a free voice, or steals the oldest voice if none is free.
+        
+        The sound will play until completion, or until its voice is stolen"""
+        voice = None
+        for i in range(len(self._voices)):
+            if self._voices[i].state != 'play':
+                voice = i
+                break
+        if voice is None:
+            voice = self._started.index(min(self._started))
+            self._voices[voice].stop()
+        self._plays += 1
+        self._started[voice] = self._plays
+        self._voices[voice].play()
 
 
 class SoundLibrary(object):
@@ -2246,18 +2527,57 @@ class SoundLibrary(object):
     
         soundlib['soundname'] = 'soundfile.wav'
     
-    The sound library will load the sound and map it to 'soundname' as the key.
-    To play the sound, we access it as follows:
+    The sound library will load the sound (with `voices` voices) and map it to 
+    'soundname' as the key. To play the sound, we access it as follows:
     
         soundlib['soundname'].play()
-    """
     
-    def __init__(self):
-        """**Constructor**: Creates a new, empty sound library."""
-        if not _INITIALIZED:
-            init()
+    The library returned by `shared` is the same for the whole program.  Use it (with
+    `load`) for the sounds of objects that are made again and again, such as the
+    sounds of a game, so that each sound file is only loaded once."""
+    
+    #: the library shared by the whole program (None until shared is called)
+    _shared = None
+    
+    # MUTABLE PROPERTIES
+    @property
+    def voices(self):
+        """The number of voices of each sound loaded from now on.
+        
+        **Invariant**: Must be an int > 0."""
+        return self._nvoices
+    
+    @voices.setter
+    def voices(self,value):
+        if _checking:
+            assert type(value) == int and value > 0, 'value %s is not a valid number of voices' % `value`
+        self._nvoices = value
+    
+    # BUILT-IN METHODS
+    def __init__(self,voices=1):
+        """**Constructor**: Creates a new, empty sound library.
+        
+            :param voices: The number of voices of each sound
+            **Precondition**: voices is an int > 0
+        """
+        self.voices = voices
         self._data = {}
     
+    @classmethod
+    def shared(cls):
+        """**Returns**: The sound library shared by the whole program."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    def __contains__(self, key):
+        """**Returns**: True if a sound has the given name in this library.
+            
+            :param key: The key identifying a sound object
+            **Precondition**:: key is a string.
+        """
+        return key in self._data
+    
     def __len__(self):
         """**Returns**: The number of sounds in this library."""
         return len(self._data)
@@ -2272,16 +2592,22 @@ class SoundLibrary(object):
     
     def __setitem__(self, key, filename):
         """Creates a sound object from the file filename and assigns it the given name.
+        
+        If filename is already a Sound object, that object is assigned instead.
             
             :param key: The key identifying a sound object
             **Precondition**:: key is a string.
             
             :param filename: The name of the file containing the sound source
-            **Precondition**:: filename is the name of a valid sound file.
+            **Precondition**:: filename is the name of a valid sound file, or a Sound.
         
         """
-        assert is_sound_file(filename), `filename`+' is not a sound file'
-        self._data[key] = Sound(filename)
+        if isinstance(filename, Sound):
+            self._data[key] = filename
+            return
+        if _checking:
+            assert _is_sound_file(filename), `filename`+' is not a sound file'
+        self._data[key] = Sound(filename,self._nvoices)
     
     def __delitem__(self, key):
         """Deletes the Sound object for the given sound name.
@@ -2298,6 +2624,28 @@ class SoundLibrary(object):
     def iterkeys(self):
         """**Returns**: The key iterator for this sound dictionary."""
         return self._data.iterkeys()
+    
+    def load(self, key, filename, voices=None):
+        """**Returns**: The Sound object for the given sound name, loading it if needed.
+        
+        If the library has no sound with this name, the sound is loaded from the file 
+        filename first.  Otherwise, nothing is loaded, even if the sound came from a 
+        different file.
+            
+            :param key: The key identifying a sound object
+            **Precondition**:: key is a string.
+            
+            :param filename: The name of the file containing the sound source
+            **Precondition**:: filename is the name of a valid sound file.
+            
+            :param voices: The number of voices (None for `voices`)
+            **Precondition**:: voices is None or an int > 0.
+        """
+        if key not in self._data:
+            if _checking:
+                assert _is_sound_file(filename), `filename`+' is not a sound file'
+            self._data[key] = Sound(filename,self._nvoices if voices is None else voices)
+        return self._data[key]
 
 
 ################# VIEW CLASSES #################
@@ -2311,6 +2659,12 @@ class GInput(object):
     to the user.  To access mouse information, simply access the attribute `touch`.
     To access keyboard information, use the method `is_key_down`.
     
+    Every press and release of a key is also queued with the time it happened.  The
+    queue is drained at the start of each animation frame, so that the keys of the
+    last frame can be replayed in time: see the attributes `frame_time` and 
+    `key_events`, and the methods `was_key_down` and `held_time`.  This lets a game
+    move by how long a key was held, rather than by how many frames it was down.
+    
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly hook it up to the keyboard and mouse.  Instead, 
     you should only use the one provided in the `input` attribute of `GameApp`. See the 
@@ -2330,7 +2684,8 @@ class GInput(object):
     
     @touch_enabled.setter
     def touch_enabled(self,value):
-        assert type(value) == bool, 'value %s is not a bool' % `value`
+        if _checking:
+            assert type(value) == bool, 'value %s is not a bool' % `value`
         if value and not self._touch_enabled:
             self._enable_touch()
         elif not value and self._touch_enabled:
@@ -2349,7 +2704,8 @@ class GInput(object):
     
     @keyboard_enabled.setter
     def keyboard_enabled(self,value):
-        assert type(value) == bool, 'value %s is not a bool' % `value`
+        if _checking:
+            assert type(value) == bool, 'value %s is not a bool' % `value`
         if value and not self._keyboard_enabled:
             self._enable_keyboard()
         elif not value and self._keyboard_enabled:
@@ -2401,6 +2757,31 @@ class GInput(object):
         **Invariant**: Must be a list of strings (possibly empty)"""
         return tuple(k for (k,v) in self._keystate.iteritems() if v)
     
+    @property
+    def frame_time(self):
+        """The length in seconds of the last frame of key events.
+        
+        This is the time between the starts of the last two animation frames.  It is 0 
+        before the second frame.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a float >= 0."""
+        return self._frame_time
+    
+    @property
+    def key_events(self):
+        """The presses and releases of keys in the last frame, in the order they happened.
+        
+        Each event is a tuple (time,key,down), where time is the number of seconds from
+        the start of the frame (at most `frame_time`), key is the name of the key and
+        down is True for a press and False for a release.  A key repeat is not an event.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a tuple of (float,string,bool) tuples (possibly empty)"""
+        return self._frame_events
+    
     
     # BUILT-IN METHODS
     def __init__(self):
@@ -2419,6 +2800,13 @@ class GInput(object):
         
         self._keystate = {}
         self._keycount = 0
+        
+        self._events = []
+        self._held = set()
+        self._sampled = None
+        self._frame_time = 0.0
+        self._frame_events = ()
+        self._frame_start = frozenset()
     
     
     # PUBLIC METHODS
@@ -2438,6 +2826,38 @@ class GInput(object):
         """
         return key in self._keystate and self._keystate[key]
     
+    def was_key_down(self,key):
+        """**Returns**: True if the key was held down at the start of the last frame.
+        
+            :param key: the key to test
+            **Precondition**: Must be a string.
+        
+        Together with the attribute `key_events`, this gives the state of the key at
+        any time in the last frame."""
+        return key in self._frame_start
+    
+    def held_time(self,key):
+        """**Returns**: The number of seconds the key was held down in the last frame.
+        
+            :param key: the key to test
+            **Precondition**: Must be a string.
+        
+        A key pressed and released within a single frame still counts for the time it
+        was down, even though `is_key_down` never saw it.  The value is between 0 and 
+        `frame_time`."""
+        down = key in self._frame_start
+        last = 0.0
+        total = 0.0
+        for (time,k,pressed) in self._frame_events:
+            if k == key:
+                if down:
+                    total += time-last
+                down = pressed
+                last = time
+        if down:
+            total += self._frame_time-last
+        return total
+    
     def is_touch_down(self):
         """**Returns**: True if the mouse is currently held down.
         
@@ -2466,17 +2886,17 @@ class GInput(object):
         """Enables touch events for this input handler"""
         if self._view is None:
             return
-        self._view.bind(on_touch_down=self._capture_touch)
-        self._view.bind(on_touch_move=self._capture_touch)
-        self._view.bind(on_touch_up=self._release_touch)
+        self._view.widget.bind(on_touch_down=self._capture_touch)
+        self._view.widget.bind(on_touch_move=self._capture_touch)
+        self._view.widget.bind(on_touch_up=self._release_touch)
     
     def _disable_touch(self):
         """Disables touch events for this input handler"""
         if self._view is None:
             return
-        self._view.unbind(on_touch_down=self._capture_touch)
-        self._view.unbind(on_touch_move=self._capture_touch)
-        self._view.unbind(on_touch_up=self._release_touch)
+        self._view.widget.unbind(on_touch_down=self._capture_touch)
+        self._view.widget.unbind(on_touch_move=self._capture_touch)
+        self._view.widget.unbind(on_touch_up=self._release_touch)
         self._touch = None
     
     def _enable_keyboard(self):
@@ -2484,7 +2904,7 @@ class GInput(object):
         if self._view is None:
             return
         from kivy.core.window import Window
-        self._keyboard = Window.request_keyboard(self._disable_keyboard, self._view, 'text')
+        self._keyboard = Window.request_keyboard(self._disable_keyboard, self._view.widget, 'text')
         self._keyboard.bind(on_key_down=self._capture_key)
         self._keyboard.bind(on_key_up=self._release_key)
     
@@ -2495,6 +2915,8 @@ class GInput(object):
         self._keyboard.unbind(on_key_down=self._capture_key)
         self._keyboard.unbind(on_key_up=self._release_key)
         self._keyboard = None
+        for key in self.keys:
+            self._log_key(key,False)
         self._keystate = {}
         self._keycount = 0
     
@@ -2517,6 +2939,7 @@ class GInput(object):
         # Need to handle the case where a release was dropped
         if not k in self._keystate or not self._keystate[k]:
             self._keycount += 1
+            self._log_key(k,True)
         self._keystate[k] = True
         return True
     
@@ -2531,13 +2954,48 @@ class GInput(object):
         """
         self._keystate[keycode[1]] = False
         self._keycount -= 1
+        self._log_key(keycode[1],False)
         return True
     
+    def _log_key(self,key,down):
+        """Queues a press or release of a key, with the current time.
+        
+            :param key: the key pressed or released
+            **Precondition**: Must be a string
+        
+            :param down: True for a press, False for a release
+            **Precondition**: Must be a bool
+        """
+        self._events.append((_timer(),key,down))
+    
+    def _sample_keys(self):
+        """Drains the queue of key events into the frame that ends now.
+        
+        The new frame starts where the last one ended.  The time of each event is made
+        relative to the start of the frame.  This method is called by `GameApp` at the
+        start of each animation frame, before `update`.
+        """
+        now = _timer()
+        start = now if self._sampled is None else self._sampled
+        self._frame_time = now-start
+        self._frame_start = frozenset(self._held)
+        
+        events = []
+        for (time,key,down) in self._events:
+            events.append((min(max(time-start,0.0),self._frame_time),key,down))
+            if down:
+                self._held.add(key)
+            else:
+                self._held.discard(key)
+        self._frame_events = tuple(events)
+        self._events = []
+        self._sampled = now
+    
     def _capture_touch(self,view,touch):
         """Captures a the current mouse position if button is pressed.
         
-            :param view: reference to the view window
-            **Precondition**: Must be a GView.
+            :param view: reference to the widget of the view
+            **Precondition**: Must be the widget of a GView.
         
             :param touch: the information about the mouse press
             **Precondition**: Must be a TouchEvent
@@ -2548,8 +3006,8 @@ class GInput(object):
     def _release_touch(self,view,touch):
         """Releases a the current mouse position from memory.
         
-            :param view: reference to the view window
-            **Precondition**: Must be a GView.
+            :param view: reference to the widget of the view
+            **Precondition**: Must be the widget of a GView.
         
             :param touch: the information about the mouse release
             **Precondition**: Must be a TouchEvent
@@ -2557,13 +3015,20 @@ class GInput(object):
         self._touch = None
 
 
-class GView(FloatLayout):
+class GView(object):
     """Instances are a view class for a `GameApp` application.
     
     This is the class that you will use to draw shapes to the screen.  Simply pass your
     `GObject` instances to the `draw` method.  You must do this every animation frame,
     as the game is constantly clearing the window.
     
+    By default, the view is in retained mode (see the attribute `retained`).  It then
+    keeps a place in the Kivy canvas for each object drawn, and only touches the places
+    of the objects that changed.  The result on screen is the same; it is just faster.
+    
+    A view is not a Kivy widget itself.  It draws in the widget in the attribute `widget`,
+    which is made (and Kivy imported) when the view is made.
+    
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should 
     only use the one provided in the `input` attribute of `GameApp`. See the  class 
@@ -2579,48 +3044,650 @@ class GView(FloatLayout):
         window.  That functionality happens behind the scenes with hidden methods.  
         You should only use use the object provided in the `view` attribute  of 
         `GameApp`. See the class `GameApp` for more information."""
-        FloatLayout.__init__(self)
+        _load_kivy()
+        self._widget = FloatLayout()
         self._frame = InstructionGroup()
-        self.bind(pos=self._reset)
-        self.bind(size=self._reset)
+        self._retained = True
+        self._slots = {}
+        self._order = []
+        self._next  = []
+        self._widget.bind(pos=self._reset)
+        self._widget.bind(size=self._reset)
         self._reset()
     
     
+    # IMMUTABLE ATTRIBUTES
+    @property
+    def widget(self):
+        """The Kivy widget that shows this view.
+        
+        **Invariant**: Must be a FloatLayout."""
+        return self._widget
+    
+    @property
+    def width(self):
+        """The width of this view.
+        
+        **Invariant**: Must be an int or float >= 0."""
+        return self._widget.width
+    
+    @property
+    def height(self):
+        """The height of this view.
+        
+        **Invariant**: Must be an int or float >= 0."""
+        return self._widget.height
+    
+    
+    # MUTABLE ATTRIBUTES
+    @property
+    def retained(self):
+        """Whether this view keeps its drawing commands from one frame to the next.
+        
+        When this value is False, the view empties the Kivy canvas at the start of
+        every frame, and every call to `draw` adds the command to the canvas again.
+        
+        When this value is True, each object drawn is registered once, with its own
+        instruction group in the canvas (its slot).  The commands drawn in a frame are
+        only collected.  At the end of the frame, an object whose drawing cache was 
+        rebuilt (e.g. a new width or color) has its command swapped in its slot; every
+        other slot is left alone.  Changes that only move an object need no work at
+        all.  The slot of an object that was not drawn is removed, and an object drawn
+        for the first time (or out of its previous order) gets a slot at its place.
+        
+        **Invariant**: Must be a bool"""
+        return self._retained
+    
+    @retained.setter
+    def retained(self,value):
+        if _checking:
+            assert type(value) == bool, 'value %s is not a bool' % `value`
+        self._retained = value
+        self._frame.clear()
+        self._slots = {}
+        self._order = []
+        self._next  = []
+    
+    
     # PUBLIC METHODS
-    def draw(self,cmd):
+    def draw(self,cmd,owner=None):
         """Draws the given Kivy graphics command to this view.
         
             :param cmd: the command to draw
             **Precondition**: Must be a Kivy graphics command
         
+            :param owner: the object that drew the command (None for the command itself)
+            **Precondition**: Must be None or a `GObject`
+        
         You should never call this method, since you do not understand raw Kivy graphics
-        commands.  Instead, you should use the `draw` method in `GObject` instead."""
-        self._frame.add(cmd)
+        commands.  Instead, you should use the `draw` method in `GObject` instead.  In
+        retained mode, each owner has one slot in the canvas (see `retained`)."""
+        if self._retained:
+            self._next.append((cmd if owner is None else owner,cmd))
+        else:
+            self._frame.add(cmd)
     
     def clear(self):
         """Clears the contents of the view.
         
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another."""
-        self._frame.clear()
+        frame.  That way, you are not drawing images on top of one another.  In 
+        retained mode, the canvas is not touched until the end of the frame."""
+        if self._retained:
+            self._next = []
+        else:
+            self._frame.clear()
     
     
     # HIDDEN METHODS
+    def _flush(self):
+        """Updates the canvas with the commands drawn in this frame.
+        
+        This method is called for you automatically at the end of the animation frame.
+        It does nothing unless the view is in retained mode.  Only the slots of owners
+        that were added, removed, moved or that drew a new command are touched."""
+        if not self._retained:
+            return
+        
+        # Remove the slots of the owners not drawn in this frame
+        drawn = set(key for (key,cmd) in self._next)
+        for key in self._order:
+            if not key in drawn:
+                self._frame.remove(self._slots.pop(key)[0])
+        order = [key for key in self._order if key in drawn]
+        
+        pos = 0
+        for key, cmd in self._next:
+            if pos < len(order) and order[pos] is key:
+                entry = self._slots[key]
+            elif key in self._slots and order.index(key) < pos:
+                # Drawn twice in this frame; the first place wins
+                continue
+            else:
+                entry = self._slots.get(key)
+                if entry is None:
+                    entry = [InstructionGroup(),None]
+                    self._slots[key] = entry
+                else:
+                    order.remove(key)
+                    self._frame.remove(entry[0])
+                order.insert(pos,key)
+                self._frame.insert(pos,entry[0])
+            if entry[1] is not cmd:
+                entry[0].clear()
+                entry[0].add(cmd)
+                entry[1] = cmd
+            pos += 1
+        self._order = order
+        self._next = []
+    
     def _reset(self,obj=None,value=None):
         """Resets the view canvas in response to a resizing event"""
-        self.canvas.clear()
-        self.canvas.add(Color(1,1,1))
-        self.canvas.add(Rectangle(pos=self.pos,size=self.size))
+        canvas = self._widget.canvas
+        canvas.clear()
+        canvas.add(Color(1,1,1))
+        canvas.add(Rectangle(pos=self._widget.pos,size=self._widget.size))
         # Work-around for Retina Macs
-        self.canvas.add(Scale(dp(1),dp(1),dp(1)))
-        self.canvas.add(self._frame)
+        canvas.add(Scale(dp(1),dp(1),dp(1)))
+        canvas.add(self._frame)
+
+
+################# PROFILING #################
+pass 
+# #mark PROFILING
+
+class GProfiler(object):
+    """Instances record how long each phase of every animation frame takes.
+    
+    A `GameApp` made with the keyword `profile=True` has a profiler in its attribute
+    `profiler`.  It times the phases of each frame (clearing the view, `update`, 
+    `draw` and flushing the view) and stores them in a ring buffer of the last `size` 
+    frames.  Use the method `dump` to save the ring buffer as a CSV file.
+    
+    The profiler can also time a section of `update` or `draw` (such as the physics),
+    with the methods `enter` and `leave`, and it counts the calls to `contains` and 
+    `_reset` on a `GObject`, as well as any collision tests reported with `count`.
+    Only the profiler in `GProfiler.current` counts; code outside of this module can
+    report an event with
+    
+        if GProfiler.current is not None:
+            GProfiler.current.count('collisions')
+    
+    Pressing the key `key` (F3 by default) shows or hides an overlay in the top left 
+    corner of the view.  The overlay shows the averages of the last half second, and
+    its text is only changed twice a second.  Nothing else is allocated per frame.
+    
+    The columns of the ring buffer are the frame time `dt` (in seconds), the time of 
+    each phase and section (in seconds), the total time of the frame and the counters."""
+    
+    #: the profiler that counts events, or None if events are not counted
+    current = None
+    
+    #: the phases of each frame, in order
+    PHASES   = ('clear','update','draw','flush')
+    #: the sections that can be timed with `enter` and `leave`
+    SECTIONS = ('physics',)
+    #: the events that are counted
+    COUNTERS = ('contains','reset','collisions')
+    #: the columns of the ring buffer
+    COLUMNS  = ('dt',)+PHASES+SECTIONS+('frame',)+COUNTERS
+    
+    # MUTABLE ATTRIBUTES
+    @property
+    def visible(self):
+        """Whether the overlay is shown.
+        
+        **Invariant**: Must be a bool."""
+        return self._visible
+    
+    @visible.setter
+    def visible(self,value):
+        if _checking:
+            assert type(value) == bool, 'value %s is not a bool' % `value`
+        self._visible = value
+        self._shown = 0
+    
+    @property
+    def key(self):
+        """The key that shows or hides the overlay.
+        
+        **Invariant**: Must be a string."""
+        return self._key
+    
+    @key.setter
+    def key(self,value):
+        if _checking:
+            assert type(value) == str, 'value %s is not a string' % `value`
+        self._key = value
+    
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """The number of frames in the ring buffer.
+        
+        **Invariant**: Must be an int > 0."""
+        return self._samples.shape[0]
+    
+    @property
+    def frames(self):
+        """The number of frames recorded so far (including those no longer stored).
+        
+        **Invariant**: Must be an int >= 0."""
+        return self._frames
+    
+    
+    # BUILT-IN METHODS
+    def __init__(self,size=600):
+        """**Constructor**: Creates a new profiler with an empty ring buffer.
+        
+            :param size: the number of frames to store (default 600)
+            **Precondition**: an int > 0"""
+        if _checking:
+            assert type(size) == int and size > 0, 'size %s is not a positive int' % `size`
+        self._samples = np.zeros((size,len(self.COLUMNS)))
+        self._column  = dict((name,i) for (i,name) in enumerate(self.COLUMNS))
+        self._frames  = 0
+        self._row     = 0
+        self._begin   = 0.0
+        self._mark    = 0.0
+        self._entered = dict.fromkeys(self.SECTIONS,0.0)
+        self._counts  = dict.fromkeys(self.COUNTERS,0)
+        self._key     = 'f3'
+        self._pressed = False
+        self._visible = False
+        self._shown   = 0
+        self._lastText = 0.0
+        self._label   = None
+    
+    
+    # PUBLIC METHODS
+    def begin(self,dt):
+        """Starts recording a new frame.
+        
+            :param dt: time in seconds since the last frame
+            **Precondition**: a number (int or float)"""
+        self._row = self._frames % self.size
+        self._samples[self._row] = 0
+        self._samples[self._row,0] = dt
+        self._begin = _timer()
+        self._mark = self._begin
+    
+    def mark(self,phase):
+        """Records that the given phase of the frame ended now.
+        
+        The phase started when the previous phase ended (or when the frame began).
+        
+            :param phase: the phase that ended
+            **Precondition**: a string in `PHASES`"""
+        now = _timer()
+        self._samples[self._row,self._column[phase]] = now-self._mark
+        self._mark = now
+    
+    def enter(self,section):
+        """Starts timing the given section.
+        
+            :param section: the section to time
+            **Precondition**: a string in `SECTIONS`"""
+        self._entered[section] = _timer()
+    
+    def leave(self,section):
+        """Stops timing the given section, adding the time since `enter` to the frame.
+        
+            :param section: the section to time
+            **Precondition**: a string in `SECTIONS`, entered but not left"""
+        self._samples[self._row,self._column[section]] += _timer()-self._entered[section]
+    
+    def count(self,counter,n=1):
+        """Adds n events to the given counter.
+        
+            :param counter: the event to count
+            **Precondition**: a string in `COUNTERS`
+            
+            :param n: the number of events (default 1)
+            **Precondition**: an int >= 0"""
+        self._counts[counter] += n
+    
+    def end(self):
+        """Finishes recording the frame, with the counts since the last frame."""
+        row = self._samples[self._row]
+        row[self._column['frame']] = _timer()-self._begin
+        for name in self.COUNTERS:
+            row[self._column[name]] = self._counts[name]
+            self._counts[name] = 0
+        self._frames += 1
+    
+    def poll(self,input):
+        """Shows or hides the overlay when the key `key` is pressed.
+        
+            :param input: the input of the game
+            **Precondition**: a `GInput`"""
+        down = input.is_key_down(self._key)
+        if down and not self._pressed:
+            self.visible = not self._visible
+        self._pressed = down
+    
+    def samples(self):
+        """**Returns**: the recorded frames, oldest first, as a 2D numpy array.
+        
+        Each row is a frame and each column is one of `COLUMNS`."""
+        if self._frames <= self.size:
+            return self._samples[:self._frames].copy()
+        start = self._frames % self.size
+        return np.concatenate((self._samples[start:],self._samples[:start]))
+    
+    def dump(self,filename):
+        """Saves the recorded frames (oldest first) as a CSV file.
+        
+        The first line has the names of the columns.  Times are in seconds.
+        
+            :param filename: the file to write
+            **Precondition**: a string naming a file that can be written"""
+        with open(filename,'w') as file:
+            file.write(','.join(self.COLUMNS)+'\n')
+            for row in self.samples():
+                file.write(','.join(repr(float(x)) for x in row)+'\n')
+    
+    def draw(self,view):
+        """Draws the overlay (if it is visible) in the top left corner of the view.
+        
+            :param view: the view to draw to
+            **Precondition**: a `GView`"""
+        if not self._visible:
+            return
+        if self._label is None:
+            # The text changes every half second, so it is kept out of the label cache
+            self._label = GLabel(text=' ',font_size=12,halign='left',valign='top',
+                                 linecolor=(0,0,0,1),fillcolor=(1,1,1,0.8),cached=False)
+        now = _timer()
+        if self._shown == 0 or now-self._lastText >= 0.5:
+            self._label.text = self._summary(self._frames-self._shown)
+            self._label.left = 0
+            self._label.top  = view.height
+            self._shown = self._frames
+            self._lastText = now
+        self._label.draw(view)
+    
+    
+    # HIDDEN METHODS
+    def _summary(self,n):
+        """**Returns**: the text of the overlay for the last n frames.
+        
+            :param n: the number of frames
+            **Precondition**: an int >= 0"""
+        n = min(max(n,1),self._frames,self.size)
+        if n == 0:
+            return 'no frames yet'
+        rows = (self._frames-1-np.arange(n)) % self.size
+        means = self._samples[rows].mean(axis=0)
+        col = self._column
+        lines = ['%5.1f fps' % (1.0/means[col['dt']] if means[col['dt']] > 0 else 0)]
+        for name in self.PHASES+self.SECTIONS+('frame',):
+            lines.append('%-8s %6.2f ms' % (name,1000*means[col[name]]))
+        for name in self.COUNTERS:
+            lines.append('%-10s %6d' % (name,means[col[name]]))
+        return '\n'.join(lines)
+
+
+################# ASSET LOADING #################
+pass 
+# #mark ASSET LOADING
+
+class GPreloader(object):
+    """Instances load the images, fonts and sounds of a game in the background.
+    
+    A preloader finds every file in **Images**, **Fonts** and **Sounds** and loads them
+    in a pool of `threads` threads.  The threads only do the work that does not need
+    the graphics context: decoding an image, reading a font file, and loading a sound 
+    (with the number of voices of the shared `SoundLibrary`).  The method `poll`, which
+    must be called from the main thread, then publishes the finished assets:
+    
+    * the texture of an image goes into `GImage.textures`, which `GImage` reads first;
+    * a sound goes into `SoundLibrary.shared()`, with its file name as the key;
+    * each text added with `add_text` is rendered into `GLabel.cache`, once every
+      asset is published.
+    
+    A `GameApp` made with `preload=True` (the default) starts a preloader right after
+    `start` and polls it once per frame, for at most `budget` seconds per frame, until
+    it is `done`.  An asset that is not published yet (or that failed to load) is 
+    simply loaded when it is first used, as it is without a preloader."""
+    
+    #: the file extensions of the images that are loaded
+    IMAGE_TYPES = ('.png','.jpg','.jpeg','.gif','.bmp')
+    #: the file extensions of the fonts that are loaded
+    FONT_TYPES  = ('.ttf','.otf')
+    #: the file extensions of the sounds that are loaded
+    SOUND_TYPES = ('.wav','.ogg','.mp3')
+    
+    # MUTABLE PROPERTIES
+    @property
+    def budget(self):
+        """The most time (in seconds) that `poll` spends publishing assets per call.
+        
+        `poll` always publishes at least one finished asset, even if it takes longer.
+        
+        **Invariant**: Must be a float > 0."""
+        return self._budget
+    
+    @budget.setter
+    def budget(self,value):
+        if _checking:
+            assert type(value) in _NUMS and value > 0, 'value %s is not a valid budget' % `value`
+        self._budget = float(value)
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def total(self):
+        """The number of assets (and texts) to publish.
+        
+        **Invariant**: Must be an int >= 0."""
+        return len(self._assets)+len(self._texts)
+    
+    @property
+    def loaded(self):
+        """The number of assets (and texts) published so far, including failures.
+        
+        **Invariant**: Must be an int >= 0."""
+        return self._loaded
+    
+    @property
+    def failed(self):
+        """The names of the files that could not be loaded.
+        
+        **Invariant**: Must be a list of strings."""
+        return list(self._failed)
+    
+    @property
+    def done(self):
+        """Whether every asset (and text) is published.
+        
+        **Invariant**: Must be a bool."""
+        return self._started and self._loaded == self.total
+    
+    # BUILT-IN METHODS
+    def __init__(self,threads=4,budget=0.004):
+        """**Constructor**: Creates a new preloader for every asset of the game.
+        
+        Nothing is loaded until the method `start` is called.
+        
+            :param threads: the number of loading threads
+            **Precondition**: an int > 0
+        
+            :param budget: the most time (in seconds) to publish assets per `poll`
+            **Precondition**: a number > 0"""
+        if _checking:
+            assert type(threads) == int and threads > 0, 'threads %s is not a positive int' % `threads`
+        self.budget   = budget
+        self._threads = threads
+        self._assets  = ([('image',name) for name in self._find(IMAGE_PATH,self.IMAGE_TYPES)]+
+                         [('font', name) for name in self._find(FONT_PATH, self.FONT_TYPES)]+
+                         [('sound',name) for name in self._find(SOUND_PATH,self.SOUND_TYPES)])
+        self._texts   = []
+        self._ready   = Queue.Queue()
+        self._pool    = None
+        self._started = False
+        self._loaded  = 0
+        self._failed  = []
+    
+    # PUBLIC METHODS
+    def add_text(self,text,font_name=None,font_size=None,bold=False):
+        """Adds a text to render into `GLabel.cache` once the assets are published.
+        
+        Add the texts of the labels that a game shows right after it starts, so that
+        making those labels does not render any text.  Texts must be added before
+        `start` is called.
+        
+            :param text: the text to render
+            **Precondition**: a string
+        
+            :param font_name: the font of the text (None for the `GLabel` default)
+            **Precondition**: None or the name of a font file
+        
+            :param font_size: the size of the text (None for the `GLabel` default)
+            **Precondition**: None or a number > 0
+        
+            :param bold: whether the text is bold
+            **Precondition**: a bool"""
+        assert not self._started, 'texts must be added before the preloader starts'
+        keywords = {'text':text,'bold':bold}
+        if font_name is not None:
+            keywords['font_name'] = font_name
+        if font_size is not None:
+            keywords['font_size'] = font_size
+        self._texts.append(keywords)
+    
+    def start(self):
+        """Starts loading every asset in the background.
+        
+        The sounds are loaded with the number of voices that `SoundLibrary.shared()`
+        has now."""
+        assert not self._started, 'the preloader has already started'
+        _load_kivy()
+        self._started = True
+        if not self._assets:
+            return
+        voices = SoundLibrary.shared().voices
+        self._pool = ThreadPool(min(self._threads,len(self._assets)))
+        for (kind,name) in self._assets:
+            self._pool.apply_async(_load_asset,(kind,name,voices),callback=self._ready.put)
+        self._pool.close()
+    
+    def poll(self):
+        """Publishes the assets that have finished loading, for at most `budget` seconds.
+        
+        This method must be called from the main thread.  It does nothing once the
+        preloader is `done`."""
+        if not self._started or self.done:
+            return
+        begin = _timer()
+        published = 0
+        while published == 0 or _timer()-begin < self._budget:
+            if self._loaded < len(self._assets):
+                try:
+                    result = self._ready.get_nowait()
+                except Queue.Empty:
+                    return
+                self._publish(*result)
+            elif self._loaded < self.total:
+                GLabel(**self._texts[self._loaded-len(self._assets)])
+                self._loaded += 1
+            else:
+                break
+            published += 1
+        if self._loaded == len(self._assets) and self._pool is not None:
+            self._pool.join()
+            self._pool = None
+    
+    # HIDDEN METHODS
+    def _find(self,path,types):
+        """**Returns**: The sorted names of the files in path with one of the types.
+        
+            :param path: the directory to search
+            **Precondition**: a string
+        
+            :param types: the file extensions to find
+            **Precondition**: a tuple of lower case strings"""
+        return sorted(name for name in _listing(path)
+                      if os.path.splitext(name)[1].lower() in types)
+    
+    def _publish(self,kind,name,value):
+        """Publishes a loaded asset into the cache that reads it.
+        
+            :param kind: the kind of asset
+            **Precondition**: 'image', 'font' or 'sound'
+        
+            :param name: the file name of the asset
+            **Precondition**: a string
+        
+            :param value: the loaded asset (None if it failed to load)
+            **Precondition**: the value returned by `_load_asset`"""
+        self._loaded += 1
+        if value is None:
+            self._failed.append(name)
+        elif kind == 'image':
+            GImage.textures[name] = value.texture
+        elif kind == 'sound':
+            sounds = SoundLibrary.shared()
+            if name not in sounds:
+                sounds[name] = value
+
+
+def _load_asset(kind,name,voices):
+    """**Returns**: The tuple (kind, name, asset) for an asset loaded from its file.
+    
+    This is the work done by a loading thread of `GPreloader`.  An image is decoded
+    (but has no texture yet), a font file is read into memory (so that it is in the
+    file cache when the text provider opens it) and a sound is loaded with all of its
+    voices.  An asset in the bundle in use is read from the bundle (a font is
+    extracted from it instead of read).  The asset is None if it could not be loaded.
+    
+        :param kind: the kind of asset
+        **Precondition**: 'image', 'font' or 'sound'
+    
+        :param name: the file name of the asset
+        **Precondition**: a string
+    
+        :param voices: the number of voices of a sound
+        **Precondition**: an int > 0"""
+    try:
+        if kind == 'image':
+            image = _bundle_image(name)
+            if image is None:
+                image = ImageLoader.load(os.path.join(IMAGE_PATH,name))
+            return (kind,name,image)
+        elif kind == 'font':
+            if _resource_file(FONT_PATH,name) == name:
+                with open(os.path.join(FONT_PATH,name),'rb') as file:
+                    file.read()
+            return (kind,name,name)
+        return (kind,name,Sound(name,voices))
+    except Exception:
+        return (kind,name,None)
+
+
+def _bundle_image(name):
+    """**Returns**: The image file name decoded from the bundle in use (None if it is not there)
+    
+    The image is read from the memory map of the bundle, so its file is never opened.
+    The Kivy image loaders only read from a file object, so the contents of the image
+    are copied once, into a BytesIO, before they are decoded.  It is a Kivy core
+    image, whose texture is only made when its attribute `texture` is read (which
+    must be done from the main thread).
+    
+        :param name: the file name of the image
+        **Precondition**: a string"""
+    bundle = get_bundle()
+    if bundle is None or not bundle.has(IMAGE_PATH,name):
+        return None
+    ext = os.path.splitext(name)[1][1:].lower()
+    return CoreImage(io.BytesIO(bundle.data(IMAGE_PATH,name)),ext=ext,filename=name)
 
 
 ################# PRIMARY APP CLASS #################
 pass 
 # #mark PRIMARY APP CLASS
 
-class GameApp(kivy.app.App):
+class GameApp(object):
     """Instances are a controller class for a simple game application.
     
     This is the primary class for creating a game.  To implement a game, you subclass
@@ -2637,6 +3704,9 @@ class GameApp(kivy.app.App):
     
     **draw**: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to `self.view.draw()`.
+    
+    A game is not a Kivy application itself.  It makes one (importing Kivy) when it is
+    made, and hands it the view to show and the frames to animate.
     """
     
     # MUTABLE ATTRIBUTES
@@ -2653,8 +3723,9 @@ class GameApp(kivy.app.App):
     
     @fps.setter
     def fps(self,value):
-        assert _is_num(value), 'value %s is not a number' % `value`
-        assert value > 0, 'value %s is not positive' % `value`
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+            assert value > 0, 'value %s is not positive' % `value`
         Clock.unschedule(self._refresh)
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
@@ -2695,6 +3766,24 @@ class GameApp(kivy.app.App):
         **Invariant**: Must be instance of GInput."""
         return self._input
     
+    @property
+    def profiler(self):
+        """The frame profiler, or None if the game is not profiled.
+        
+        See the class `GProfiler` for more information.
+        
+        **Invariant**: Must be instance of GProfiler or None."""
+        return self._profiler
+    
+    @property
+    def preloader(self):
+        """The asset preloader, or None if the game does not preload its assets.
+        
+        See the class `GPreloader` for more information.
+        
+        **Invariant**: Must be instance of GPreloader or None."""
+        return self._preloader
+    
     
     # BUILT-IN METHODS
     def __init__(self,**keywords):
@@ -2713,53 +3802,76 @@ class GameApp(kivy.app.App):
         The game window will not show until you start the game. To start the game, use 
         the method `run()`.
         
+        The keyword `retained` (True by default) sets the attribute `retained` of the 
+        view.  See the class `GView` for more information.
+        
+        The keyword `profile` (False by default) makes a `GProfiler` that times every
+        frame.  See the attribute `profiler` for more information.
+        
+        The keyword `preload` (True by default) makes a `GPreloader` that loads the 
+        images, fonts and sounds in the background, starting right after `start`.  
+        See the attribute `preloader` for more information.
+        
         **You will never call the constructor or `run` yourself.  That is handled for 
         you in the provided code."""
         w = keywords['width']  if  'width' in keywords else 0.0
         h = keywords['height'] if 'height' in keywords else 0.0
         f = keywords['fps']    if 'fps'    in keywords else 60.0
-
-        assert _is_num(w), 'width %s is not a number' % `w`
-        assert _is_num(h), 'height %s is not a number' % `h`
-        assert _is_num(f), 'fps %s is not a number' % `value`
-        assert f > 0, 'fps %s is not positive' % `value`
+        r = keywords['retained'] if 'retained' in keywords else True
+        p = keywords['profile'] if 'profile' in keywords else False
+        l = keywords['preload'] if 'preload' in keywords else True
+
+        if _checking:
+            assert type(w) in _NUMS, 'width %s is not a number' % `w`
+            assert type(h) in _NUMS, 'height %s is not a number' % `h`
+            assert type(f) in _NUMS, 'fps %s is not a number' % `value`
+            assert f > 0, 'fps %s is not positive' % `value`
+            assert type(r) == bool, 'retained %s is not a bool' % `r`
+            assert type(p) == bool, 'profile %s is not a bool' % `p`
+            assert type(l) == bool, 'preload %s is not a bool' % `l`
+        _load_kivy()
 
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self._retained = r
+        self._profiler = GProfiler() if p else None
+        GProfiler.current = self._profiler
+        self._preloader = GPreloader() if l else None
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
         
-        # Tell Kivy to build the application
-        kivy.app.App.__init__(self,**keywords)
+        # Make the Kivy application, which builds the window with this game's view
+        self._app = kivy.app.App(**keywords)
+        self._app.title = self.__class__.__name__
+        self._app.build = self.build
     
     
     # PUBLIC METHODS
     def build(self):
         """Initializes the graphics window.
         
-        This is a Kivy reserved method.  It is part of the Kivy application process.  
-        It should **never** be overridden."""
+        The Kivy application calls this method when it starts, and shows the widget 
+        that it returns.  It should **never** be overridden."""
         self._view = GView()
-        self._view.size_hint = (1,1)
+        self._view.widget.size_hint = (1,1)
+        self._view.retained = self._retained
         self._input = GInput()
         self._input._register(self._view)
-        return self.view
+        return self.view.widget
     
     def run(self):
         """Displays the game window and start the game.
         
-        This is a Kivy reserved method.  It is part of the Kivy application process.  
-        It should **never** be overridden."""
+        This method runs the Kivy application.  It should **never** be overridden."""
         Clock.schedule_once(self._bootstrap,-1)
-        kivy.app.App.run(self)
+        self._app.run()
     
     def stop(self):
         """Closes the game window and exit Python.
         
-        This is a Kivy reserved method.  It is part of the Kivy application process.  
-        It should **never** be overridden."""
-        kivy.app.App.stop(self)
+        This method stops the Kivy application.  It should **never** be overridden."""
+        self._app.stop()
         sys.exit(0)
     
     def start(self):
@@ -2801,9 +3913,12 @@ class GameApp(kivy.app.App):
         """Bootstraps the clock scheduler for the game..
         
         This method is a callback-proxy for method `start`.  It handles important issues 
-        behind the scenes, particularly with setting the FPS"""
+        behind the scenes, particularly with setting the FPS.  It also starts the
+        preloader, after `start` (so that `start` can add texts to it)."""
         Clock.schedule_interval(self._refresh,1.0/self.fps)
         self.start()
+        if self._preloader is not None:
+            self._preloader.start()
     
     def _refresh(self,dt):
         """Processes a single animation frame.
@@ -2812,9 +3927,33 @@ class GameApp(kivy.app.App):
             **Precondition**: a number (int or float)
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window."""
+        important issues behind the scenes, particularly with clearing the window.
+        
+        If the game is profiled, each phase of the frame is timed.  Until the preloader 
+        is done, it publishes assets before each frame.  The key events of the input
+        are sampled before each frame (see `GInput`)."""
+        self._input._sample_keys()
+        if self._preloader is not None and not self._preloader.done:
+            self._preloader.poll()
+        profiler = self._profiler
+        if profiler is None:
+            self.view.clear()
+            self.update(dt)
+            self.draw()
+            self.view._flush()
+            return
+        
+        profiler.begin(dt)
         self.view.clear()
+        profiler.mark('clear')
         self.update(dt)
+        profiler.mark('update')
         self.draw()
+        profiler.draw(self.view)
+        profiler.mark('draw')
+        self.view._flush()
+        profiler.mark('flush')
+        profiler.end()
+        profiler.poll(self.input)
     
     
@@ -0,0 +1,923 @@
+# gcore.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Kivy-free core of the module game2d
+
+This module contains the parts of game2d that do not need Kivy: the folders of the
+fonts, sounds and images (each listed once, see refresh_resources), the functions that
+check the arguments of the game2d classes (and the validation modes that switch them),
+the asset bundles (a single file that packs all of those folders, see GBundle), and the
+geometry classes GPoint and GMatrix.  It only needs numpy and colormodel, so it imports
+quickly.  The module game2d imports everything in this module, so a game never needs to
+import it directly.  Code that only needs the geometry (such as the headless
+simulations) can import it without importing Kivy."""
+import os, os.path
+import hashlib
+import mmap
+import struct
+import tempfile
+import numpy as np
+import colormodel
+
+# User-defined resources
+FONT_PATH  = str(os.path.join(os.path.dirname(__file__), 'Fonts'))
+SOUND_PATH = str(os.path.join(os.path.dirname(__file__), 'Sounds'))
+IMAGE_PATH = str(os.path.join(os.path.dirname(__file__), 'Images'))
+
+#: the set of file names in each resource folder, by folder (see _listing)
+_manifest = {}
+
+
+################# TYPING HELPER FUNCTIONS #################
+pass
+# #mark TYPING HELPER FUNCTIONS
+
+def  _same_side(p1, p2, a, b):
+    """Returns: True if p1, p2 are on the same side of segment ba.
+    
+    Parameter p1: A point
+    Precondition: p1 is a 2-element sequence of numbers (int or float)
+    
+    Parameter p2: A point
+    Precondition: p2 is a 2-element sequence of numbers (int or float)
+    
+    Parameter a: One end of a line segment
+    Precondition: a is a 2-element sequence of numbers (int or float)
+    
+    Parameter b: Another end of a line segment
+    Precondition: b is a 2-element sequence of numbers (int or float)
+    """
+    ba = np.append(np.subtract(b,a),[0])
+    cp1 = np.cross(ba,np.subtract(p1,a))
+    cp2 = np.cross(ba,np.subtract(p2,a))
+    return np.dot(cp1,cp2) >= 0
+
+
+def _in_triangle(p, t):
+    """Returns: True if p is in triangle t
+    
+    Parameter p: A point
+    Precondition: p is a 2-element sequence of numbers (int or float)
+
+    Parameter t: A triangle (defined by 3 vertices)
+    Precondition: t is a 6-element sequence of numbers (int or float)
+    """
+    return (_same_side(p, t[0:2], t[2:4], t[4:6]) and
+            _same_side(p, t[2:4], t[0:2], t[4:6]) and
+            _same_side(p, t[4:6], t[0:2], t[2:4]))
+
+
+def _is_num(x):
+    """Returns: True if x is an int or float; False otherwise.
+    
+    Parameter x: The value to test
+    Precondition: NONE"""
+    return type(x) in [int,float]
+
+
+def _is_num_tuple(t,size):
+    """Returns: True if t is a sequence of numbers; False otherwise.
+    
+    If the sequence is not of the given size, it also returns False.
+    
+    Parameter t: The value to test
+    Precondition: NONE
+    
+    Parameter size: The size of the sequence
+    Precondition: size is an int >= 0
+    """
+    try:
+        return len(t) == size and reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
+
+    except:
+        return False
+
+
+def _is_point_tuple(t,msize):
+    """Returns: True if t is a point sequence (i.e. even sequence of numbers)
+    
+    The point tuple must be size greater than msize, or the function returns False.
+    
+    Parameter t: The value to test
+    Precondition: NONE
+    
+    Parameter msize: The minimum size of the sequence
+    Precondition: msize is an int >= 0
+    """
+    try:
+        return len(t) % 2 == 0 and len(t) > msize and \
+            reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
+    except:
+        return False
+
+
+def _is_color(c):
+    """Returns: True if c represents a color
+    
+    As with Turtles, colors may be colormodel objects or strings.  They may also
+    be sequences of 3 or 4 elements.  In the case of the latter, the elements
+    of the sequence must all be in the range 0..1.
+    
+    Parameter c: The value to test
+    Precondition: NONE
+    """
+    if type(c) in [colormodel.RGB, colormodel.HSV]:
+        return True
+    
+    if type(c) in [tuple, list] and 3 <= len(c) <= 4:
+        return reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float] and 0 <= z <= 1, c))
+    
+    return type(c) == str and c in colormodel._TK_COLOR_MAP
+
+
+def _in_folder(path,name):
+    """Returns: True if there is a file name in the folder path
+    
+    The files in a folder are only listed once (see `_listing`), so this is a lookup
+    in a set.  Only a name with a folder in it (such as 'icons/sound.png'), or a name
+    that is not in the listing, is looked for on disk.  The lookup in the set is case
+    sensitive, so the disk is what matches a name in another case on a file system
+    that ignores case (as on macOS and Windows).
+    
+    Parameter path: A resource folder
+    Precondition: path is a string
+    
+    Parameter name: A file name
+    Precondition: name is a string"""
+    if '/' in name or os.sep in name:
+        return os.path.exists(path+'/'+name)
+    return name in _listing(path) or os.path.exists(path+'/'+name)
+
+
+def _listing(path):
+    """Returns: the set of the names of the files in the folder path
+    
+    The folder is listed the first time, and the listing is remembered until
+    `refresh_resources` is called.  A folder that does not exist has no files.  The
+    files of the folder in the bundle in use (see `use_bundle`) are included.
+    
+    Parameter path: A resource folder
+    Precondition: path is a string"""
+    files = _manifest.get(path)
+    if files is None:
+        files = frozenset(os.listdir(path)) if os.path.isdir(path) else frozenset()
+        if _bundle is not None:
+            files |= _bundle.names(path)
+        _manifest[path] = files
+    return files
+
+
+def refresh_resources():
+    """Forgets the listings of the resource folders.
+    
+    The checks for image, font and sound files list each folder once, and then only
+    look at that listing.  Call this function after adding or removing a file in
+    **Images**, **Fonts** or **Sounds** while the program is running, so that the
+    folders are listed again."""
+    _manifest.clear()
+
+
+def _is_image_file(name):
+    """Returns: True if name is the name of an image file
+    
+    Parameter name: A file name
+    Precondition: NONE"""
+    if type(name) != str:
+        return False
+    
+    return _in_folder(IMAGE_PATH,name)
+
+
+def _is_font_file(name):
+    """Returns: True if name is the name of an font file
+    
+    Parameter name: A file name
+    Precondition: NONE"""
+    if type(name) != str:
+        return False
+    
+    return _in_folder(FONT_PATH,name)
+
+
+def _is_sound_file(name):
+    """Returns: True if name is the name of an font file.
+    
+    Parameter name: A file name
+    Precondition: NONE"""
+    if type(name) != str:
+        return False
+    
+    return _in_folder(SOUND_PATH,name)
+
+
+def _gl_color(c):
+    """Returns: the color c as a 4-element list of floats between 0 and 1.
+    
+    Parameter c: The color to convert
+    Precondition: c represents a color (see `_is_color`)
+    """
+    if type(c) in [tuple, list] and len(c) == 3:
+        return list(c)+[1.0]
+    elif type(c) in [colormodel.RGB, colormodel.HSV]:
+        return c.glColor()
+    elif type(c) == str:
+        if c[0] == '#':
+            return colormodel.RGB.CreateWebColor(c).glColor()
+        else:
+            return colormodel.RGB.CreateName(c).glColor()
+    return list(c)
+
+
+################# VALIDATION MODES #################
+pass
+# #mark VALIDATION MODES
+
+#: the validation modes, from the most to the least careful
+VALIDATION_MODES = ('strict','fast','off')
+
+def _fast_is_num_tuple(t,size):
+    """Returns: True if t is a sequence of the given size; False otherwise.
+    
+    This is the check of `_is_num_tuple` in the mode 'fast'.  It does not check the
+    elements of the sequence.
+    
+    Parameter t: The value to test
+    Precondition: NONE
+    
+    Parameter size: The size of the sequence
+    Precondition: size is an int >= 0
+    """
+    return type(t) in _SEQUENCE_TYPES and len(t) == size
+
+
+def _fast_is_point_tuple(t,msize):
+    """Returns: True if t is a sequence of even size greater than msize
+    
+    This is the check of `_is_point_tuple` in the mode 'fast'.  It does not check 
+    the elements of the sequence.
+    
+    Parameter t: The value to test
+    Precondition: NONE
+    
+    Parameter msize: The minimum size of the sequence
+    Precondition: msize is an int >= 0
+    """
+    return type(t) in _SEQUENCE_TYPES and len(t) % 2 == 0 and len(t) > msize
+
+
+def _fast_is_color(c):
+    """Returns: True if c has one of the types of a color
+    
+    This is the check of `_is_color` in the mode 'fast'.  It does not check the
+    elements of a sequence, nor the name of a color.
+    
+    Parameter c: The value to test
+    Precondition: NONE
+    """
+    return type(c) in _COLOR_TYPES
+
+
+def _fast_is_file(name):
+    """Returns: True if name is a string
+    
+    This is the check of `_is_image_file`, `_is_font_file` and `_is_sound_file` in the
+    mode 'fast'.  It does not look for the file (which takes a system call).
+    
+    Parameter name: A file name
+    Precondition: NONE"""
+    return type(name) == str
+
+
+#: the types of a number; the setters check `type(value) in _NUMS` inline, as a call
+#: to `_is_num` costs more than the test itself
+_NUMS = (int, float)
+#: the types of a sequence accepted by the fast checks
+_SEQUENCE_TYPES = (tuple, list, np.ndarray)
+#: the types of a color accepted by the fast checks
+_COLOR_TYPES = (tuple, list, str, colormodel.RGB, colormodel.HSV)
+
+#: the names of the checks that depend on the validation mode
+_CHECKS = ('_is_num_tuple','_is_point_tuple','_is_color',
+           '_is_image_file','_is_font_file','_is_sound_file')
+#: the checks (in the order of _CHECKS) of each validation mode; the mode 'off' skips
+#: the asserts (see _checking), so its checks are never called
+_MODES = {'strict': (_is_num_tuple, _is_point_tuple, _is_color,
+                     _is_image_file, _is_font_file, _is_sound_file),
+          'fast':   (_fast_is_num_tuple, _fast_is_point_tuple, _fast_is_color,
+                     _fast_is_file, _fast_is_file, _fast_is_file)}
+_MODES['off'] = _MODES['fast']
+#: the current validation mode
+_validation = 'strict'
+#: False if the validation mode is 'off'; every assert on a value is behind a test of
+#: this flag, so that the mode 'off' costs a single test per setter
+_checking = True
+
+
+def get_validation():
+    """Returns: the current validation mode ('strict', 'fast' or 'off')."""
+    return _validation
+
+
+def set_validation(mode):
+    """Sets how carefully the attributes of the game2d classes are checked.
+    
+    Every setter (and constructor) of a game2d class asserts that its value is valid,
+    using the checks in this module.  This function replaces those checks:
+        
+        'strict'  checks every value fully (the default, for development)
+        'fast'    only checks the type of a value, which is much cheaper for a 
+                  sequence or a color, and never looks for a file
+        'off'     does not check anything (for a game that is known to work)
+    
+    A number is checked inline (its type is in _NUMS) in the modes 'strict' and 'fast'.
+    In the mode 'off', the asserts are skipped by the flag _checking.  The asserts
+    themselves are removed by running Python with the option -O.  Call the function
+    of the same name in game2d (not this one) to switch the checks of both modules.
+    
+    Parameter mode: The new validation mode
+    Precondition: mode is one of VALIDATION_MODES"""
+    global _validation, _checking, _is_num_tuple, _is_point_tuple, _is_color
+    global _is_image_file, _is_font_file, _is_sound_file
+    assert mode in VALIDATION_MODES, 'mode %s is not a validation mode' % `mode`
+    (_is_num_tuple, _is_point_tuple, _is_color,
+     _is_image_file, _is_font_file, _is_sound_file) = _MODES[mode]
+    _checking = mode != 'off'
+    _validation = mode
+
+
+################# ASSET BUNDLES #################
+pass
+# #mark ASSET BUNDLES
+
+#: the resource folders that are packed into a bundle
+BUNDLE_FOLDERS = (FONT_PATH, IMAGE_PATH, SOUND_PATH)
+#: the alignment (in bytes) of each file in a bundle
+BUNDLE_ALIGNMENT = 64
+
+# The header at the start of a bundle
+_BUNDLE_HEADER  = struct.Struct('<8sBI20s')
+_BUNDLE_MAGIC   = 'G2DASSET'
+_BUNDLE_VERSION = 1
+# Each entry of the index: the offset and size of the file, and the size of its name
+_BUNDLE_ENTRY   = struct.Struct('<QQH')
+
+#: the bundle that the resource checks and the game2d classes read, or None
+_bundle = None
+
+
+class GBundle(object):
+    """Instances are a bundle of assets, mapped into memory.
+    
+    A bundle is a single file that holds every file of the folders in BUNDLE_FOLDERS.
+    It is made by `write_bundle` (or the script bundle.py).  The file starts with a
+    header (the eight bytes 'G2DASSET', a version byte, the number of files as an
+    unsigned 32 bit int and the SHA-1 digest of the contents of the files).  Next comes
+    the index: for each file, its offset and size as unsigned 64 bit ints, the size of
+    its name as an unsigned 16 bit int and the name itself, as 'folder/file' (such as
+    'Images/No Icon.png').  The contents of the files follow, each one starting at a
+    multiple of BUNDLE_ALIGNMENT bytes.  All numbers are little endian.
+    
+    Opening a bundle only reads the header and the index.  The contents are read from
+    the memory map, when they are asked for (see `data`).  Kivy decodes an image from
+    a file object, so an image is copied once, into the BytesIO that it is decoded
+    from.  An asset that Kivy can only load from a file (a font or a sound) is written
+    once to a folder for this bundle in the temporary folder (see `extract`)."""
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def path(self):
+        """The file name of this bundle.
+        
+        **Invariant**: Must be a string."""
+        return self._path
+    
+    @property
+    def digest(self):
+        """The SHA-1 digest (in hexadecimal) of the contents of the files of this bundle.
+        
+        **Invariant**: Must be a string of 40 hexadecimal digits."""
+        return self._digest
+    
+    # BUILT-IN METHODS
+    def __init__(self,path):
+        """**Constructor**: Opens a bundle and reads its index.
+            
+            :param path: the file name of the bundle
+            **Precondition**: the name of a bundle file made by `write_bundle`"""
+        self._path = path
+        with open(path,'rb') as file:
+            self._map = mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ)
+        if len(self._map) < _BUNDLE_HEADER.size:
+            raise ValueError('%s is too short to be a bundle' % `path`)
+        magic, version, count, digest = _BUNDLE_HEADER.unpack_from(self._map)
+        if magic != _BUNDLE_MAGIC or version != _BUNDLE_VERSION:
+            raise ValueError('%s is not a bundle (or an unsupported version)' % `path`)
+        self._digest = digest.encode('hex')
+        self._index = {}
+        self._names = {}
+        pos = _BUNDLE_HEADER.size
+        for i in xrange(count):
+            offset, size, length = _BUNDLE_ENTRY.unpack_from(self._map,pos)
+            pos += _BUNDLE_ENTRY.size
+            folder, name = self._map[pos:pos+length].split('/',1)
+            pos += length
+            self._index[(folder,name)] = (offset,size)
+            self._names.setdefault(folder,set()).add(name)
+    
+    def __len__(self):
+        """**Returns**: The number of files in this bundle."""
+        return len(self._index)
+    
+    # PUBLIC METHODS
+    def names(self,path):
+        """**Returns**: The set of the names of the files of a folder in this bundle.
+            
+            :param path: the resource folder
+            **Precondition**: one of BUNDLE_FOLDERS"""
+        return frozenset(self._names.get(os.path.basename(path),()))
+    
+    def has(self,path,name):
+        """**Returns**: True if this bundle has the file name of a folder.
+            
+            :param path: the resource folder
+            **Precondition**: one of BUNDLE_FOLDERS
+            
+            :param name: the file name
+            **Precondition**: a string"""
+        return (os.path.basename(path),name) in self._index
+    
+    def data(self,path,name):
+        """**Returns**: The contents of a file in this bundle, without copying them.
+        
+        The value is a buffer on the memory map of this bundle, which can be used
+        (and sliced) like a string, but is only valid while the bundle is open.  A
+        caller that needs a file object (such as the Kivy image loaders) copies the
+        contents once, into a BytesIO.
+            
+            :param path: the resource folder
+            **Precondition**: one of BUNDLE_FOLDERS
+            
+            :param name: the file name
+            **Precondition**: a file of that folder in this bundle"""
+        offset, size = self._index[(os.path.basename(path),name)]
+        return buffer(self._map,offset,size)
+    
+    def extract(self,path,name):
+        """**Returns**: The name of a file with the contents of a file in this bundle.
+        
+        The file is only written the first time.  Files are written to a folder named
+        after the `digest` of this bundle, so a new bundle never uses an old file.
+            
+            :param path: the resource folder
+            **Precondition**: one of BUNDLE_FOLDERS
+            
+            :param name: the file name
+            **Precondition**: a file of that folder in this bundle"""
+        folder = os.path.join(tempfile.gettempdir(),'game2d-'+self._digest,
+                              os.path.basename(path))
+        target = os.path.join(folder,name)
+        if not os.path.exists(target):
+            if not os.path.isdir(folder):
+                try:
+                    os.makedirs(folder)
+                except OSError:
+                    # Another thread (or program) made it first
+                    if not os.path.isdir(folder):
+                        raise
+            # Write a new file and rename it, so that no one sees half a file
+            handle, temp = tempfile.mkstemp(dir=folder)
+            with os.fdopen(handle,'wb') as file:
+                file.write(self.data(path,name))
+            os.rename(temp,target)
+        return target
+    
+    def close(self):
+        """Closes the memory map of this bundle.
+        
+        The buffers returned by `data` cannot be used after the bundle is closed."""
+        self._map.close()
+
+
+def write_bundle(path,folders=BUNDLE_FOLDERS):
+    """**Returns**: The number of files written to a new bundle.
+    
+    Every file of each folder (but not of its subfolders) is packed in the bundle,
+    in the format described in `GBundle`.
+        
+        :param path: the file name of the new bundle
+        **Precondition**: a string
+        
+        :param folders: the folders to pack
+        **Precondition**: a sequence of folder names, each with a different base name"""
+    files = []
+    for folder in folders:
+        base = os.path.basename(folder)
+        for name in sorted(os.listdir(folder)):
+            if os.path.isfile(os.path.join(folder,name)):
+                files.append((base+'/'+name,os.path.join(folder,name)))
+    
+    # Place the contents after the index, aligned
+    pos = _BUNDLE_HEADER.size+sum(_BUNDLE_ENTRY.size+len(key) for (key,file) in files)
+    index = []
+    for (key,file) in files:
+        pos += -pos % BUNDLE_ALIGNMENT
+        size = os.path.getsize(file)
+        index.append(_BUNDLE_ENTRY.pack(pos,size,len(key))+key)
+        pos += size
+    
+    digest = hashlib.sha1()
+    for (key,file) in files:
+        with open(file,'rb') as source:
+            digest.update(source.read())
+    
+    with open(path,'wb') as stream:
+        stream.write(_BUNDLE_HEADER.pack(_BUNDLE_MAGIC,_BUNDLE_VERSION,len(files),
+                                         digest.digest()))
+        stream.write(''.join(index))
+        for (key,file) in files:
+            stream.write('\0'*(-stream.tell() % BUNDLE_ALIGNMENT))
+            with open(file,'rb') as source:
+                stream.write(source.read())
+    return len(files)
+
+
+def use_bundle(path):
+    """Loads the assets of the resource folders from a bundle from now on.
+    
+    A file in the bundle is found by the checks for image, font and sound files even
+    if it is not in its folder, and the game2d classes load it from the bundle.  A
+    file that is not in the bundle is still loaded from its folder.  A relative path
+    is taken from the folder of this module.
+        
+        :param path: the file name of the bundle (None to stop using a bundle)
+        **Precondition**: None or the name of a bundle file made by `write_bundle`"""
+    global _bundle
+    if _bundle is not None:
+        _bundle.close()
+        _bundle = None
+    if path is not None:
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(__file__),path)
+        _bundle = GBundle(path)
+    refresh_resources()
+
+
+def get_bundle():
+    """Returns: the bundle in use (see `use_bundle`), or None."""
+    return _bundle
+
+
+def _resource_file(path,name):
+    """Returns: the file name to give Kivy for the file name of a resource folder
+    
+    This is the name itself, unless the file is in the bundle in use.  Then it is the
+    name of the file extracted from the bundle.
+    
+    Parameter path: A resource folder
+    Precondition: path is one of BUNDLE_FOLDERS
+    
+    Parameter name: A file name
+    Precondition: name is a string"""
+    if _bundle is not None and _bundle.has(path,name):
+        return _bundle.extract(path,name)
+    return name
+
+
+################# GEOMETRY PRIMITIVES #################
+pass
+# #mark GEOMETRY PRIMITIVES
+
+class GPoint(object):
+    """Instances are points in 2D space.
+    
+    This class is used primarily for recording and handling mouse locations.  However,
+    it may also be used for geometry calculations in conjunction with `GMatrix`."""
+    
+    # PROPERTIES 
+    @property
+    def x(self):
+        """The x coordinate of the point.
+        
+        **Invariant**: Must be an int or float."""
+        return self._x
+    
+    @x.setter
+    def x(self,value):
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+        self._x = float(value)
+    
+    @property
+    def y(self):
+        """The y coordinate of the point.
+        
+        **Invariant**: Must be an int or float."""
+        return self._y
+    
+    @y.setter
+    def y(self,value):
+        if _checking:
+            assert type(value) in _NUMS, 'value %s is not a number' % `value`
+        self._y = float(value)
+    
+    # METHODS
+    def __init__(self, x=0, y=0):
+        """**Constructor**: creates a new GPoint value (x,y).
+        
+            :param x: initial x value
+            **Precondition**: value is an int or float.
+        
+            :param y: initial y value
+            **Precondition**: value is an int or float.
+        
+        All values are 0.0 by default.        
+        """
+        self.x = x
+        self.y = y
+    
+    def __eq__(self, other):
+        """**Returns**: True if self and other are equivalent GPoint. 
+        
+        This method uses np to test whether the coordinates are 
+        "close enough".  It does not require exact equality for floats.
+        
+            :param other: value to compare against
+        """        
+        return (type(other) == GPoint and np.allclose(self.list(),other.list()))
+    
+    def __ne__(self, other):
+        """**Returns**: True if self and other are not equivalent GPoint. 
+        
+            :param other: value to compare against
+        """
+        return not self == other
+    
+    def __str__(self):
+        """**Returns**: Readable String representation of this GPoint. """
+        return "("+str(self.x)+","+str(self.y)+")"
+    
+    def __repr__(self):
+        """**Returns**: Unambiguous String representation of this GPoint. """
+        return "%s%s" % (self.__class__,self.__str__())
+    
+    def list(self):
+        """**Returns**: A python list with the contents of this GPoint."""
+        return [self.x,self.y]
+    
+    def __add__(self, other):
+        """**Returns**: the sum of self and other.
+        
+        The value returned has the same type as self (so it is either
+        a GPoint or is a subclass of GPoint).  The contents of this object
+        are not altered.
+        
+            :param other: tuple value to add
+            **Precondition**: value has the same type as self.
+        """
+        if _checking:
+            assert (type(other) == type(self)), "value %(value)s is not a of type %(type)s" \
+                % {'value': `other`, 'type':`type(self)`}
+        result = copy.copy(self)
+        result.x += other.x
+        result.y += other.y
+        return result
+    
+    def __sub__(self, other):
+        """**Returns**: the vector from tail to self.
+        
+        The value returned is a GPoint representing a vector with this point at its head.
+        
+            :param other: the tail value for the new Vector
+            **Precondition**: value is a Point object.
+        """
+        if _checking:
+            assert (type(other) == type(self)), "value %(value)s is not a of type %(type)s" \
+                % {'value': `other`, 'type':`type(self)`}
+        result = copy.copy(self)
+        result.x -= other.x
+        result.y -= other.y
+        return result
+    
+    def __mul__(self, scalar):
+        """**Returns**: the scalar multiple of self and other.
+        
+        The value returned is a new GPoint.  The contents of this GPoint
+        are not altered.
+        
+            :param scalar: scalar to multiply by
+            **Precondition**: value is an int or float.
+        """
+        if _checking:
+            assert type(scalar) in _NUMS, "value %s is not a number" % `scalar`
+        result = copy.copy(self)
+        result.x *= scalar
+        result.y *= scalar
+        result.z *= scalar
+        return result
+    
+    def __rmul__(self, scalar):
+        """**Returns**: the scalar multiple of self and other.
+        
+        The value returned is a new GPoint.  The contents of this GPoint
+        are not altered.
+        
+            :param scalar: scalar to multiply by
+            **Precondition**: value is an int or float.
+        """
+        return self.__mul__(scalar)
+    
+    def interpolate(self, other, alpha):
+        """**Returns**: the interpolation of self and other via alpha.
+        
+        The value returned has the same type as self (so it is either
+        a GPoint or is a subclass of GPoint).  The contents of this object
+        are not altered. The resulting value is 
+        
+            alpha*self+(1-alpha)*other 
+        
+        according to GPoint addition and scalar multiplication.
+        
+            :param other: tuple value to interpolate with
+            **Precondition**: value has the same type as self.
+        
+            :param alpha: scalar to interpolate by
+            **Precondition**: value is an int or float.
+        """
+        if _checking:
+            assert (type(other) == type(self)), "value %(value)s is not a of type %(type)s" \
+                % {'value': `other`, 'type':`type(self)`}
+            assert (type(alpha) in [int,float]), "value %s is not a number" % `alpha`
+        return alpha*self+(1-alpha)*other
+    
+    def distanceTo(self, other):
+        """**Returns**: the Euclidean distance from this point to other
+        
+            :param other: value to compare against
+            **Precondition**: value is a Tuple3D object.
+        """
+        return np.sqrt((self.x-other.x)*(self.x-other.x)+
+                          (self.y-other.y)*(self.y-other.y))
+
+
+class GMatrix(object):
+    """Instances are homongenous matrices for graphics transforms.
+    
+    This class is backed by np for fast computation.  There are no publicly accessible 
+    attributes, as it is not safe to access the internals."""
+    
+    def __init__(self):
+        """**Constructor**: creates a new 4x4 identify matrix"""
+        self._data = np.identity(4, dtype=np.float32)
+    
+    def __str__(self):
+        """**Returns**: A string representation of this matrix"""
+        return str(self._data)
+    
+    def __repr__(self):
+        """**Returns**: An unambiguous string representation of this matrix"""
+        return str(self.__class__)+str(self)
+    
+    def __mul__(self,other):
+        """**Returns**: a new Matrix that is the premultiplication of this and other.
+        
+        This operation pre-multiplies the matrix on the right.  As a result, this
+        allows us to read graphics operations left to right (which is more natural)
+        
+            :param other: the matrix to pre-multiply
+            **Precondition**: a Matrix object
+        """
+        m = GMatrix()
+        np.dot(other._data,self._data,m._data)
+        return m
+    
+    def __imul__(self,other):
+        """Premultiplies this matrix by other in place
+        
+        This operation pre-multiplies the matrix on the right.  As a result, this
+        allows us to read graphics operations left to right (which is more natural)
+        
+            :param other: the matrix to pre-multiply
+            **Precondition**: a Matrix object
+        """
+        tmp = np.dot(other._data,self._data)
+        np.copyto(self._data,tmp)
+    
+    def copy(self):
+        """**Returns**: a copy of this Matrix"""
+        m = GMatrix()
+        np.copyto(m._data,self._data)
+        return m
+    
+    def inverse(self):
+        """**Returns**: the inverse of this matrix"""
+        m = GMatrix()
+        np.copyto(m._data,np.linalg.inv(self._data))
+        return m
+    
+    def invert(self):
+        """Inverts this matrix in place"""
+        np.copyto(self._data,np.linalg.inv(self._data))
+        return self
+    
+    def transpose(self):
+        """**Returns**: the transpose of this matrix"""
+        m = GMatrix()
+        np.copyto(m._data,np.transpose(self._data))
+        return m
+    
+    def translate(self,x=0,y=0,z=0):
+        """Translates this matrix (in-place) by the given amount
+        
+            :param x: x-coordinate of translation (default 0)
+            **Precondition**: an int or float
+            
+            :param y: y-coordinate of translation (default 0)
+            **Precondition**: an int or float
+            
+            :param z: z-coordinate of translation (default 0)
+            **Precondition**: an int or float
+        """
+        r = np.identity(4, dtype=np.float32)
+        r[0,3] = x
+        r[1,3] = y
+        r[2,3] = z
+        tmp = np.dot(self._data,r)
+        np.copyto(self._data,tmp)
+    
+    def rotate(self,ang=0,x=0,y=0,z=0):
+        """Rotates this matrix (in place) about the given axis
+        
+        The rotation angle is given in degrees, not radians.  Rotation is 
+        counterclockwise around the angle of rotation.
+        
+            :param angle: angle of rotation in degrees (default 0)
+            **Precondition**: an int or float
+            
+            :param x: x-coordinate of rotation axis (default 0)
+            **Precondition**: an int or float
+            
+            :param y: y-coordinate of rotation axis (default 0)
+            **Precondition**: an int or float
+            
+            :param z: z-coordinate of rotation axis (default 0)
+            **Precondition**: an int or float
+        """
+        # Formula taken from https://en.wikipedia.org/wiki/Rotation_matrix
+        c = np.cos(np.radians(ang))
+        s = np.sin(np.radians(ang))
+        f = 1-c
+        r = np.identity(4, dtype=np.float32)
+        r[0] = [x*x*f+c,   x*y*f-z*s, x*z*f+y*s, 0]
+        r[1] = [y*x*f+z*s, y*y*f+c,   y*z*f-x*s, 0]
+        r[2] = [z*x*f-y*s, z*y*f+x*s, z*z*f+c,   0]
+        tmp = np.dot(self._data,r)
+        np.copyto(self._data,tmp)
+    
+    def scale(self,x=1,y=1,z=1):
+        """Scales this matrix (in-place) by the given amount
+        
+            :param x: x-coordinate of the scale (default 1)
+            **Precondition**: an int or float
+            
+            :param y: y-coordinate of the scale (default 1)
+            **Precondition**: an int or float
+            
+            :param z: z-coordinate of the scale (default 1)
+            **Precondition**: an int or float
+        """
+        s = np.identity(4, dtype=np.float32)
+        s[0,0] = x
+        s[1,1] = y
+        s[2,2] = z
+        tmp = np.dot(self._data,s)
+        np.copyto(self._data,tmp)
+    
+    def _transform(self,x=0,y=0,z=0):
+        """**Returns**: The given point transformed by this matrix
+        
+        The value returned is a tuple.
+        
+            :param x: x-coordinate to transform (default 0)
+            **Precondition**: an int or float
+            
+            :param y: y-coordinate to transform (default 0)
+            **Precondition**: an int or float
+            
+            :param z: z-coordinate to transform (default 0)
+            **Precondition**: an int or float
+        """
+        b = np.array([x,y,z,1], dtype=np.float32)
+        tmp = np.dot(self._data,b)
+        return map(float,tuple(tmp[:-1]))
+    
+    def transform(self,point):
+        """**Returns**: The given point transformed by this matrix
+        
+        The value returned is a GPoint.
+        
+            :param point: the point to transform
+            **Precondition**: a GPoint
+        """
+        b = np.array([point.x,point.y,0,1], dtype=np.float32)
+        tmp = np.dot(self._data,b)
+        return GPoint(float(tmp[0]),float(tmp[1]))
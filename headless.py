@@ -0,0 +1,191 @@
+# headless.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Headless simulation module for Breakout
+
+This module contains versions of the models and of the subcontroller Play that do not
+need a window.  They never create any Kivy graphics instructions and never load any
+sounds, so a game can be simulated as fast as Python allows.  This is what we use for
+balancing, bot evaluation and regression tests on machines with no display.
+
+The headless classes keep the same API as the originals.  A HeadlessPlay is played
+exactly like a Play (updatePaddle, serveBall, updateBall), and the headless models are
+instances of Paddle, Brick and Ball, so they use the same collision and movement code
+as the real game.  The models only make Kivy objects when they are drawn, so the
+headless models simply never draw.
+
+Since there is no GameApp, there is no GInput to pass to updatePaddle.  Use an instance
+of HeadlessInput instead, and press and release its keys by hand."""
+from constants import *
+from models import *
+from play import *
+
+
+class HeadlessPaddle(Paddle):
+    """An instance is the game paddle of a headless game.  It is never drawn."""
+    __slots__ = ()
+    
+    def draw(self, view):
+        """Does nothing, as there is nothing to draw in a headless game.
+        
+        Parameter view: view to be drawn onto (ignored)
+        Precondition: NONE"""
+        pass
+
+
+class HeadlessBrick(Brick):
+    """An instance is a brick of a headless game.  It is never drawn."""
+    __slots__ = ()
+    
+    def draw(self, view):
+        """Does nothing, as there is nothing to draw in a headless game.
+        
+        Parameter view: view to be drawn onto (ignored)
+        Precondition: NONE"""
+        pass
+
+
+class HeadlessBall(Ball):
+    """Instance is the ball of a headless game.  It is never drawn."""
+    __slots__ = ()
+    
+    def draw(self, view):
+        """Does nothing, as there is nothing to draw in a headless game.
+        
+        Parameter view: view to be drawn onto (ignored)
+        Precondition: NONE"""
+        pass
+
+
+class SilentSound(object):
+    """Instances are a sound that plays nothing.
+    
+    A headless game uses this class in place of Sound, so that it never loads a WAV
+    file or touches the audio device."""
+    
+    def play(self):
+        """Does nothing."""
+        pass
+
+
+class HeadlessInput(object):
+    """Instances are a stand-in for GInput in a headless game.
+    
+    This class provides the part of GInput that Play.updatePaddle reads.  Keys are
+    pressed and released with the methods press and release.  There is never a touch.
+    
+    INSTANCE ATTRIBUTES:
+        _keys [set of str]: the keys currently held down"""
+    
+    # IMMUTABLE ATTRIBUTES
+    @property
+    def touch(self):
+        """Always None, as there is no mouse in a headless game."""
+        return None
+    
+    @property
+    def key_count(self):
+        """The number of keys currently held down."""
+        return len(self._keys)
+    
+    @property
+    def keys(self):
+        """The tuple of keys that are currently held down."""
+        return tuple(self._keys)
+    
+    @property
+    def frame_time(self):
+        """Always 0, as a headless input is not sampled over frames.
+        
+        So updatePaddle moves the paddle one step for each call, whatever the time."""
+        return 0
+    
+    # INITIALIZER
+    def __init__(self):
+        """Initializer for class HeadlessInput.  No keys are held down."""
+        self._keys = set()
+    
+    # METHODS
+    def is_key_down(self, key):
+        """Returns: True if the key is currently held down.
+        
+        Parameter key: the key to test
+        Precondition: key is a string"""
+        return key in self._keys
+    
+    def is_touch_down(self):
+        """Returns: False, as there is no mouse in a headless game."""
+        return False
+    
+    def press(self, key):
+        """Holds down the given key.
+        
+        Parameter key: the key to press
+        Precondition: key is a string"""
+        self._keys.add(key)
+    
+    def release(self, key):
+        """Releases the given key if it is held down.
+        
+        Parameter key: the key to release
+        Precondition: key is a string"""
+        self._keys.discard(key)
+    
+    def release_all(self):
+        """Releases every key that is held down."""
+        self._keys.clear()
+
+
+class HeadlessPlay(Play):
+    """An instance controls a single game of breakout without graphics or sound.
+    
+    This class plays exactly like Play: it has the same getters and the same methods
+    updatePaddle, serveBall and updateBall.  The only difference is that the paddle,
+    ball and bricks are headless models, that there is no BrickField (and the balls
+    are not drawn) and that every sound is a SilentSound.  The method draw may still
+    be called, but it draws nothing."""
+    
+    # HELPER METHODS THAT MAKE THE MODELS
+    def _makeBrick(self, x, y, color):
+        """Returns: a new HeadlessBrick centered at (x, y) with the given color.
+        
+        Parameter x: x coordinate of the brick's center.
+        Precondition: x must be an int or a float.
+        
+        Parameter y: y coordinate of the brick's center.
+        Precondition: y must be an int or a float.
+        
+        Parameter color: color of the brick
+        Precondition: color is a valid color for a Brick"""
+        return HeadlessBrick(x, y, color)
+    
+    def _makeBrickField(self):
+        """Returns: None, as the bricks of a headless game are not drawn."""
+        return None
+    
+    def _makePaddle(self, x, y):
+        """Returns: a new HeadlessPaddle centered at (x, y).
+        
+        Parameter x: Starting x for the paddle
+        Precondition: x must be a float or an int
+        
+        Parameter y: Starting y for the paddle
+        Precondition: y must be a float or an int"""
+        return HeadlessPaddle(x, y)
+    
+    def _makeBall(self):
+        """Returns: a new HeadlessBall, ready to be served.
+        
+        Its velocity comes from the random generator of this game."""
+        return HeadlessBall(self._random)
+    
+    def _makeBallSet(self):
+        """Returns: a new, empty BallSet that is not drawn."""
+        return BallSet()
+    
+    def _loadSounds(self):
+        """Makes every sound effect of this game a SilentSound."""
+        self._paddleSound = SilentSound()
+        self._breakSound1 = SilentSound()
+        self._breakSound2 = SilentSound()
+        self._serveBallSound = SilentSound()
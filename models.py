@@ -9,12 +9,14 @@ interact with on the screen is model: the paddle, the ball, and any of the brick
 Technically, just because something is a model does not mean there has to be a special 
 class for it.  Unless you need something special, both paddle and individual bricks could
 just be instances of GRectangle.  However, we do need something special: collision 
-detection.  That is why we have custom classes.
+detection.  That is why we have custom classes.  They are not GObjects, but compact
+GBoxes that only make a GObject when they are drawn (see GBox).
 
 You are free to add new models to this module.  You may wish to do this when you add
 new features to your game.  If you are unsure about whether to make a new class or 
 not, please ask on Piazza."""
 import random # To randomly generate the ball velocity
+import numpy as np
 from constants import *
 from game2d import *
 
@@ -24,16 +26,119 @@ from game2d import *
 # and Play should pass it as a argument when it calls the method.
 
 
-class Paddle(GRectangle):
+class GBox(object):
+    """Instances are an axis-aligned rectangle with the geometry of a GObject.
+    
+    This class provides the attributes of GObject that the models use for collision
+    detection and movement (x, y, width, height and the four edges) in a compact
+    form.  A GRectangle has a __dict__, three Kivy transforms, two colors and an
+    instruction group; a GBox has five slots and nothing else.  The models are
+    GBoxes, so that a board of tens of thousands of bricks only takes a few bytes
+    per brick.
+    
+    A GBox is drawn by a GObject (its shape) that is only made the first time the
+    box is drawn.  Bricks are drawn all at once by a BrickField, so a brick never
+    makes its shape.
+    
+    INSTANCE ATTRIBUTES:
+        x      [int or float]: the horizontal coordinate of the center
+        y      [int or float]: the vertical coordinate of the center
+        width  [int or float > 0]: the width of the box
+        height [int or float > 0]: the height of the box
+        _shape [GObject, or None if never drawn]: the object that draws this box
+    
+    A GBox is never rotated, so the edges are always computed from the center, width
+    and height."""
+    __slots__ = ('x','y','width','height','_shape')
+    
+    # DERIVED PROPERTIES
+    @property
+    def left(self):
+        """The left edge of this box."""
+        return self.x-self.width/2.0
+    
+    @property
+    def right(self):
+        """The right edge of this box."""
+        return self.x+self.width/2.0
+    
+    @property
+    def top(self):
+        """The vertical coordinate of the top edge."""
+        return self.y+self.height/2.0
+    
+    @property
+    def bottom(self):
+        """The vertical coordinate of the bottom edge."""
+        return self.y-self.height/2.0
+    
+    # INITIALIZER
+    def __init__(self, x, y, width, height):
+        """Initializer for class GBox.
+        
+        Parameter x: x coordinate of the center
+        Precondition: x must be an int or a float.
+        
+        Parameter y: y coordinate of the center
+        Precondition: y must be an int or a float.
+        
+        Parameter width: the width of the box
+        Precondition: width must be an int or a float > 0.
+        
+        Parameter height: the height of the box
+        Precondition: height must be an int or a float > 0."""
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self._shape = None
+    
+    # METHODS
+    def contains(self, x, y):
+        """Returns: True if this box contains the point (x,y), False otherwise.
+        
+        Parameter x: x coordinate of point to check
+        Precondition: x is an int or float
+        
+        Parameter y: y coordinate of point to check
+        Precondition: y is an int or float"""
+        if GProfiler.current is not None:
+            GProfiler.current.count('contains')
+        return abs(x-self.x) < self.width/2.0 and abs(y-self.y) < self.height/2.0
+    
+    def draw(self, view):
+        """Draws this box onto the given view.
+        
+        The shape of the box is made on the first call, and moved to the center of
+        the box on every call.
+        
+        Parameter view: view to be drawn onto
+        Precondition: view is a valid view of a GameApp instance."""
+        if self._shape is None:
+            self._shape = self._makeShape()
+        self._shape.x = self.x
+        self._shape.y = self.y
+        self._shape.draw(view)
+    
+    def _makeShape(self):
+        """Returns: a new GObject to draw this box with.
+        
+        Subclasses override this to give the box its color and shape."""
+        return GRectangle(x=self.x, y=self.y, width=self.width, height=self.height)
+
+
+class Paddle(GBox):
     """An instance is the game paddle.
     
     This class contains a method to detect collision with the ball, as well as move it
     left and right.  You may wish to add more features to this class.
     
-    The attributes of this class are those inherited from GRectangle.
+    The attributes of this class are those inherited from GBox.
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
     """
+    __slots__ = ()
+    
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     
     # INITIALIZER TO CREATE A NEW PADDLE
@@ -46,9 +151,7 @@ class Paddle(GRectangle):
         Parameter y: Starting y for the paddle
         Precondition: y must be a float or an int"""
         
-        GRectangle.__init__(self, x=x, y=y, width = PADDLE_WIDTH,
-                            height = PADDLE_HEIGHT,
-                            fillcolor = colormodel.BLACK)
+        GBox.__init__(self, x, y, PADDLE_WIDTH, PADDLE_HEIGHT)
         
     # METHODS TO MOVE THE PADDLE AND CHECK FOR COLLISIONS
     def collides(self,ball):
@@ -58,6 +161,8 @@ class Paddle(GRectangle):
         
         Parameter ball: The ball to check
         Precondition: ball is of class Ball"""
+        if GProfiler.current is not None:
+            GProfiler.current.count('collisions')
         r = BALL_DIAMETER/2.0
         a = self.contains(ball.x-r, ball.y-r)
         b = self.contains(ball.x+r, ball.y-r)
@@ -67,20 +172,30 @@ class Paddle(GRectangle):
         return (a or b or c or d) and ball.isMovingDown() 
     
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+    def _makeShape(self):
+        """Returns: a new black GRectangle to draw the paddle with."""
+        return GRectangle(x=self.x, y=self.y, width=self.width, height=self.height,
+                          fillcolor=colormodel.BLACK)
 
 
-class Brick(GRectangle):
+class Brick(GBox):
     """An instance is the game paddle.
     
     This class contains a method to detect collision with the ball.  You may wish to 
     add more features to this class.
     
-    The attributes of this class are those inherited from GRectangle.
+    The attributes of this class are those inherited from GBox.
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    Attribute _color: [colormodel color or list] the color of the brick.
     """
+    __slots__ = ('_color',)
     
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    @property
+    def fillcolor(self):
+        """The color of the brick (read only)."""
+        return self._color
     
     # INITIALIZER TO CREATE A BRICK
     def __init__(self, x, y, color):
@@ -95,34 +210,97 @@ class Brick(GRectangle):
         Parameter color: color of the brick
         Precondition: Must be an RGB or HSV color from colormodel
                       or a four element list of floats between 0 and 1."""              
-        GRectangle.__init__(self,x=x,y=y,width = BRICK_WIDTH,
-                          height = BRICK_HEIGHT,fillcolor = color)
+        GBox.__init__(self, x, y, BRICK_WIDTH, BRICK_HEIGHT)
+        self._color = color
 
     # METHOD TO CHECK FOR COLLISION
     def collides(self,ball):
         """Returns: True if the ball collides with this brick
         Parameter ball: The ball to check
         Precondition: ball is of class Ball"""
+        return self.collidesAt(ball.x, ball.y)
+    
+    def collidesAt(self, x, y):
+        """Returns: True if a ball centered at (x, y) collides with this brick
+        
+        This is the same test as collides, for a ball that is not a Ball
+        object (such as a ball in a BallSet).
+        
+        Parameter x: the x coordinate of the center of the ball
+        Precondition: x is an int or float
+        
+        Parameter y: the y coordinate of the center of the ball
+        Precondition: y is an int or float"""
+        if GProfiler.current is not None:
+            GProfiler.current.count('collisions')
         r = BALL_DIAMETER/2.0
-        a = self.contains(ball.x-r, ball.y-r)
-        b = self.contains(ball.x+r, ball.y-r)
-        c = self.contains(ball.x-r, ball.y+r)
-        d = self.contains(ball.x+r, ball.y+r)
+        a = self.contains(x-r, y-r)
+        b = self.contains(x+r, y-r)
+        c = self.contains(x-r, y+r)
+        d = self.contains(x+r, y+r)
         
         return a or b or c or d
     
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+    def _makeShape(self):
+        """Returns: a new GRectangle with the color of this brick, to draw it on
+        its own (outside of a BrickField)."""
+        return GRectangle(x=self.x, y=self.y, width=self.width, height=self.height,
+                          fillcolor=self._color)
 
 
-class Ball(GEllipse):
+class BrickField(GBatch):
+    """An instance draws all of the bricks of a game at once.
+    
+    Drawing each Brick on its own takes seven Kivy instructions per brick.  A BrickField
+    is a GBatch, so it draws all of the bricks of the same color as a single mesh.  The
+    bricks are still separate Brick objects for the sake of collision detection; this
+    class only replaces their draw method.  When a brick is destroyed, it must be
+    removed from the BrickField with removeBrick.
+    
+    INSTANCE ATTRIBUTES:
+        _brickHandles [dict]: maps each Brick in this field to its handle in the batch
+    """
+    
+    # INITIALIZER TO CREATE A BRICK FIELD
+    def __init__(self, bricks):
+        """Initializer for class BrickField.
+        
+        Parameter bricks: the bricks to draw
+        Precondition: bricks is a list of Brick objects"""
+        GBatch.__init__(self)
+        self._brickHandles = {}
+        for b in bricks:
+            self.addBrick(b)
+    
+    # METHODS TO ADD AND REMOVE BRICKS
+    def addBrick(self, brick):
+        """Adds the given brick to this field, with its size, position and color.
+        
+        Parameter brick: The brick to add
+        Precondition: brick is a Brick that is not in this field"""
+        self._brickHandles[brick] = self.add(brick.x, brick.y, brick.width,
+                                             brick.height, brick.fillcolor)
+    
+    def removeBrick(self, brick):
+        """Removes the given brick from this field, so it is no longer drawn.
+        
+        Parameter brick: The brick to remove
+        Precondition: brick is a Brick in this field"""
+        self.remove(self._brickHandles.pop(brick))
+
+
+class Ball(GBox):
     """Instance is a game ball.
     
-    We extend GEllipse because a ball must have additional attributes for velocity.
-    This class adds this attributes and manages them.
+    We extend GBox because a ball must have additional attributes for velocity.
+    This class adds this attributes and manages them.  The ball is drawn as a
+    GEllipse.
     
     INSTANCE ATTRIBUTES:
         _vx [int or float]: Velocity in x direction 
         _vy [int or float]: Velocity in y direction 
+        _hits [int >= 0]: the paddle hits since the ball was served or last kicked
     
     The class Play will need to look at these attributes, so you will need
     getters for them.  However, it is possible to write this assignment with no
@@ -132,28 +310,57 @@ class Ball(GEllipse):
     (paddle or brick) or if it hits a wall.  Why not just write methods for these
     instead of using setters?  This cuts down on the amount of code in Gameplay.
     
-    NOTE: The ball does not have to be a GEllipse. It could be an instance
-    of GImage (why?). This change is allowed, but you must modify the class
-    header up above.
+    NOTE: The ball does not have to be drawn as a GEllipse. It could be an
+    instance of GImage (why?). This change is allowed, but you must modify the
+    method _makeShape.
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
     """
+    __slots__ = ('_vx','_vy','_hits')
     
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getVX(self):
+        """Returns: the velocity of the ball in the x direction."""
+        return self._vx
+    
+    def getVY(self):
+        """Returns: the velocity of the ball in the y direction."""
+        return self._vy
+    
+    def setVelocity(self, vx, vy):
+        """Sets the velocity of the ball.
+        
+        Parameter vx: the velocity in the x direction
+        Precondition: vx is an int or float
+        
+        Parameter vy: the velocity in the y direction
+        Precondition: vy is an int or float"""
+        self._vx = vx
+        self._vy = vy
+    
+    def getHits(self):
+        """Returns: the paddle hits since the ball was served or last kicked."""
+        return self._hits
+    
+    def setHits(self, hits):
+        """Sets the paddle hits since the ball was served or last kicked.
+        
+        Parameter hits: the number of hits
+        Precondition: hits is an int >= 0"""
+        self._hits = hits
     
     # INITIALIZER TO SET RANDOM VELOCITY
-    def __init__(self):
-        """Initializer for the Ball class."""
+    def __init__(self, rng=random):
+        """Initializer for the Ball class.
         
-        GEllipse.__init__(self, x = GAME_WIDTH/2.0, y = GAME_HEIGHT/2.0,
-                 width = BALL_DIAMETER, height = BALL_DIAMETER,
-                 fillcolor = colormodel.BLACK)
+        Parameter rng: the random generator for the serve velocity
+        Precondition: rng is the random module or a random.Random instance"""
         
-        #The following three lines are suggestions taken from the
-        #assignment outline.
-        self._vy = -5.0
-        self._vx = random.uniform(1.0,5.0)
-        self._vx = self._vx *random.choice([-1,1])
+        GBox.__init__(self, GAME_WIDTH/2.0, GAME_HEIGHT/2.0,
+                      BALL_DIAMETER, BALL_DIAMETER)
+        
+        self._setServeVelocity(rng)
+        self._hits = 0
         
     # METHODS TO MOVE AND/OR BOUNCE THE BALL
     def moveBall(self, time):
@@ -191,4 +398,229 @@ class Ball(GEllipse):
         Precondition: kickFactor is an int or float > 1"""
         self._vx *= kickFactor
     
-# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
\ No newline at end of file
+    def hitPaddle(self):
+        """Counts a hit of the paddle, kicking the ball by KICK_FACTOR once it
+        has hit the paddle KICK_INTERVAL times since it was served or last kicked.
+        
+        Returns: True if the ball was kicked."""
+        self._hits += 1
+        if self._hits >= KICK_INTERVAL:
+            self.kick(KICK_FACTOR)
+            self._hits = 0
+            return True
+        return False
+    
+    def _setServeVelocity(self, rng):
+        """Gives the ball the random velocity it has when it is served.
+        
+        Parameter rng: the random generator for the velocity
+        Precondition: rng is the random module or a random.Random instance"""
+        #The following three lines are suggestions taken from the
+        #assignment outline.
+        self._vy = -5.0
+        self._vx = rng.uniform(1.0,5.0)
+        self._vx = self._vx *rng.choice([-1,1])
+    
+    def _makeShape(self):
+        """Returns: a new black GEllipse to draw the ball with."""
+        return GEllipse(x=self.x, y=self.y, width=self.width, height=self.height,
+                        fillcolor=colormodel.BLACK)
+    
+# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+
+
+class BallSet(object):
+    """An instance is the collection of every ball in play, for multiball.
+    
+    Each Ball is moved and tested one at a time, and is drawn with its own GEllipse,
+    which is too slow to have hundreds of them in play.  A BallSet instead stores the
+    position and velocity of each of its balls in numpy arrays, so that all of the
+    balls are moved at once.  The balls are drawn with a single GCircleBatch.
+    
+    A ball that needs the collision rules of a Ball is copied into a Ball with load,
+    moved and bounced there, and copied back with store.  So every ball in the set
+    follows exactly the same rules, whatever the number of balls.
+    
+    The balls are numbered from 0 to getCount()-1.  The methods that bounce or remove
+    balls take the numbers of the balls to change, as an int array (or list).  The
+    numbers of the balls after a removed ball go down, as the arrays are kept packed.
+    
+    INSTANCE ATTRIBUTES:
+        _count   [int >= 0]: the number of balls in this set
+        _x       [float array]: the x coordinate of each ball
+        _y       [float array]: the y coordinate of each ball
+        _vx      [float array]: the velocity in the x direction of each ball
+        _vy      [float array]: the velocity in the y direction of each ball
+        _hits    [int array]: the paddle hits of each ball since it was last kicked
+        _circles [GCircleBatch, or None if the balls are not drawn]: draws the balls
+    
+    Only the first _count entries of each array are balls.  The arrays are longer so
+    that adding a ball does not always allocate new arrays."""
+    
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getCount(self):
+        """Returns: the number of balls in this set."""
+        return self._count
+    
+    def getX(self):
+        """Returns: a float array with the x coordinate of each ball.
+        
+        This array is a view of the balls, and is only valid until the balls are
+        next added or removed."""
+        return self._x[:self._count]
+    
+    def getY(self):
+        """Returns: a float array with the y coordinate of each ball.
+        
+        This array is a view of the balls, and is only valid until the balls are
+        next added or removed."""
+        return self._y[:self._count]
+    
+    def getVX(self):
+        """Returns: a float array with the velocity in the x direction of each ball.
+        
+        This array is a view of the balls, and is only valid until the balls are
+        next added or removed."""
+        return self._vx[:self._count]
+    
+    def getVY(self):
+        """Returns: a float array with the velocity in the y direction of each ball.
+        
+        This array is a view of the balls, and is only valid until the balls are
+        next added or removed."""
+        return self._vy[:self._count]
+    
+    # INITIALIZER
+    def __init__(self, circles=None):
+        """Initializer for the BallSet class.  The set starts with no balls.
+        
+        Parameter circles: the batch to draw the balls with (None to not draw them)
+        Precondition: circles is None or a GCircleBatch"""
+        self._count = 0
+        self._x = np.zeros(16)
+        self._y = np.zeros(16)
+        self._vx = np.zeros(16)
+        self._vy = np.zeros(16)
+        self._hits = np.zeros(16, dtype=int)
+        self._circles = circles
+    
+    # METHODS TO ADD, MOVE, BOUNCE AND REMOVE THE BALLS
+    def add(self, x, y, vx, vy):
+        """Adds a ball to this set.  It is given the number getCount()-1.
+        
+        Parameter x: the x coordinate of the center of the ball
+        Precondition: x is an int or float
+        
+        Parameter y: the y coordinate of the center of the ball
+        Precondition: y is an int or float
+        
+        Parameter vx: the velocity of the ball in the x direction
+        Precondition: vx is an int or float
+        
+        Parameter vy: the velocity of the ball in the y direction
+        Precondition: vy is an int or float"""
+        if self._count == len(self._x):
+            size = 2*len(self._x)
+            self._x = np.resize(self._x, size)
+            self._y = np.resize(self._y, size)
+            self._vx = np.resize(self._vx, size)
+            self._vy = np.resize(self._vy, size)
+            self._hits = np.resize(self._hits, size)
+        n = self._count
+        self._x[n] = x
+        self._y[n] = y
+        self._vx[n] = vx
+        self._vy[n] = vy
+        self._hits[n] = 0
+        self._count += 1
+    
+    def moveBalls(self, time, balls=None):
+        """Moves the given balls in the direction they are heading for the given time.
+        
+        Parameter time: The amount of time for which the balls have moved.
+        Precondition: time is a float or an int and time >= 0.
+        
+        Parameter balls: the numbers of the balls to move (None for every ball)
+        Precondition: balls is None, or an int array or list of distinct ball
+        numbers, or a bool array of size getCount()"""
+        n = self._count
+        if balls is None:
+            self._x[:n] += time*self._vx[:n]
+            self._y[:n] += time*self._vy[:n]
+        else:
+            x = self._x[:n]
+            y = self._y[:n]
+            x[balls] += time*self._vx[:n][balls]
+            y[balls] += time*self._vy[:n][balls]
+    
+    def load(self, index, ball):
+        """Copies the position, velocity and paddle hits of a ball of this set into
+        the given Ball.
+        
+        Parameter index: the number of the ball to copy
+        Precondition: index is an int in 0..getCount()-1
+        
+        Parameter ball: the Ball to copy it into
+        Precondition: ball is a Ball"""
+        ball.x = self._x.item(index)
+        ball.y = self._y.item(index)
+        ball.setVelocity(self._vx.item(index), self._vy.item(index))
+        ball.setHits(self._hits.item(index))
+    
+    def store(self, index, ball):
+        """Copies the position, velocity and paddle hits of the given Ball into a
+        ball of this set.
+        
+        Parameter index: the number of the ball to copy into
+        Precondition: index is an int in 0..getCount()-1
+        
+        Parameter ball: the Ball to copy
+        Precondition: ball is a Ball"""
+        self._x.itemset(index, ball.x)
+        self._y.itemset(index, ball.y)
+        self._vx.itemset(index, ball.getVX())
+        self._vy.itemset(index, ball.getVY())
+        self._hits.itemset(index, ball.getHits())
+    
+    def vertBounce(self, balls):
+        """Flips the sign of the y-velocity of the given balls.
+        
+        Parameter balls: the numbers of the balls to bounce
+        Precondition: balls is an int array or list of distinct ball numbers"""
+        self._vy[balls] *= -1
+    
+    def horBounce(self, balls):
+        """Flips the sign of the x-velocity of the given balls.
+        
+        Parameter balls: the numbers of the balls to bounce
+        Precondition: balls is an int array or list of distinct ball numbers"""
+        self._vx[balls] *= -1
+    
+    def remove(self, balls):
+        """Removes the given balls from this set.
+        
+        The remaining balls keep their order, but are numbered again from 0.
+        
+        Parameter balls: the numbers of the balls to remove
+        Precondition: balls is an int array or list of ball numbers"""
+        n = self._count
+        keep = np.ones(n, dtype=bool)
+        keep[balls] = False
+        k = int(keep.sum())
+        for array in (self._x, self._y, self._vx, self._vy, self._hits):
+            array[:k] = array[:n][keep]
+        self._count = k
+    
+    def clear(self):
+        """Removes every ball from this set."""
+        self._count = 0
+    
+    # DRAW METHOD
+    def draw(self, view):
+        """Draws every ball in this set onto the given view.
+        
+        Parameter view: view to be drawn onto
+        Precondition: view is a valid view of a GameApp instance."""
+        if self._circles is not None:
+            self._circles.place(self.getX(), self.getY())
+            self._circles.draw(view)
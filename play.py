@@ -13,6 +13,10 @@ Their classes are defined in models.py.
 Most of your work on this assignment will be in either this module or models.py.
 Whether a helper method belongs in this module or models.py is often a complicated
 issue.  If you do not know, ask on Piazza and we will answer."""
+import hashlib
+import math
+import random
+import numpy as np
 from constants import *
 from game2d import *
 from models import *
@@ -34,8 +38,9 @@ class Play(object):
     
     INSTANCE ATTRIBUTES:
         _paddle [Paddle]: the paddle to play with 
-        _bricks [list of Brick]: the list of bricks still remaining 
-        _ball   [Ball, or None if waiting for a serve]:  the ball to animate
+        _bricks [list of Brick]: every brick of the layout, in row-major order
+                (destroyed bricks included; see _alive)
+        _balls  [BallSet]: every ball in play (none if waiting for a serve)
         _tries  [int >= 0]: the number of tries left 
     
     As you can see, all of these attributes are hidden.  You may find that you want to
@@ -59,7 +64,10 @@ class Play(object):
     Attribute _rightPressed:    [boolean] indicating whether or not the
                                 right arrow key was previously held down.
     Attribute _paddleSound:     [Immutable instance of Sound] object that plays
-                                when the ball hits the paddle.
+                                when the ball hits the paddle.  The sounds
+                                are shared by every game, and have
+                                SOUND_VOICES voices each, so that a sound
+                                can play again before it has finished.
     Attribute _soundOn:         [boolean] indicating whether the sound is on
                                 or not.
     Attribute _breakSound1:     [Immutable instance of Sound] First breaking
@@ -68,11 +76,36 @@ class Play(object):
                                 sound to play when a ball hits a brick.
     Attribute _serveBallSound:  [Immutable instance of Sound] Whenever the ball
                                 is served this plays.
-    Attrbute _kickCounter:      [int] Counts the number of times the paddle
-                                collides with the ball either since the
-                                beginning of the game or since the last kick
-                                to figure out when the ball should be
-                                kicked."""
+    Attribute _kicks:           [int >= 0] the number of kicks in this game.
+    Attribute _alive:           [bytearray] the board.  It has one byte per
+                                cell of the brick layout, in row-major order:
+                                1 if the brick in that cell still stands, 0 if
+                                it was destroyed.  The cell of the brick in
+                                row r and column c is r*BRICKS_IN_ROW+c, and
+                                _bricks[cell] is that brick.
+    Attribute _bricksLeft:      [int >= 0] the number of 1s in _alive.
+    Attribute _dx:              [float > 0] width of one cell of the layout (a
+                                brick plus its horizontal separation).
+    Attribute _dy:              [float > 0] height of one cell of the layout (a
+                                brick plus its vertical separation).
+    Attribute _brickField:      [BrickField, or None if the bricks are not
+                                drawn] draws all of the remaining bricks at
+                                once.
+    Attribute _seed:            [int >= 0] the seed of _random.
+    Attribute _random:          [random.Random] the random generator for
+                                everything that changes the course of the
+                                game (the serve velocities).  Two games
+                                with the same seed and the same input play
+                                out exactly the same.  Sound effects use
+                                the global random module instead, so that
+                                turning the sound off does not change the
+                                game.
+    Attribute _cursor:          [Ball, or None before the first serve] the
+                                ball being moved.  A ball of _balls that
+                                may hit something is copied into it, moved
+                                and bounced by the collision rules, and
+                                copied back (see updateBall).  A try is only
+                                lost with the last ball in _balls."""
     
     
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
@@ -82,7 +115,21 @@ class Play(object):
     
     def noBricks(self):
         """Returns: True if there are no bricks left in this Play instance"""
-        return len(self._bricks) == 0
+        return self._bricksLeft == 0
+    
+    def getBricksLeft(self):
+        """Returns: the number of bricks left in this Play instance"""
+        return self._bricksLeft
+    
+    def isBrickAlive(self, row, col):
+        """Returns: True if the brick in the given row and column still stands.
+        
+        Parameter row: the row of the brick (0 is the top row)
+        Precondition: row is an int in 0..BRICK_ROWS-1
+        
+        Parameter col: the column of the brick (0 is the left column)
+        Precondition: col is an int in 0..BRICKS_IN_ROW-1"""
+        return self._alive[row*BRICKS_IN_ROW+col] == 1
     
     def getTries(self):
         """Returns the number of tries the Play instance has left."""
@@ -90,15 +137,66 @@ class Play(object):
     
     def hasBall(self):
         """Returns: True if the Play instance has a ball currently in play."""
-        return self._ball is not None
+        return self._balls.getCount() > 0
+    
+    def getBallCount(self):
+        """Returns: the number of balls currently in play (including the
+        extra balls of multiball)."""
+        return self._balls.getCount()
+    
+    def getPaddleX(self):
+        """Returns: the x coordinate of the center of the paddle."""
+        return self._paddle.x
+    
+    def getPaddleState(self):
+        """Returns: the tuple (x, direction, left, right) of the paddle: the x
+        coordinate of its center, the direction it is heading (see constants)
+        and whether the left and right arrow keys were previously held down."""
+        return (self._paddle.x, self._paddleDirection, self._leftPressed,
+                self._rightPressed)
+    
+    def getBallState(self):
+        """Returns: the tuple (x, y, vx, vy) of the position and velocity of
+        the first ball in play, or None if there is no ball in play."""
+        balls = self._balls
+        if balls.getCount() == 0:
+            return None
+        return (balls.getX().item(0), balls.getY().item(0),
+                balls.getVX().item(0), balls.getVY().item(0))
+    
+    def getBoard(self):
+        """Returns: a uint8 array of shape (BRICK_ROWS, BRICKS_IN_ROW) that
+        is 1 where the brick in that row and column still stands.
+        
+        This array is a view of the board, so it changes as bricks are
+        broken.  It must not be changed."""
+        return np.frombuffer(self._alive, np.uint8).reshape(BRICK_ROWS,
+                                                            BRICKS_IN_ROW)
+    
+    def getKicks(self):
+        """Returns: the number of times the ball was kicked in this game."""
+        return self._kicks
     
     def getSoundOn(self):
         """Returns: True if the Play instance has the sound on."""
         return self._soundOn
     
+    def getSeed(self):
+        """Returns: the seed of the random generator of this game."""
+        return self._seed
+    
     # INITIALIZER (standard form) TO CREATE PADDLES AND BRICKS
-    def __init__(self):
-        """Initializer for the class Play"""
+    def __init__(self, seed=None):
+        """Initializer for the class Play
+        
+        Parameter seed: the seed for the random generator of this game (None
+        for a random seed)
+        Precondition: seed is None or an int >= 0"""
+        if seed is None:
+            seed = random.randrange(2**32)
+        self._seed = seed
+        self._random = random.Random(seed)
+        
         self._bricks = []
         #xStart and yStart are the center coordinates of the top left brick
         xStart = BRICK_SEP_H/2.0 + BRICK_WIDTH/2 #FIX THIS (LOOK AT CONSTANTS)
@@ -107,12 +205,21 @@ class Play(object):
         #vertical and horizontal increments defined below
         dx = BRICK_WIDTH + BRICK_SEP_H
         dy = BRICK_HEIGHT + BRICK_SEP_V
+        self._dx = dx
+        self._dy = dy
         for r in range(BRICK_ROWS):
             for c in range(BRICKS_IN_ROW):
-                self._bricks.append(Brick(xStart + c*dx,yStart - r*dy,
-                                          BRICK_COLORS[(r/2)%5]))
+                brick = self._makeBrick(xStart + c*dx,yStart - r*dy,
+                                        BRICK_COLORS[(r/2)%5])
+                self._bricks.append(brick)
+        self._alive = bytearray('\x01')*len(self._bricks)
+        self._bricksLeft = len(self._bricks)
+        self._brickField = self._makeBrickField()
         
-        self._paddle = Paddle(GAME_WIDTH/2.0,PADDLE_OFFSET + PADDLE_HEIGHT/2.0)
+        self._paddle = self._makePaddle(GAME_WIDTH/2.0,
+                                        PADDLE_OFFSET + PADDLE_HEIGHT/2.0)
+        self._balls = self._makeBallSet()
+        self._cursor = None
         self._ballReleased = False
         self._paddleDirection = PADDLE_STILL
         #booleans that keep track of whether the left or right key was pressed
@@ -120,45 +227,32 @@ class Play(object):
         self._leftPressed = False
         self._rightPressed = False
         self._tries = 3
+        self._kicks = 0
         
         #Initialization of sound
         self._soundOn = True
-        self._paddleSound = Sound('Blip_Select16.wav')
-        #This sound is free to used and was offered up by Damaged Panda on
-        #opengameart.org
-        self._breakSound1 = Sound('saucer1.wav')
-        self._breakSound2 = Sound('saucer2.wav')
-        self._serveBallSound = Sound('bounce.wav')      
+        self._loadSounds()
                 
     # UPDATE METHODS TO MOVE PADDLE, SERVE AND MOVE THE BALL
     def updatePaddle(self, input):
         """Updates the paddle's location.
         
+        If the input was sampled over the last frame (its frame_time is > 0, as for
+        the input of the app), the paddle moves PADDLE_RATE for each second that an
+        arrow key was held in that frame, so its speed does not depend on the frame
+        rate.  Otherwise (a HeadlessInput, or None) it moves PADDLE_SPEED once per
+        call, as a replay or a BreakoutEnv expects.
+        
         Parameter input: last keyboard input given
         Precondition: input is None or a valid GInput"""
+        if input != None and input.frame_time > 0:
+            self._slidePaddle(input)
+            return
+        
         buffer = PADDLE_SPEED + PADDLE_WIDTH/2.0
         
         if input != None:
-            if (input.is_key_down('right') and input.is_key_down('left')):
-                if not self._rightPressed:
-                    self._paddleDirection = PADDLE_RIGHT
-                    self._rightPressed = True
-                elif not self._leftPressed:
-                    self._paddleDirection = PADDLE_LEFT
-                    self._leftPressed = True
-            else:
-                if input.is_key_down('right'):
-                    self._paddleDirection = PADDLE_RIGHT
-                    self._rightPressed = True
-                    self._leftPressed = False
-                elif input.is_key_down('left'):
-                    self._paddleDirection = PADDLE_LEFT
-                    self._leftPressed = True
-                    self._rightPressed = False
-                else:
-                    self._paddleDirection = PADDLE_STILL
-                    self._leftPressed = False
-                    self._rightPressed = False
+            self._steerPaddle(input.is_key_down('left'), input.is_key_down('right'))
         
         if (self._paddleDirection == PADDLE_RIGHT
             and self._paddle.x <= GAME_WIDTH - buffer):
@@ -171,26 +265,75 @@ class Play(object):
     def serveBall(self):
         """Creates the ball and changes attribute _ballReleased to True.
         Also, if the sound is on it will play the serveBallSound.
-        Attribute kickCounter is initialized or reset."""
-        self._ball = Ball()
+        The new ball has not hit the paddle yet, for its kicker."""
+        ball = self._makeBall()
+        self._balls.add(ball.x, ball.y, ball.getVX(), ball.getVY())
+        if self._cursor is None:
+            self._cursor = ball
         self._ballReleased = True
         if self.getSoundOn():
             self._serveBallSound.play()
-        self._kickCounter = 0
+    
+    def addBalls(self, count):
+        """Adds count extra balls at the position of the first ball in play.
+        
+        Each extra ball moves up, with a random horizontal velocity like
+        that of a serve (taken from the random generator of this game).
+        
+        Parameter count: the number of balls to add
+        Precondition: count is an int >= 0, and there is a ball in play"""
+        x = self._balls.getX().item(0)
+        y = self._balls.getY().item(0)
+        for i in range(count):
+            vx = self._random.uniform(1.0,5.0)*self._random.choice([-1,1])
+            self._balls.add(x, y, vx, 5.0)
         
     def updateBall(self, time):
         """Updates the ball's location by moving it based on the time
         ellapsed during the move.  It also checks for collisions so as
         to change the ball's direction for future calls to updateBall.
         
+        If SWEPT_COLLISIONS is True, the ball is moved from impact to impact
+        so that it cannot pass through a brick or the paddle no matter how
+        fast it goes.  Otherwise, it is moved the whole way and then checked
+        for collisions at its new position.
+        
+        Every ball in play follows these rules, one ball at a time (see
+        _cursor).  With more than one ball, the balls that cannot touch a
+        brick, the paddle or a wall during this time are found first, and
+        are simply moved all at once (see _ballsNear).  A ball that reaches
+        the bottom is removed; a try is lost with the last ball.
+        
         Parameter time: Amount of time for which the ball has moved.
         Precondition: time is a float or an int and time >= 0."""
-        #move the ball
-        self._ball.moveBall(time)
+        balls = self._balls
+        if balls.getCount() == 1:
+            near = [0]
+        else:
+            near = np.flatnonzero(self._ballsNear(time))
+            if SWEPT_COLLISIONS:
+                far = np.ones(balls.getCount(), dtype=bool)
+                far[near] = False
+                balls.moveBalls(time, far)
+        if not SWEPT_COLLISIONS:
+            balls.moveBalls(time)
         
-        #check for collisions
-        self._collisionHelper()
-        self._wallCollision()
+        ball = self._cursor
+        lost = []
+        for i in near:
+            balls.load(i, ball)
+            if SWEPT_COLLISIONS:
+                self._sweepBall(time)
+            else:
+                #check for collisions
+                self._collisionHelper()
+                self._wallCollision()
+            balls.store(i, ball)
+            #checks if ball has reached bottom
+            if ball.top <= 0:
+                lost.append(i)
+        if lost:
+            self._loseBalls(lost)
         
     # DRAW METHOD TO DRAW THE PADDLES, BALL, AND BRICKS
     def draw(self, view):
@@ -198,73 +341,472 @@ class Play(object):
         
         Parameter view: view to be drawn onto
         Precondition: view is a valid view of a GameApp instance."""
-        for b in self._bricks:
-            b.draw(view)
+        if self._brickField is not None:
+            self._brickField.draw(view)
         self._paddle.draw(view)
         
         if self.getBallReleased():
-            if self._ball is not None:
-                self._ball.draw(view)
+            self._balls.draw(view)
+    
+    # HELPER METHODS TO MOVE THE PADDLE
+    def _steerPaddle(self, left, right):
+        """Sets the direction of the paddle from the arrow keys held down.
+        
+        If both keys are held, the paddle heads the way of the key pressed last.
+        
+        Parameter left: whether the left arrow key is held down
+        Precondition: left is a bool
+        
+        Parameter right: whether the right arrow key is held down
+        Precondition: right is a bool"""
+        if (right and left):
+            if not self._rightPressed:
+                self._paddleDirection = PADDLE_RIGHT
+                self._rightPressed = True
+            elif not self._leftPressed:
+                self._paddleDirection = PADDLE_LEFT
+                self._leftPressed = True
+        else:
+            if right:
+                self._paddleDirection = PADDLE_RIGHT
+                self._rightPressed = True
+                self._leftPressed = False
+            elif left:
+                self._paddleDirection = PADDLE_LEFT
+                self._leftPressed = True
+                self._rightPressed = False
+            else:
+                self._paddleDirection = PADDLE_STILL
+                self._leftPressed = False
+                self._rightPressed = False
+    
+    def _slidePaddle(self, input):
+        """Moves the paddle by the time the arrow keys were held in the last frame.
+        
+        The frame is split at each press and release of an arrow key.  In each part,
+        the paddle heads the way of the keys held then (see _steerPaddle) and moves
+        PADDLE_RATE per second, stopping at the sides of the window.  A key that is
+        pressed and released within the frame still moves the paddle.
+        
+        Parameter input: keyboard input sampled over the last frame
+        Precondition: input is a valid GInput with frame_time > 0"""
+        left = input.was_key_down('left')
+        right = input.was_key_down('right')
+        buffer = PADDLE_WIDTH/2.0
+        last = 0.0
+        for (time, key, down) in input.key_events+((input.frame_time, None, False),):
+            if time > last:
+                self._steerPaddle(left, right)
+                if self._paddleDirection == PADDLE_RIGHT:
+                    self._paddle.x = min(self._paddle.x+PADDLE_RATE*(time-last),
+                                         GAME_WIDTH-buffer)
+                elif self._paddleDirection == PADDLE_LEFT:
+                    self._paddle.x = max(self._paddle.x-PADDLE_RATE*(time-last),
+                                         buffer)
+                last = time
+            if key == 'left':
+                left = down
+            elif key == 'right':
+                right = down
     
     # HELPER METHODS FOR PHYSICS AND COLLISION DETECTION
     def _collisionHelper(self):
         """Helper method to update ball that checks for collisions
         and bounces the ball as necessary."""
-        for b in self._bricks:
-            if b.collides(self._ball):
-                self._ball.vertBounce()
-                self._bricks.remove(b)
-                if self.getSoundOn():
-                    option = random.choice([0,1])
-                    if option == 0:
-                        self._breakSound1.play()
-                    else:
-                        self._breakSound2.play()
+        ball = self._cursor
+        for cell in self._cellsNear(ball.left,ball.bottom,ball.right,ball.top):
+            if self._alive[cell] and self._bricks[cell].collides(ball):
+                self._cursor.vertBounce()
+                self._breakBrick(cell)
+                break
+        if self._paddle.collides(self._cursor):
+            self._paddleBounce()
+    
+    def _breakBrick(self, cell):
+        """Removes the brick in the given cell of the layout, playing a
+        breaking sound if the sound is on.
+        
+        Parameter cell: the cell of the brick (an index of _alive)
+        Precondition: cell is an int and the brick in it still stands"""
+        self._alive[cell] = 0
+        self._bricksLeft -= 1
+        if self._brickField is not None:
+            self._brickField.removeBrick(self._bricks[cell])
+        if self.getSoundOn():
+            option = random.choice([0,1])
+            if option == 0:
+                self._breakSound1.play()
+            else:
+                self._breakSound2.play()
+    
+    def _paddleBounce(self):
+        """Bounces the ball off the top of the paddle.
+        
+        If the ball hits the left (or right) quarter of the paddle while
+        moving right (or left), it goes back the way it came.  Also plays
+        the paddle sound if the sound is on and updates the kicker."""
+        if (self._cursor.x <= self._paddle.left + PADDLE_WIDTH/4.0
+            and self._cursor.isMovingRight()):
+                self._cursor.horBounce()
+        elif (self._cursor.x >= self._paddle.right - PADDLE_WIDTH/4.0
+              and not self._cursor.isMovingRight()):
+                self._cursor.horBounce()
+        if self.getSoundOn():
+            self._paddleSound.play()
+        self._cursor.vertBounce()
+        self._updateKicker()
+    
+    def _sweepBall(self, time):
+        """Moves the ball for the given amount of time, bouncing it at the
+        exact moment of each impact with a brick, the paddle or a wall.
+        
+        At most MAX_BOUNCES impacts are processed.  After that the ball only
+        moves up to its next impact (if any), and the rest of the time is
+        dropped, so that it never passes through a brick, the paddle or a
+        wall.  The caller takes the ball out of play if it ends up below the
+        bottom of the window.
+        
+        Parameter time: Amount of time for which the ball has moved.
+        Precondition: time is a float or an int and time >= 0."""
+        for i in range(MAX_BOUNCES):
+            impact = self._firstImpact(time)
+            if impact is None:
                 break
-        if self._paddle.collides(self._ball):
-            if (self._ball.x <= self._paddle.left + PADDLE_WIDTH/4.0
-                and self._ball.isMovingRight()):
-                    self._ball.horBounce()
-            elif (self._ball.x >= self._paddle.right - PADDLE_WIDTH/4.0
-                  and not self._ball.isMovingRight()):
-                    self._ball.horBounce()
-            if self.getSoundOn():
-                self._paddleSound.play()
-            self._ball.vertBounce()
-            self._updateKicker()
+            
+            t, vertical, obstacle = impact
+            self._cursor.moveBall(t)
+            time -= t
+            if obstacle is self._paddle and vertical:
+                self._paddleBounce()
+            else:
+                if vertical:
+                    self._cursor.vertBounce()
+                else:
+                    self._cursor.horBounce()
+                if obstacle is not None and obstacle is not self._paddle:
+                    self._breakBrick(obstacle)
+        else:
+            #out of bounces: stop at the next impact rather than go through it
+            impact = self._firstImpact(time)
+            if impact is not None:
+                time = impact[0]
+        
+        self._cursor.moveBall(time)
+    
+    def _firstImpact(self, time):
+        """Returns: the first impact of the ball within the given amount of
+        time, or None if the ball hits nothing in that time.
+        
+        The impact is a tuple (t, vertical, obstacle) where t is the time of
+        the impact, vertical is True if the ball should bounce vertically
+        (False if horizontally), and obstacle is the cell of the brick hit
+        (an int), the paddle, or None for a wall.  If several impacts
+        happen at the same time, bricks come first (in row-major order),
+        then the paddle, then the walls.
+        
+        Parameter time: Amount of time for which the ball will move.
+        Precondition: time is a float or an int and time >= 0."""
+        ball = self._cursor
+        r = BALL_DIAMETER/2.0
+        x = ball.x
+        y = ball.y
+        vx = ball.getVX()
+        vy = ball.getVY()
+        first = None
+        
+        #the bricks near the path of the ball
+        x1 = x + vx*time
+        y1 = y + vy*time
+        for cell in self._cellsNear(min(x,x1)-r,min(y,y1)-r,
+                                    max(x,x1)+r,max(y,y1)+r):
+            if self._alive[cell]:
+                b = self._bricks[cell]
+                hit = self._sweepBox(time,b.left,b.bottom,b.right,b.top)
+                if hit is not None and (first is None or hit[0] < first[0]):
+                    first = (hit[0],hit[1],cell)
+        
+        #the paddle (only from above)
+        if ball.isMovingDown():
+            p = self._paddle
+            hit = self._sweepBox(time,p.left,p.bottom,p.right,p.top)
+            if hit is not None and (first is None or hit[0] < first[0]):
+                first = (hit[0],hit[1],p)
+        
+        #the left, right and top walls
+        walls = []
+        if vx < 0:
+            walls.append(((r-x)/vx,False))
+        elif vx > 0:
+            walls.append(((GAME_WIDTH-r-x)/vx,False))
+        if vy > 0:
+            walls.append(((GAME_HEIGHT-r-y)/vy,True))
+        for t, vertical in walls:
+            t = max(t,0.0)
+            if t <= time and (first is None or t < first[0]):
+                first = (t,vertical,None)
+        
+        return first
+    
+    def _sweepBox(self, time, left, bottom, right, top):
+        """Returns: the first time at which the moving ball touches the box
+        with the given edges, or None if it does not touch it in time.
+        
+        The value returned is a pair (t, vertical) where vertical is True if
+        the ball hits the top or bottom of the box (False for a side).  When
+        the ball hits a corner of the box, it bounces along whichever axis
+        is closest to the direction from the corner to the center of the ball.
+        
+        The test is done with the ball as a circle.  It is the intersection
+        of the path of the center of the ball with the box grown by the
+        radius of the ball, which has rounded corners.  A ball that already
+        overlaps the box is ignored, as it must be on its way out.
+        
+        Parameter time: Amount of time for which the ball will move.
+        Precondition: time is a float or an int and time >= 0.
+        
+        Parameter left: the left edge of the box
+        Precondition: left is an int or float <= right
+        
+        Parameter bottom: the bottom edge of the box
+        Precondition: bottom is an int or float <= top
+        
+        Parameter right: the right edge of the box
+        Precondition: right is an int or float
+        
+        Parameter top: the top edge of the box
+        Precondition: top is an int or float"""
+        if GProfiler.current is not None:
+            GProfiler.current.count('collisions')
+        r = BALL_DIAMETER/2.0
+        x = self._cursor.x
+        y = self._cursor.y
+        vx = self._cursor.getVX()
+        vy = self._cursor.getVY()
+        
+        #the times at which the center crosses the sides of the grown box
+        tEnter = float('-inf')
+        tExit = float('inf')
+        vertical = False
+        for p, v, lo, hi, axis in ((x,vx,left,right,False),
+                                   (y,vy,bottom,top,True)):
+            if v == 0:
+                if not (lo-r < p < hi+r):
+                    return None
+                continue
+            t0 = (lo-r-p)/v
+            t1 = (hi+r-p)/v
+            if t0 > t1:
+                t0, t1 = t1, t0
+            if t0 > tEnter:
+                tEnter = t0
+                vertical = axis
+            tExit = min(tExit,t1)
+        if tEnter > tExit or tExit < 0 or tEnter > time:
+            return None
+        
+        #rounded corners need a circle test against the corner itself
+        t = max(tEnter,0.0)
+        qx = x + vx*t
+        qy = y + vy*t
+        if (qx < left or qx > right) and (qy < bottom or qy > top):
+            dx = x - (left if qx < left else right)
+            dy = y - (bottom if qy < bottom else top)
+            a = vx*vx + vy*vy
+            b = 2*(dx*vx + dy*vy)
+            c = dx*dx + dy*dy - r*r
+            disc = b*b - 4*a*c
+            if c < 0 or disc < 0:
+                return None
+            t = (-b - math.sqrt(disc))/(2*a)
+            if t < 0 or t > time:
+                return None
+            return (t,abs(dy + vy*t) >= abs(dx + vx*t))
+        elif tEnter < 0:
+            return None
+        return (tEnter,vertical)
                   
+    def _cellsNear(self, left, bottom, right, top):
+        """Returns: the list of cells of the brick layout that overlap the
+        box with the given edges, in the same row-major order as the bricks
+        were laid out.  Each cell is an index of _alive (and _bricks).
+        
+        Each brick lies entirely inside of its own cell, so a brick can only
+        contain a point in the box if its cell is in this list.
+        
+        Parameter left: the left edge of the box
+        Precondition: left is an int or float <= right
+        
+        Parameter bottom: the bottom edge of the box
+        Precondition: bottom is an int or float <= top
+        
+        Parameter right: the right edge of the box
+        Precondition: right is an int or float
+        
+        Parameter top: the top edge of the box
+        Precondition: top is an int or float"""
+        yTop = GAME_HEIGHT - BRICK_Y_OFFSET
+        c0 = max(int(math.floor(left/self._dx)), 0)
+        c1 = min(int(math.floor(right/self._dx)), BRICKS_IN_ROW-1)
+        r0 = max(int(math.floor((yTop-top)/self._dy)), 0)
+        r1 = min(int(math.floor((yTop-bottom)/self._dy)), BRICK_ROWS-1)
+        return [r*BRICKS_IN_ROW+c for r in range(r0,r1+1)
+                for c in range(c0,c1+1)]
+    
     def _wallCollision(self):
         """Helper method that changes the direction of the ball if it hits
-        the left, right or top wall, and makes the appropriate changes if the
-        ball reaches the bottom wall and disappears from view, going out of play
-        (a life is then lost)."""
+        the left, right or top wall.  A ball that reaches the bottom wall is
+        taken out of play by updateBall."""
         #checks if ball hits top wall and bounces it down
-        if self._ball.top >= GAME_HEIGHT:
-            self._ball.vertBounce()
-        #checks if ball has reached bottom and 
-        if self._ball.top <= 0:
-            self._ball = None
-            self._tries -= 1
-            self._ballReleased = False
+        if self._cursor.top >= GAME_HEIGHT:
+            self._cursor.vertBounce()
+        #a ball that has reached bottom is not bounced
+        if self._cursor.top <= 0:
             return
         #checks if ball has reached left and bounces it right
-        if self._ball.left <= 0:
-            self._ball.horBounce()
+        if self._cursor.left <= 0:
+            self._cursor.horBounce()
         #checks if ball has reached right and bounces it left
-        if self._ball.right >= GAME_WIDTH:
-            self._ball.horBounce()
+        if self._cursor.right >= GAME_WIDTH:
+            self._cursor.horBounce()
         
     
+    def _loseBalls(self, lost):
+        """Takes the given balls out of play after they reached the bottom.
+        
+        If no ball is left, a life is lost.
+        
+        Parameter lost: the numbers of the balls that reached the bottom
+        Precondition: lost is a non-empty list of distinct ball numbers"""
+        self._balls.remove(lost)
+        if self._balls.getCount() == 0:
+            self._tries -= 1
+            self._ballReleased = False
+    
+    def _ballsNear(self, time):
+        """Returns: a bool array that is True for each ball that may touch a
+        brick, the paddle or a wall within the given amount of time.
+        
+        The test is cautious: it is the box around the path of each ball
+        against the lowest row of bricks, the top of the paddle and the
+        walls.  A ball for which it is False hits nothing in that time.
+        
+        Parameter time: Amount of time for which the balls will move.
+        Precondition: time is a float or an int and time >= 0."""
+        balls = self._balls
+        r = BALL_DIAMETER/2.0
+        x = balls.getX()
+        y = balls.getY()
+        x1 = x + time*balls.getVX()
+        y1 = y + time*balls.getVY()
+        yBricks = GAME_HEIGHT - BRICK_Y_OFFSET - BRICK_ROWS*self._dy
+        return ((np.minimum(x, x1) - r <= 0) | (np.maximum(x, x1) + r >= GAME_WIDTH) |
+                (np.maximum(y, y1) + r >= yBricks) |
+                (np.minimum(y, y1) - r <= self._paddle.top))
+    
     # ADD ANY ADDITIONAL METHODS (FULLY SPECIFIED) HERE
+    def boardSnapshot(self):
+        """Returns: the board as a compact string, with one bit per brick.
+        
+        Bit 7-(i%8) of byte i/8 is 1 if the brick in cell i (row-major order)
+        still stands.  Two games have the same snapshot exactly when the same
+        bricks are left, so it can be hashed (see boardHash), saved, and
+        given back to loadBoard."""
+        return np.packbits(np.frombuffer(self._alive, np.uint8)).tostring()
+    
+    def boardHash(self):
+        """Returns: the SHA-1 hex digest of boardSnapshot()."""
+        return hashlib.sha1(self.boardSnapshot()).hexdigest()
+    
+    def loadBoard(self, snapshot):
+        """Sets the bricks left to those of the given snapshot.
+        
+        Parameter snapshot: the board to load
+        Precondition: snapshot is a string returned by boardSnapshot for a
+        game with the same BRICKS_IN_ROW and BRICK_ROWS"""
+        bits = np.unpackbits(np.frombuffer(snapshot, np.uint8))
+        for cell in range(len(self._bricks)):
+            if self._alive[cell] != bits[cell]:
+                self._alive[cell] = bits[cell]
+                if self._brickField is not None:
+                    if bits[cell]:
+                        self._brickField.addBrick(self._bricks[cell])
+                    else:
+                        self._brickField.removeBrick(self._bricks[cell])
+        self._bricksLeft = self._alive.count('\x01')
+    
+    def setPaddleState(self, state):
+        """Sets the paddle to the given state.
+        
+        Parameter state: the state of the paddle
+        Precondition: state is a tuple returned by getPaddleState"""
+        (self._paddle.x, self._paddleDirection, self._leftPressed,
+         self._rightPressed) = state
+    
     def switchSound(self):
         """Makes self._soundOn the opposite boolean of what it is."""
         self._soundOn = not self._soundOn
         
+    def _makeBrick(self, x, y, color):
+        """Returns: a new brick centered at (x, y) with the given color.
+        
+        Subclasses of Play may override this (and the other _make methods) to
+        change the kind of model objects that the game is played with.
+        
+        Parameter x: x coordinate of the brick's center.
+        Precondition: x must be an int or a float.
+        
+        Parameter y: y coordinate of the brick's center.
+        Precondition: y must be an int or a float.
+        
+        Parameter color: color of the brick
+        Precondition: color is a valid color for a Brick"""
+        return Brick(x, y, color)
+    
+    def _makeBrickField(self):
+        """Returns: a new BrickField that draws all of the bricks of this game,
+        or None if the bricks are not drawn."""
+        return BrickField(self._bricks)
+    
+    def _makePaddle(self, x, y):
+        """Returns: a new paddle centered at (x, y).
+        
+        Parameter x: Starting x for the paddle
+        Precondition: x must be a float or an int
+        
+        Parameter y: Starting y for the paddle
+        Precondition: y must be a float or an int"""
+        return Paddle(x, y)
+    
+    def _makeBall(self):
+        """Returns: a new ball, ready to be served.
+        
+        Its velocity comes from the random generator of this game."""
+        return Ball(self._random)
+    
+    def _makeBallSet(self):
+        """Returns: a new, empty BallSet for the balls in play, drawn as one
+        batch of circles."""
+        return BallSet(GCircleBatch(radius=BALL_DIAMETER/2.0,
+                                    fillcolor=colormodel.BLACK))
+    
+    def _loadSounds(self):
+        """Puts the sound effects of this game into the sound attributes.
+        
+        The sounds come from the shared SoundLibrary, so they are only loaded
+        from disk by the first game (or by the preloader of the application).
+        Each sound is named by its file, as the preloader names them."""
+        sounds = SoundLibrary.shared()
+        self._paddleSound = sounds.load('Blip_Select16.wav', 'Blip_Select16.wav',
+                                        SOUND_VOICES)
+        #This sound is free to used and was offered up by Damaged Panda on
+        #opengameart.org
+        self._breakSound1 = sounds.load('saucer1.wav', 'saucer1.wav', SOUND_VOICES)
+        self._breakSound2 = sounds.load('saucer2.wav', 'saucer2.wav', SOUND_VOICES)
+        self._serveBallSound = sounds.load('bounce.wav', 'bounce.wav', SOUND_VOICES)
+    
     def _updateKicker(self):
-        """Updates the kicker counter by one and checks
-        if the ball should be sped up"""
-        self._kickCounter += 1
-        if self._kickCounter >= KICK_INTERVAL:
-            self._ball.kick(KICK_FACTOR)
-            self._kickCounter = 0
+        """Counts a hit of the paddle for the ball, which checks if
+        the ball should be sped up (see Ball.hitPaddle)"""
+        if self._cursor.hitPaddle():
+            self._kicks += 1
         
\ No newline at end of file
@@ -0,0 +1,361 @@
+# replay.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Replay module for Breakout
+
+This module records games of Breakout and plays them back.  A game is completely
+determined by the seed of its random generator and by the calls made to its methods
+updatePaddle, serveBall, updateBall and addBalls.  The class RecordingPlay is a Play
+that logs these calls to a file, and the class Replay reads such a file back and
+repeats the same calls on a HeadlessPlay.  The result is the same game, bit for bit, simulated as
+fast as Python allows.  We use this to reproduce bug reports and to compare physics
+changes against a fixed set of recorded games.
+
+A replay is a binary file.  It starts with a header (the four bytes 'BRKR', a version
+byte, the seed as an unsigned 64 bit int and the number of bricks in a row and of brick
+rows as unsigned 16 bit ints).  The version is 2; files of version 1, which came before
+the PLACE record, are still played back.  The rest of the file is a sequence of records, each
+one an opcode byte followed by its arguments:
+
+    PADDLE  mask [byte]   updatePaddle with the arrow keys in mask held down
+    PLACE   x [double]    updatePaddle with the input of the app, which moved the
+            flags [byte]  paddle to x, heading flags&3 with the left (4) and right (8)
+                          arrow keys previously held down
+    SERVE                 serveBall
+    STEP    time [double] set the time for the following BALLS records
+    BALLS   count [byte]  updateBall(time) count times in a row
+    MULTI   count [short] addBalls(count)
+
+The input of the app moves the paddle by the time each key was held in the frame (see
+Play.updatePaddle), which a mask cannot repeat, so its calls are recorded as PLACE
+records with the state of the paddle afterwards.
+
+All numbers are little endian.  A typical frame (one PADDLE and one BALLS record) takes
+four bytes."""
+import errno
+import os
+import struct
+import time
+from constants import *
+from play import *
+from headless import *
+
+
+# The header at the start of a replay
+_HEADER  = struct.Struct('<4sBQHH')
+_MAGIC   = 'BRKR'
+_VERSION = 2
+# The versions that Replay plays back (version 1 has no PLACE records)
+_VERSIONS = (1, 2)
+
+# The opcodes of the records
+_PADDLE = 0
+_SERVE  = 1
+_STEP   = 2
+_BALLS  = 3
+_MULTI  = 4
+_PLACE  = 5
+
+# The bits of a PADDLE mask
+_LEFT_KEY  = 1
+_RIGHT_KEY = 2
+_NO_INPUT  = 128
+
+# The bits of the flags of a PLACE record (after the direction in the low two bits)
+_LEFT_HELD  = 4
+_RIGHT_HELD = 8
+
+_DOUBLE = struct.Struct('<d')
+_SHORT  = struct.Struct('<H')
+_PLACE_ARGS = struct.Struct('<dB')
+
+
+class Recorder(object):
+    """An instance writes the calls made to a game to a replay file.
+    
+    Consecutive calls to updateBall with the same time are written as a single BALLS
+    record, which is only written once another call is recorded (or the recorder is
+    closed).
+    
+    INSTANCE ATTRIBUTES:
+        _stream [file, or None if closed]: the file to write the replay to
+        _step   [float, or None if there was no call to updateBall]: the time of
+                the last call to updateBall
+        _count  [int in 0..255]: the calls to updateBall not written yet"""
+    
+    # INITIALIZER
+    def __init__(self, stream, seed):
+        """Initializer for class Recorder.  Writes the header of the replay.
+        
+        Parameter stream: the file to write the replay to
+        Precondition: stream is a file (or file-like object) open for binary writing
+        
+        Parameter seed: the seed of the random generator of the game
+        Precondition: seed is an int >= 0"""
+        self._stream = stream
+        self._step = None
+        self._count = 0
+        stream.write(_HEADER.pack(_MAGIC, _VERSION, seed, BRICKS_IN_ROW, BRICK_ROWS))
+    
+    # METHODS TO RECORD THE CALLS
+    def paddle(self, input):
+        """Records a call to updatePaddle.
+        
+        Parameter input: the input given to updatePaddle
+        Precondition: input is None or a valid GInput"""
+        if input is None:
+            mask = _NO_INPUT
+        else:
+            mask = 0
+            if input.is_key_down('left'):
+                mask |= _LEFT_KEY
+            if input.is_key_down('right'):
+                mask |= _RIGHT_KEY
+        self._flush()
+        self._stream.write(chr(_PADDLE)+chr(mask))
+    
+    def place(self, state):
+        """Records a call to updatePaddle with input sampled over a frame.
+        
+        Parameter state: the state of the paddle after the call
+        Precondition: state is a tuple returned by Play.getPaddleState"""
+        x, direction, left, right = state
+        flags = direction
+        if left:
+            flags |= _LEFT_HELD
+        if right:
+            flags |= _RIGHT_HELD
+        self._flush()
+        self._stream.write(chr(_PLACE)+_PLACE_ARGS.pack(x, flags))
+    
+    def serve(self):
+        """Records a call to serveBall."""
+        self._flush()
+        self._stream.write(chr(_SERVE))
+    
+    def ball(self, time):
+        """Records a call to updateBall.
+        
+        Parameter time: the time given to updateBall
+        Precondition: time is a float or an int and time >= 0"""
+        if time != self._step:
+            self._flush()
+            self._step = time
+            self._stream.write(chr(_STEP)+_DOUBLE.pack(time))
+        elif self._count == 255:
+            self._flush()
+        self._count += 1
+    
+    def multiball(self, count):
+        """Records a call to addBalls.
+        
+        Parameter count: the number of balls given to addBalls
+        Precondition: count is an int in 0..65535"""
+        self._flush()
+        self._stream.write(chr(_MULTI)+_SHORT.pack(count))
+    
+    def close(self):
+        """Writes any pending record and closes the replay file."""
+        if self._stream is not None:
+            self._flush()
+            self._stream.close()
+            self._stream = None
+    
+    # HELPER METHODS
+    def _flush(self):
+        """Writes the BALLS record for the calls to updateBall not written yet."""
+        if self._count > 0:
+            self._stream.write(chr(_BALLS)+chr(self._count))
+            self._count = 0
+
+
+class RecordingPlay(Play):
+    """An instance is a game of breakout that records itself to a replay file.
+    
+    This class plays exactly like Play.  In addition, every call to updatePaddle,
+    serveBall, updateBall and addBalls is written to the replay file until the method
+    stopRecording is called.
+    
+    INSTANCE ATTRIBUTES:
+        _recorder [Recorder, or None if no longer recording]: the replay writer"""
+    
+    # INITIALIZER
+    def __init__(self, stream, seed=None):
+        """Initializer for the class RecordingPlay
+        
+        Parameter stream: the file to write the replay to
+        Precondition: stream is a file (or file-like object) open for binary writing
+        
+        Parameter seed: the seed for the random generator of this game (None
+        for a random seed)
+        Precondition: seed is None or an int >= 0"""
+        Play.__init__(self, seed)
+        self._recorder = Recorder(stream, self.getSeed())
+    
+    # UPDATE METHODS THAT ARE RECORDED
+    def updatePaddle(self, input):
+        """Updates the paddle's location, recording the input.
+        
+        Input sampled over a frame is recorded as the state of the paddle afterwards
+        (see Recorder.place).
+        
+        Parameter input: last keyboard input given
+        Precondition: input is None or a valid GInput"""
+        if self._recorder is not None and (input is None or input.frame_time == 0):
+            self._recorder.paddle(input)
+        Play.updatePaddle(self, input)
+        if self._recorder is not None and input is not None and input.frame_time > 0:
+            self._recorder.place(self.getPaddleState())
+    
+    def serveBall(self):
+        """Serves the ball, recording the serve."""
+        if self._recorder is not None:
+            self._recorder.serve()
+        Play.serveBall(self)
+    
+    def updateBall(self, time):
+        """Updates the ball's location, recording the time.
+        
+        Parameter time: Amount of time for which the ball has moved.
+        Precondition: time is a float or an int and time >= 0."""
+        if self._recorder is not None:
+            self._recorder.ball(time)
+        Play.updateBall(self, time)
+    
+    def addBalls(self, count):
+        """Adds count extra balls, recording the call.
+        
+        Parameter count: the number of balls to add
+        Precondition: count is an int in 0..65535, and there is a ball in play"""
+        if self._recorder is not None:
+            self._recorder.multiball(count)
+        Play.addBalls(self, count)
+    
+    def stopRecording(self):
+        """Stops recording this game and closes the replay file.
+        
+        The game can still be played after this, but it is no longer recorded."""
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+
+class Replay(object):
+    """An instance is a recorded game that can be played back.
+    
+    INSTANCE ATTRIBUTES:
+        _seed   [int >= 0]: the seed of the random generator of the game
+        _bricks [tuple of two ints > 0]: the number of bricks in a row and of brick
+                rows in the game
+        _data   [str]: the records of the replay (without the header)"""
+    
+    # GETTERS
+    def getSeed(self):
+        """Returns: the seed of the random generator of the recorded game."""
+        return self._seed
+    
+    def getBricks(self):
+        """Returns: the tuple (bricks in a row, brick rows) of the recorded game."""
+        return self._bricks
+    
+    # INITIALIZER
+    def __init__(self, data):
+        """Initializer for class Replay.
+        
+        Parameter data: the contents of a replay file
+        Precondition: data is a str"""
+        if len(data) < _HEADER.size:
+            raise ValueError('replay is too short')
+        magic, version, seed, columns, rows = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version not in _VERSIONS:
+            raise ValueError('not a replay (or an unsupported version)')
+        self._seed = seed
+        self._bricks = (columns, rows)
+        self._data = data[_HEADER.size:]
+    
+    # METHODS
+    def play(self, game=None):
+        """Returns: the game after playing back every recorded call on it.
+        
+        By default, the calls are played on a new HeadlessPlay with the recorded
+        seed.  The game must have the same number of bricks as the recorded game, so
+        BRICKS_IN_ROW and BRICK_ROWS must be the same as when it was recorded.
+        
+        Parameter game: the game to play back on (None for a new HeadlessPlay)
+        Precondition: game is None or a new Play with the seed of this replay"""
+        if self._bricks != (BRICKS_IN_ROW, BRICK_ROWS):
+            raise ValueError('replay has %d bricks in %d rows, not %d in %d' %
+                             (self._bricks+(BRICKS_IN_ROW, BRICK_ROWS)))
+        if game is None:
+            game = HeadlessPlay(self._seed)
+        
+        input = HeadlessInput()
+        data = self._data
+        step = 0.0
+        pos = 0
+        while pos < len(data):
+            op = ord(data[pos])
+            if op == _PADDLE:
+                mask = ord(data[pos+1])
+                input.release_all()
+                if mask & _LEFT_KEY:
+                    input.press('left')
+                if mask & _RIGHT_KEY:
+                    input.press('right')
+                game.updatePaddle(None if mask & _NO_INPUT else input)
+                pos += 2
+            elif op == _SERVE:
+                game.serveBall()
+                pos += 1
+            elif op == _STEP:
+                step = _DOUBLE.unpack_from(data, pos+1)[0]
+                pos += 1+_DOUBLE.size
+            elif op == _BALLS:
+                for i in range(ord(data[pos+1])):
+                    game.updateBall(step)
+                pos += 2
+            elif op == _MULTI:
+                game.addBalls(_SHORT.unpack_from(data, pos+1)[0])
+                pos += 1+_SHORT.size
+            elif op == _PLACE:
+                x, flags = _PLACE_ARGS.unpack_from(data, pos+1)
+                game.setPaddleState((x, flags & 3, bool(flags & _LEFT_HELD),
+                                     bool(flags & _RIGHT_HELD)))
+                pos += 1+_PLACE_ARGS.size
+            else:
+                raise ValueError('bad record %d at byte %d of replay' %
+                                 (op, pos+_HEADER.size))
+        return game
+
+
+def readReplay(path):
+    """Returns: the Replay in the given file.
+    
+    Parameter path: the path of the replay file
+    Precondition: path is a string naming a replay file"""
+    with open(path, 'rb') as file:
+        return Replay(file.read())
+
+
+def openReplay():
+    """Returns: a new file in REPLAY_DIR, open for binary writing, for the replay of a
+    game.
+    
+    The name of the file has the date and time it was made, followed by a counter if
+    a replay with that name already exists (as when a game is restarted within the
+    same second).  The file is created only if it does not exist, so an earlier replay
+    is never overwritten.  The folder REPLAY_DIR is created if it does not exist."""
+    if not os.path.isdir(REPLAY_DIR):
+        os.makedirs(REPLAY_DIR)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    count = 0
+    while True:
+        suffix = '-%d' % count if count > 0 else ''
+        path = os.path.join(REPLAY_DIR, 'breakout-%s%s.rpl' % (stamp, suffix))
+        try:
+            return os.fdopen(os.open(path, flags, 0666), 'wb')
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+            count += 1
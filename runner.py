@@ -0,0 +1,260 @@
+# runner.py
+# Nathaniel Diamond (ncd27) and Meredith Anderer (mra85)
+# 12/4/16
+"""Parallel game runner module for Breakout
+
+This module evaluates a paddle policy over many seeded games at once.  A policy is a
+function that takes an observation of a BreakoutEnv and returns an action (see the
+module environment).  Each game is played to completion (or for at most MAX_FRAMES
+frames) and reduced to a compact Summary.  The games are split into chunks of seeds,
+and the chunks are played by a pool of worker processes, one per core by default.  The
+summaries are streamed back as each chunk finishes, so they can be aggregated (with a
+Tally) while the other chunks are still being played.
+
+The games do not share anything, so the runner scales with the number of cores.  The
+chunks keep the cost of sending the work and the results between processes small
+compared to the cost of the games.  A policy must be picklable, so it must be a function
+(or an instance of a class) defined at the top level of a module.
+
+To evaluate the policy followBall from the command line, type
+
+    python runner.py --games 100000 [--processes 8] [--first 0]
+
+which plays the games with the seeds first, first+1, ... and prints the totals."""
+import argparse
+import collections
+import multiprocessing
+import sys
+import time
+from constants import *
+from environment import *
+
+
+#: the most frames played in a single game (five minutes at 60 frames per second)
+MAX_FRAMES = 5*60*60
+#: the number of games in each chunk sent to a worker process
+CHUNK_SIZE = 16
+
+
+#: A Summary is the result of a single game: its seed, the number of bricks broken,
+#: the number of frames played, the number of kicks and the number of tries left.
+Summary = collections.namedtuple('Summary', ('seed', 'bricks', 'frames', 'kicks',
+                                             'tries'))
+
+
+class Tally(object):
+    """An instance aggregates the summaries of many games.
+    
+    INSTANCE ATTRIBUTES:
+        _count  [int >= 0]: the number of games added
+        _wins   [int >= 0]: the number of games in which every brick was broken
+        _bricks [int >= 0]: the total number of bricks broken
+        _frames [int >= 0]: the total number of frames played
+        _kicks  [int >= 0]: the total number of kicks
+        _best   [Summary, or None if no game was added]: the game with the most
+                bricks broken (in the fewest frames)"""
+    
+    # GETTERS
+    def getCount(self):
+        """Returns: the number of games added."""
+        return self._count
+    
+    def getWins(self):
+        """Returns: the number of games in which every brick was broken."""
+        return self._wins
+    
+    def getBest(self):
+        """Returns: the Summary of the best game (None if no game was added)."""
+        return self._best
+    
+    def getMeanBricks(self):
+        """Returns: the mean number of bricks broken in a game (0 if no games)."""
+        return self._bricks/float(max(self._count, 1))
+    
+    def getMeanFrames(self):
+        """Returns: the mean number of frames played in a game (0 if no games)."""
+        return self._frames/float(max(self._count, 1))
+    
+    def getMeanKicks(self):
+        """Returns: the mean number of kicks in a game (0 if no games)."""
+        return self._kicks/float(max(self._count, 1))
+    
+    # INITIALIZER
+    def __init__(self):
+        """Initializer for class Tally.  No games have been added."""
+        self._count = 0
+        self._wins = 0
+        self._bricks = 0
+        self._frames = 0
+        self._kicks = 0
+        self._best = None
+    
+    # METHODS
+    def add(self, summary):
+        """Adds the summary of a game to this tally.
+        
+        Parameter summary: the summary of the game
+        Precondition: summary is a Summary"""
+        self._count += 1
+        self._bricks += summary.bricks
+        self._frames += summary.frames
+        self._kicks += summary.kicks
+        if summary.bricks == BRICK_ROWS*BRICKS_IN_ROW:
+            self._wins += 1
+        if (self._best is None or summary.bricks > self._best.bricks or
+            (summary.bricks == self._best.bricks and
+             summary.frames < self._best.frames)):
+            self._best = summary
+    
+    def __str__(self):
+        """Returns: the totals of this tally as a readable string."""
+        return ('%d games, %d won, %.2f bricks, %.1f frames, %.2f kicks per game' %
+                (self._count, self._wins, self.getMeanBricks(),
+                 self.getMeanFrames(), self.getMeanKicks()))
+
+
+def followBall(obs):
+    """Returns: the action that moves the paddle towards the ball.
+    
+    This is a simple policy to evaluate with the runner.
+    
+    Parameter obs: the observation of the game
+    Precondition: obs is an observation of a BreakoutEnv"""
+    if obs[0] > obs[4]+PADDLE_SPEED:
+        return PADDLE_RIGHT
+    elif obs[0] < obs[4]-PADDLE_SPEED:
+        return PADDLE_LEFT
+    return PADDLE_STILL
+
+
+def playGame(seed, policy=followBall, maxFrames=MAX_FRAMES):
+    """Returns: the Summary of a game with the given seed played by policy.
+    
+    Parameter seed: the seed of the game
+    Precondition: seed is an int >= 0
+    
+    Parameter policy: the policy that moves the paddle
+    Precondition: policy is a function from an observation to an action
+    
+    Parameter maxFrames: the most frames to play
+    Precondition: maxFrames is an int > 0"""
+    env = BreakoutEnv()
+    obs = env.reset(seed)
+    frames = 0
+    done = False
+    while not done and frames < maxFrames:
+        obs, reward, done, info = env.step(policy(obs))
+        frames += 1
+    game = env.getGame()
+    return Summary(seed, BRICK_ROWS*BRICKS_IN_ROW-game.getBricksLeft(), frames,
+                   game.getKicks(), game.getTries())
+
+
+def runGames(seeds, policy=followBall, processes=None, maxFrames=MAX_FRAMES):
+    """Yields: the Summary of the game for each seed, as soon as it is played.
+    
+    The summaries come in the order the chunks finish, not in the order of the seeds.
+    The worker processes are stopped when the last summary is yielded (or when the
+    generator is closed).
+    
+    Parameter seeds: the seeds of the games to play
+    Precondition: seeds is an iterable of ints >= 0
+    
+    Parameter policy: the policy that moves the paddle
+    Precondition: policy is a picklable function from an observation to an action
+    
+    Parameter processes: the number of worker processes (None for one per core)
+    Precondition: processes is None or an int > 0
+    
+    Parameter maxFrames: the most frames to play in each game
+    Precondition: maxFrames is an int > 0"""
+    pool = multiprocessing.Pool(processes)
+    try:
+        tasks = ((chunk, policy, maxFrames) for chunk in _chunks(seeds, CHUNK_SIZE))
+        for summaries in pool.imap_unordered(_playChunk, tasks):
+            for summary in summaries:
+                yield summary
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def evaluate(seeds, policy=followBall, processes=None, maxFrames=MAX_FRAMES):
+    """Returns: the Tally of the games for the given seeds, played in parallel.
+    
+    Parameter seeds: the seeds of the games to play
+    Precondition: seeds is an iterable of ints >= 0
+    
+    Parameter policy: the policy that moves the paddle
+    Precondition: policy is a picklable function from an observation to an action
+    
+    Parameter processes: the number of worker processes (None for one per core)
+    Precondition: processes is None or an int > 0
+    
+    Parameter maxFrames: the most frames to play in each game
+    Precondition: maxFrames is an int > 0"""
+    tally = Tally()
+    for summary in runGames(seeds, policy, processes, maxFrames):
+        tally.add(summary)
+    return tally
+
+
+# HELPER FUNCTIONS
+def _chunks(seeds, size):
+    """Yields: the seeds in lists of the given size (the last one may be shorter).
+    
+    Parameter seeds: the seeds to split
+    Precondition: seeds is an iterable of ints >= 0
+    
+    Parameter size: the size of each list
+    Precondition: size is an int > 0"""
+    chunk = []
+    for seed in seeds:
+        chunk.append(seed)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _playChunk(task):
+    """Returns: the list of summaries of the games of a chunk.
+    
+    This is the work done by a worker process.
+    
+    Parameter task: the seeds of the chunk, the policy and the most frames per game
+    Precondition: task is a tuple (list of ints >= 0, policy, int > 0)"""
+    seeds, policy, maxFrames = task
+    return [playGame(seed, policy, maxFrames) for seed in seeds]
+
+
+def main():
+    """Evaluates followBall with the options given on the command line."""
+    parser = argparse.ArgumentParser(prog='python runner.py')
+    parser.add_argument('--games', type=int, default=1000,
+                        help='the number of games to play')
+    parser.add_argument('--first', type=int, default=0,
+                        help='the seed of the first game')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='the number of worker processes (one per core)')
+    parser.add_argument('--frames', type=int, default=MAX_FRAMES,
+                        help='the most frames in a game')
+    args = parser.parse_args()
+    
+    start = time.time()
+    tally = Tally()
+    seeds = xrange(args.first, args.first+args.games)
+    for summary in runGames(seeds, followBall, args.processes, args.frames):
+        tally.add(summary)
+        if tally.getCount() % 1000 == 0:
+            sys.stderr.write('%d games in %.1f s\n' % (tally.getCount(),
+                                                       time.time()-start))
+    print tally
+    print 'best game:', tally.getBest()
+    print '%.1f s' % (time.time()-start)
+
+
+if __name__ == '__main__':
+    main()